@@ -61,7 +61,12 @@ async function apiRequest<T>(
       apiLogger.error(`${response.status} ${path} (${duration}ms)`, new Error(message), { error: errorBody });
       throw new APIError(response.status, response.statusText, message);
     }
-    
+
+    if (response.status === 204) {
+      apiLogger.info(`${response.status} ${path} (${duration}ms)`);
+      return null as T;
+    }
+
     const data = await response.json();
     apiLogger.info(`${response.status} ${path} (${duration}ms)`, { responseSize: JSON.stringify(data).length });
     return data as T;
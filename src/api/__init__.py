@@ -2,88 +2,86 @@
 API package for Academic Research Tool.
 
 This package contains all API routes and dependencies.
+
+Route modules are imported lazily: the combined ``api_router`` is only built
+(and the route modules, with their service dependencies, only imported) the
+first time it is accessed. Set ``ARTOOL_EAGER_IMPORT=1`` to build it at import
+time instead, e.g. to warm a production worker before it takes traffic.
+
+The router is built at most once per process. Combined with a pre-forking
+server (``gunicorn --preload``) and ``ARTOOL_EAGER_IMPORT=1``, it is built
+once in the master and inherited by every worker.
 """
 
-from fastapi import APIRouter
+import functools
+import importlib
+import os
 
-from src.api.routes import health, projects, outline, sources, research, discovery, logs, research_agent, chat, test_harness, report
-
-# Create main API router
-api_router = APIRouter()
-
-# Include sub-routers
-api_router.include_router(
-    health.router,
-    prefix="/health",
-    tags=["health"],
-)
-
-api_router.include_router(
-    projects.router,
-    prefix="/projects",
-    tags=["projects"],
-)
-
-# Outline routes are nested under projects
-api_router.include_router(
-    outline.router,
-    prefix="/projects/{project_id}/outline",
-    tags=["outline"],
-)
-
-# Sources routes for paper management
-api_router.include_router(
-    sources.router,
-    prefix="/projects/{project_id}/sources",
-    tags=["sources"],
-)
-
-# Research routes for RAG queries
-api_router.include_router(
-    research.router,
-    prefix="/projects/{project_id}/research",
-    tags=["research"],
-)
-
-# Discovery routes for knowledge tree / citation graph
-api_router.include_router(
-    discovery.router,
-    prefix="/projects/{project_id}/sources",
-    tags=["discovery"],
-)
-
-# AI Research Agent routes (legacy)
-api_router.include_router(
-    research_agent.router,
-    prefix="/projects/{project_id}/agent",
-    tags=["research-agent"],
-)
-
-# Chat-driven research UI routes
-api_router.include_router(
-    chat.router,
-    prefix="/projects/{project_id}/research-ui",
-    tags=["research-ui"],
-)
-
-# Frontend logging endpoint (no auth required)
-api_router.include_router(
-    logs.router,
-    tags=["logs"],
-)
-
-# Test harness for programmatic testing (dev only)
-api_router.include_router(
-    test_harness.router,
-    tags=["test-harness"],
-)
-
-# Report/Paper generation routes
-api_router.include_router(
-    report.router,
-    prefix="/projects/{project_id}/report",
-    tags=["report"],
-)
-
-__all__ = ["api_router"]
+from fastapi import APIRouter
 
+# (module name under src.api.routes, prefix, tags)
+_ROUTE_SPECS: list[tuple[str, str, list[str]]] = [
+    ("health", "/health", ["health"]),
+    ("projects", "/projects", ["projects"]),
+    # Outline routes are nested under projects
+    ("outline", "/projects/{project_id}/outline", ["outline"]),
+    # Sources routes for paper management
+    ("sources", "/projects/{project_id}/sources", ["sources"]),
+    # Research routes for RAG queries
+    ("research", "/projects/{project_id}/research", ["research"]),
+    # Discovery routes for knowledge tree / citation graph
+    ("discovery", "/projects/{project_id}/sources", ["discovery"]),
+    # AI Research Agent routes (legacy)
+    ("research_agent", "/projects/{project_id}/agent", ["research-agent"]),
+    # Chat-driven research UI routes
+    ("chat", "/projects/{project_id}/research-ui", ["research-ui"]),
+    # Frontend logging endpoint (no auth required)
+    ("logs", "", ["logs"]),
+    # Test harness for programmatic testing (dev only)
+    ("test_harness", "", ["test-harness"]),
+    # Report/Paper generation routes
+    ("report", "/projects/{project_id}/report", ["report"]),
+]
+
+
+@functools.cache
+def _build_api_router() -> APIRouter:
+    """
+    Build the main API router.
+
+    Each route module is imported just before it is included, so nothing
+    below ``src.api.routes`` is loaded until the router is first requested.
+    Tests that register extra routes can call ``_build_api_router.cache_clear()``
+    to force a rebuild.
+
+    No default response class is set: FastAPI serializes response models
+    straight to JSON bytes through Pydantic, which is faster than dumping
+    them to Python objects for ORJSONResponse to encode, and only happens
+    while the route's response class is left at its default.
+    """
+    router = APIRouter()
+
+    for module_name, prefix, tags in _ROUTE_SPECS:
+        module = importlib.import_module(f"src.api.routes.{module_name}")
+        router.include_router(module.router, prefix=prefix, tags=tags)
+
+    return router
+
+
+def get_api_router() -> APIRouter:
+    """Get the main API router, building it on first call."""
+    return _build_api_router()
+
+
+def __getattr__(name: str):
+    """Resolve ``api_router`` on first access (PEP 562)."""
+    if name == "api_router":
+        return get_api_router()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if os.getenv("ARTOOL_EAGER_IMPORT") == "1":
+    api_router = get_api_router()
+
+
+__all__ = ["api_router", "get_api_router"]
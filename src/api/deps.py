@@ -4,20 +4,44 @@ FastAPI dependencies.
 Common dependencies used across API routes.
 """
 
-from typing import Annotated
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Annotated, Optional
+from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Path
 
 from src.config import Settings, get_settings
 from src.models.common import UserContext
 from src.services.auth import get_current_user, get_optional_user
-from src.services.database import SupabaseClient, get_supabase_client
+from src.services.cache import TTLCache
+from src.services.database import (
+    AsyncSupabaseClient,
+    SupabaseClient,
+    get_async_supabase_client,
+    get_supabase_client,
+)
+from src.services.postgres import PgConnection, get_pg_pool
+from src.services.semantic_scholar import (
+    SemanticScholarClient,
+    init_semantic_scholar_client,
+)
+
+if TYPE_CHECKING:
+    from src.services.research_agent import ResearchAgent
 
 # Type aliases for cleaner dependency injection
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 CurrentUser = Annotated[UserContext, Depends(get_current_user)]
 OptionalUser = Annotated[UserContext | None, Depends(get_optional_user)]
 
+# Path ids kept as the raw path string: validated once by pattern, then
+# passed straight to queries without a UUID round-trip.
+UUID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+ProjectId = Annotated[str, Path(pattern=UUID_PATTERN)]
+SourceId = Annotated[str, Path(pattern=UUID_PATTERN)]
+SectionId = Annotated[str, Path(pattern=UUID_PATTERN)]
+SynthesisId = Annotated[str, Path(pattern=UUID_PATTERN)]
+
 
 def get_db() -> SupabaseClient:
     """Get Supabase client for database operations."""
@@ -29,6 +53,98 @@ def get_service_db() -> SupabaseClient:
     return get_supabase_client(use_service_role=True)
 
 
+async def get_async_db() -> AsyncSupabaseClient:
+    """Get async Supabase client for non-blocking database operations."""
+    return await get_async_supabase_client()
+
+
+async def get_pg() -> AsyncIterator[Optional[PgConnection]]:
+    """
+    Get a pooled Postgres connection for the request, or None when the
+    direct pool is not configured (callers then use the Supabase client).
+    """
+    pool = get_pg_pool()
+    if pool is None:
+        yield None
+        return
+    async with pool.acquire() as conn:
+        yield conn
+
+
+async def get_ss_client() -> SemanticScholarClient:
+    """Get the shared Semantic Scholar client (opened on startup)."""
+    return await init_semantic_scholar_client()
+
+
 DatabaseDep = Annotated[SupabaseClient, Depends(get_db)]
 ServiceDatabaseDep = Annotated[SupabaseClient, Depends(get_service_db)]
+AsyncDatabaseDep = Annotated[AsyncSupabaseClient, Depends(get_async_db)]
+PgDep = Annotated[Optional[PgConnection], Depends(get_pg)]
+SemanticScholarDep = Annotated[SemanticScholarClient, Depends(get_ss_client)]
+
+
+# ============================================================================
+# Research Agent
+# ============================================================================
+
+# Agents are reused across requests for the same (project, user) so the
+# resolved session id and any clients they hold survive between calls.
+# Entries expire so a session changed by another worker is picked up.
+_agent_cache = TTLCache(ttl=60, maxsize=256)
+
+
+async def get_research_agent(project_id: ProjectId, user: CurrentUser) -> "ResearchAgent":
+    """
+    Get a cached ResearchAgent for the project and user.
+
+    Declared async so it runs on the event loop rather than the threadpool,
+    which keeps cache access free of races without a lock.
+    """
+    key = (project_id, user.user_id)
+    agent = _agent_cache.get(key)
+    if agent is not None:
+        return agent
+
+    from src.services.research_agent import ResearchAgent
+
+    agent = ResearchAgent(project_id)
+    _agent_cache.set(key, agent)
+    return agent
+
+
+def invalidate_research_agents(project_id: UUID | str) -> None:
+    """Drop cached agents for a project (e.g. after a new session starts)."""
+    project_id = str(project_id)
+    _agent_cache.invalidate(lambda key: key[0] == project_id)
+
+
+AgentDep = Annotated["ResearchAgent", Depends(get_research_agent)]
+
+
+# ============================================================================
+# Project existence
+# ============================================================================
+
+# Projects known to exist. Only positive answers are cached: a project id
+# stays valid until the project is hard-deleted, which calls forget_project.
+_known_projects = TTLCache(ttl=300, maxsize=4096)
+
+
+async def project_exists(db: AsyncSupabaseClient, project_id: str) -> bool:
+    """Check that a project exists, without a query if it was seen recently."""
+    if project_id in _known_projects:
+        return True
+
+    result = await db.table("project")\
+        .select("id", count="exact", head=True)\
+        .eq("id", project_id)\
+        .execute()
+    if not result.count:
+        return False
+    _known_projects.set(project_id, True)
+    return True
+
 
+def forget_project(project_id: UUID | str) -> None:
+    """Drop a deleted project from the existence cache."""
+    _known_projects.pop(str(project_id))
@@ -1,10 +1,36 @@
 """
 API routes package.
 
-All route modules are imported here for easy access.
+Route modules are imported on first attribute access, so importing one
+route (e.g. ``health``) does not pull in the others and their services.
+Set ``ARTOOL_EAGER_IMPORT=1`` to import all of them up front.
 """
 
-from src.api.routes import health, projects, outline, sources, research, discovery, logs, research_agent, chat
+import importlib
+import os
 
-__all__ = ["health", "projects", "outline", "sources", "research", "discovery", "logs", "research_agent", "chat"]
+__all__ = [
+    "health",
+    "projects",
+    "outline",
+    "sources",
+    "research",
+    "discovery",
+    "logs",
+    "research_agent",
+    "chat",
+    "test_harness",
+    "report",
+]
 
+
+def __getattr__(name: str):
+    """Import route submodules lazily (PEP 562)."""
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if os.getenv("ARTOOL_EAGER_IMPORT") == "1":
+    for _name in __all__:
+        importlib.import_module(f"{__name__}.{_name}")
@@ -4,13 +4,23 @@ Chat API endpoints for research UI.
 Provides chat-driven research interface endpoints.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Awaitable, Callable, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import (
+    AgentDep,
+    AsyncDatabaseDep,
+    ProjectId,
+    invalidate_research_agents,
+)
+from src.config import get_settings
 from src.models.chat import (
     Author,
     ChatMessage,
@@ -25,12 +35,62 @@ from src.models.chat import (
     ResearchSessionInfo,
     TopicGroup,
 )
-from src.services.research_agent import ResearchAgent, ResearchAgentError
+from src.models.common import build_model
+from src.services.auth import get_current_user
+from src.services.cache import TTLCache
 
-router = APIRouter()
+# Every chat endpoint requires auth; no handler needs the user itself
+router = APIRouter(dependencies=[Depends(get_current_user)])
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _agent_cls():
+    """
+    Import the research agent on first use.
+
+    The agent pulls in the LLM, search and ingestion stack, which endpoints
+    like /library never need, so it is kept out of module import time.
+    """
+    from src.services.research_agent import ResearchAgent, ResearchAgentError
+    return ResearchAgent, ResearchAgentError
+
+
+# Read-only agent results are reused for a few seconds so tab switches and
+# polling don't repeat the same queries. Cleared when a chat message may
+# have changed project state.
+_CACHE_TTL_SECONDS = 15
+_CACHE_CONTROL = f"private, max-age={_CACHE_TTL_SECONDS}"
+_agent_results = TTLCache(ttl=_CACHE_TTL_SECONDS)
+_MISSING = object()
+
+
+async def _cached(
+    project_id: str,
+    name: str,
+    load: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Return the cached result for (project_id, name), loading it on a miss.
+
+    A hit is a plain dict lookup with no await, so it completes within a
+    single event-loop step. The handlers that use this stay ``async def``,
+    because FastAPI always dispatches a sync ``def`` handler to the
+    threadpool, and that costs more than running the coroutine.
+    """
+    key = (project_id, name)
+    value = _agent_results.get(key, _MISSING)
+    if value is _MISSING:
+        value = await load()
+        _agent_results.set(key, value)
+    return value
+
+
+def invalidate_chat_cache(project_id: str) -> None:
+    """Drop cached agent results for a project."""
+    _agent_results.invalidate(lambda key: key[0] == project_id)
+
+
 # ============================================================================
 # Chat Endpoints
 # ============================================================================
@@ -42,10 +102,8 @@ logger = logging.getLogger(__name__)
     description="Process a user message and return AI response with action taken.",
 )
 async def send_message(
-    project_id: UUID,
+    project_id: ProjectId,
     request: ChatRequest,
-    user: CurrentUser,
-    db: DatabaseDep,
 ) -> ChatResponse:
     """
     Send a message to the research AI.
@@ -56,22 +114,28 @@ async def send_message(
     - Generate outline
     - Link sources to claims
     """
+    ResearchAgent, ResearchAgentError = _agent_cls()
     try:
         agent = ResearchAgent(project_id, auto_ingest=request.auto_ingest)
         response = await agent.process_message(request.message)
         return response
     except ResearchAgentError as e:
-        logger.warning(f"Research agent error: {e.message}")
+        logger.warning("Research agent error: %s", e.message)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.message,
         )
     except Exception as e:
-        logger.exception(f"Error processing chat message: {e}")
+        logger.exception("Error processing chat message: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
+    finally:
+        # Even a failed message may have added papers or sections, or
+        # started a new session that cached agents don't know about
+        invalidate_chat_cache(project_id)
+        invalidate_research_agents(project_id)
 
 
 @router.get(
@@ -81,17 +145,15 @@ async def send_message(
     description="Get conversation history for the research session.",
 )
 async def get_chat_history(
-    project_id: UUID,
-    user: CurrentUser,
-    db: DatabaseDep,
+    project_id: ProjectId,
+    agent: AgentDep,
     limit: int = 50,
 ) -> list[ChatMessage]:
     """Get chat history for the current session."""
     try:
-        agent = ResearchAgent(project_id)
         return await agent.get_chat_history(limit)
     except Exception as e:
-        logger.exception(f"Error getting chat history: {e}")
+        logger.exception("Error getting chat history: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -109,9 +171,9 @@ async def get_chat_history(
     description="Get indexed list of papers for the Explore tab.",
 )
 async def get_papers_list(
-    project_id: UUID,
-    user: CurrentUser,
-    db: DatabaseDep,
+    project_id: ProjectId,
+    agent: AgentDep,
+    response: Response,
 ) -> list[PaperListItem]:
     """
     Get papers with display indices.
@@ -119,10 +181,10 @@ async def get_papers_list(
     Each paper has an index for easy referencing in chat (e.g., "paper #5").
     """
     try:
-        agent = ResearchAgent(project_id)
-        return await agent.get_papers_list()
+        response.headers["Cache-Control"] = _CACHE_CONTROL
+        return await _cached(project_id, "papers", agent.get_papers_list)
     except Exception as e:
-        logger.exception(f"Error getting papers list: {e}")
+        logger.exception("Error getting papers list: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -136,14 +198,12 @@ async def get_papers_list(
     description="Get full details for a paper by its display index.",
 )
 async def get_paper_details(
-    project_id: UUID,
+    project_id: ProjectId,
     index: int,
-    user: CurrentUser,
-    db: DatabaseDep,
+    agent: AgentDep,
 ) -> PaperDetails:
     """Get full paper details by display index."""
     try:
-        agent = ResearchAgent(project_id)
         details = await agent.get_paper_details(index)
         
         if not details:
@@ -156,7 +216,7 @@ async def get_paper_details(
     except HTTPException:
         raise
     except Exception as e:
-        logger.exception(f"Error getting paper details: {e}")
+        logger.exception("Error getting paper details: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -167,6 +227,48 @@ async def get_paper_details(
 # Library Endpoints (for Library Tab - Zotero-like view)
 # ============================================================================
 
+# Rows fetched per round-trip when loading the library
+_LIBRARY_PAGE_SIZE = 1000
+
+_LIBRARY_COLUMNS = (
+    "id,title,authors,publication_year,topic,topic_confidence,doi,journal,"
+    "citation_count,ingestion_status,updated_at"
+)
+
+
+def _to_library_paper(source: dict, topic: str, strict: bool) -> LibraryPaper:
+    """Build a LibraryPaper from a source row (see build_model)."""
+    ingested_at = source.get("updated_at")
+    return build_model(
+        LibraryPaper,
+        strict,
+        id=UUID(source["id"]),
+        title=source.get("title") or "Unknown",
+        # Authors are stored as [{"name": ...}, ...] (see migration 007)
+        authors=[
+            build_model(Author, strict, name=a["name"])
+            for a in source.get("authors") or []
+        ],
+        year=source.get("publication_year"),
+        topic=topic,
+        topic_confidence=source.get("topic_confidence") or 0.0,
+        doi=source.get("doi"),
+        journal=source.get("journal"),
+        citation_count=source.get("citation_count"),
+        ingestion_status=source.get("ingestion_status") or "pending",
+        ingested_at=datetime.fromisoformat(ingested_at) if ingested_at else None,
+    )
+
+
+def _topic_group(
+    topic: str, papers: list[LibraryPaper], strict: bool
+) -> TopicGroup:
+    """Build a TopicGroup whose count comes from the list already in hand."""
+    return build_model(
+        TopicGroup, strict, topic=topic, paper_count=len(papers), papers=papers
+    )
+
+
 @router.get(
     "/library",
     response_model=LibraryResponse,
@@ -174,69 +276,61 @@ async def get_paper_details(
     description="Get ingested papers grouped by AI-detected topics for Zotero-like view.",
 )
 async def get_library(
-    project_id: UUID,
-    user: CurrentUser,
-    db: DatabaseDep,
+    project_id: ProjectId,
+    db: AsyncDatabaseDep,
 ) -> LibraryResponse:
     """
     Get library of ingested papers grouped by topic.
-    
-    Papers are classified by AI into topics like "Machine Learning", 
+
+    Papers are classified by AI into topics like "Machine Learning",
     "Quantum Computing", etc. for easy browsing.
     """
+    strict = get_settings().strict_validation
+
     try:
-        # Get all sources for this project that are ingested
-        result = db.table("source")\
-            .select("*")\
-            .eq("project_id", str(project_id))\
-            .eq("ingestion_status", "ready")\
-            .order("topic")\
-            .execute()
-        
-        sources = result.data or []
-        
-        # Group by topic
-        topic_map: dict[str, list[LibraryPaper]] = {}
-        for source in sources:
-            topic = source.get("topic") or "Uncategorized"
-            
-            if topic not in topic_map:
-                topic_map[topic] = []
-            
-            # Parse authors
-            authors_raw = source.get("authors") or []
-            authors = [
-                Author(name=a.get("name", "Unknown") if isinstance(a, dict) else str(a))
-                for a in authors_raw
-            ]
-            
-            paper = LibraryPaper(
-                id=source["id"],
-                title=source.get("title", "Unknown"),
-                authors=authors,
-                year=source.get("publication_year"),
-                topic=topic,
-                topic_confidence=source.get("topic_confidence", 0.0),
-                doi=source.get("doi"),
-                journal=source.get("journal"),
-                citation_count=source.get("citation_count"),
-                ingestion_status=source.get("ingestion_status", "pending"),
-                ingested_at=source.get("updated_at"),
-            )
-            topic_map[topic].append(paper)
-        
-        # Build response
-        topics = [
-            TopicGroup(
-                topic=topic_name,
-                paper_count=len(papers),
-                papers=papers,
-            )
-            for topic_name, papers in sorted(topic_map.items())
-        ]
-        
-        total_papers = sum(len(papers) for papers in topic_map.values())
-        
+        # Page through ingested sources, already ordered by topic, and group
+        # them as they arrive. Untagged papers (NULL topic) sort last and
+        # land in "Uncategorized".
+        topics: list[TopicGroup] = []
+        current_topic: Optional[str] = None
+        current_papers: list[LibraryPaper] = []
+        total_papers = 0
+        offset = 0
+
+        while True:
+            result = await db.table("source")\
+                .select(_LIBRARY_COLUMNS)\
+                .eq("project_id", project_id)\
+                .eq("ingestion_status", "ready")\
+                .order("topic")\
+                .order("id")\
+                .range(offset, offset + _LIBRARY_PAGE_SIZE - 1)\
+                .execute()
+
+            rows = result.data or []
+
+            # Groups may span page boundaries, so carry the open group over
+            for topic_name, group in groupby(
+                rows, key=lambda s: s.get("topic") or "Uncategorized"
+            ):
+                if topic_name != current_topic:
+                    if current_papers:
+                        topics.append(_topic_group(current_topic, current_papers, strict))
+                    current_topic = topic_name
+                    current_papers = []
+                current_papers.extend(
+                    _to_library_paper(source, topic_name, strict) for source in group
+                )
+
+            total_papers += len(rows)
+            if len(rows) < _LIBRARY_PAGE_SIZE:
+                break
+            offset += _LIBRARY_PAGE_SIZE
+
+        if current_papers:
+            topics.append(_topic_group(current_topic, current_papers, strict))
+
+        # Totals were counted while paging; no second walk over the groups
         return LibraryResponse(
             project_id=project_id,
             topics=topics,
@@ -246,7 +340,7 @@ async def get_library(
             papers_pending=0,  # These are all ingested
         )
     except Exception as e:
-        logger.exception(f"Error getting library: {e}")
+        logger.exception("Error getting library: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -264,9 +358,9 @@ async def get_library(
     description="Get outline with claims and source badges for the Outline tab.",
 )
 async def get_outline_with_sources(
-    project_id: UUID,
-    user: CurrentUser,
-    db: DatabaseDep,
+    project_id: ProjectId,
+    agent: AgentDep,
+    response: Response,
 ) -> OutlineWithSources:
     """
     Get outline with source information.
@@ -274,10 +368,10 @@ async def get_outline_with_sources(
     Each claim shows which papers support it and which need more sources.
     """
     try:
-        agent = ResearchAgent(project_id)
-        return await agent.get_outline_with_sources()
+        response.headers["Cache-Control"] = _CACHE_CONTROL
+        return await _cached(project_id, "outline", agent.get_outline_with_sources)
     except Exception as e:
-        logger.exception(f"Error getting outline: {e}")
+        logger.exception("Error getting outline: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -295,9 +389,9 @@ async def get_outline_with_sources(
     description="Get knowledge tree for graph visualization.",
 )
 async def get_knowledge_tree(
-    project_id: UUID,
-    user: CurrentUser,
-    db: DatabaseDep,
+    project_id: ProjectId,
+    agent: AgentDep,
+    response: Response,
 ) -> KnowledgeTreeGraph:
     """
     Get knowledge tree for visualization.
@@ -305,10 +399,10 @@ async def get_knowledge_tree(
     Returns nodes and edges for a force-directed graph.
     """
     try:
-        agent = ResearchAgent(project_id)
-        return await agent.get_knowledge_tree_graph()
+        response.headers["Cache-Control"] = _CACHE_CONTROL
+        return await _cached(project_id, "tree", agent.get_knowledge_tree_graph)
     except Exception as e:
-        logger.exception(f"Error getting knowledge tree: {e}")
+        logger.exception("Error getting knowledge tree: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -321,26 +415,37 @@ async def get_knowledge_tree(
 
 @router.get(
     "/session",
-    response_model=Optional[ResearchSessionInfo],
+    response_model=None,
+    responses={
+        200: {"model": ResearchSessionInfo},
+        204: {"description": "No research session exists yet"},
+    },
     summary="Get current research session",
     description="Get info about the current research session if one exists.",
 )
 async def get_session(
-    project_id: UUID,
-    user: CurrentUser,
-    db: DatabaseDep,
-) -> Optional[ResearchSessionInfo]:
-    """Get current research session info."""
-    try:
-        agent = ResearchAgent(project_id)
+    project_id: ProjectId,
+    agent: AgentDep,
+    response: Response,
+) -> Response | ResearchSessionInfo:
+    """
+    Get current research session info.
+    
+    Returns ResearchSessionInfo, or 204 No Content if no session exists.
+    The model is returned as-is (no response_model re-validation).
+    """
+    
+    async def load_session_info() -> Optional[ResearchSessionInfo]:
         session = await agent.get_session()
         
         if not session:
             return None
         
-        # Get stats
-        papers = await agent.get_papers_list()
-        outline = await agent.get_outline_with_sources()
+        # Get stats (independent reads, run concurrently)
+        papers, outline = await asyncio.gather(
+            _cached(project_id, "papers", agent.get_papers_list),
+            _cached(project_id, "outline", agent.get_outline_with_sources),
+        )
         
         return ResearchSessionInfo(
             id=session.id,
@@ -348,13 +453,23 @@ async def get_session(
             topic=session.topic,
             status=session.status.value,
             papers_found=len(papers),
-            papers_ingested=len([p for p in papers if p.is_ingested]),
+            papers_ingested=sum(1 for p in papers if p.is_ingested),
             outline_sections=outline.total_sections,
             created_at=session.created_at,
             updated_at=session.updated_at,
         )
+    
+    try:
+        response.headers["Cache-Control"] = _CACHE_CONTROL
+        info = await _cached(project_id, "session", load_session_info)
+        if info is None:
+            return Response(
+                status_code=status.HTTP_204_NO_CONTENT,
+                headers={"Cache-Control": _CACHE_CONTROL},
+            )
+        return info
     except Exception as e:
-        logger.exception(f"Error getting session: {e}")
+        logger.exception("Error getting session: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
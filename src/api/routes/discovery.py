@@ -4,15 +4,22 @@ Knowledge Tree / Citation Discovery API routes.
 Explore the citation graph to discover related papers.
 """
 
+import hashlib
 import logging
 from typing import Optional
-from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import CurrentUser, DatabaseDep, ProjectId, SourceId
 from src.models.source import PaperSearchResult, SourceCreate
-from src.services.discovery import DiscoveryService, RelationType
+from src.services.discovery import (
+    DiscoveryService,
+    ExploreBudget,
+    RelationType,
+    SourceNotFoundError,
+)
 from src.services.semantic_scholar import SemanticScholarError
 
 logger = logging.getLogger(__name__)
@@ -20,48 +27,63 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _etag_response(request: Request, payload: dict) -> Response:
+    """
+    Serialize payload with an ETag, answering 304 if the client has it.
+    
+    Discovery results are cached server-side for a day, so repeat requests
+    usually produce identical bodies that clients can revalidate cheaply.
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag},
+        )
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
 @router.get(
     "/{source_id}/references",
     summary="Get papers this source cites",
     description="Discover papers in this source's bibliography (backward references).",
 )
 async def get_source_references(
-    project_id: UUID,
-    source_id: UUID,
+    project_id: ProjectId,
+    source_id: SourceId,
+    request: Request,
     user: CurrentUser,
-    db: DatabaseDep,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-) -> dict:
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"
+    ),
+) -> Response:
     """
     Get papers that this source references (cites).
     
     These are the papers in the bibliography that the source
     was built upon. Useful for understanding the foundational work.
     """
-    # Verify source exists
-    result = db.table("source")\
-        .select("id")\
-        .eq("id", str(source_id))\
-        .eq("project_id", str(project_id))\
-        .maybe_single()\
-        .execute()
-    
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source not found",
-        )
-    
     try:
         service = DiscoveryService(project_id)
-        discovery = await service.get_references(source_id, limit, offset)
+        discovery = await service.get_references(source_id, limit, cursor)
         
         logger.info(
             f"Found {len(discovery.papers)} references for {source_id}"
         )
-        return discovery.to_dict()
+        return _etag_response(request, discovery.to_dict())
         
+    except SourceNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source not found",
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,41 +107,35 @@ async def get_source_references(
     description="Discover papers that cite this source (forward citations).",
 )
 async def get_source_citations(
-    project_id: UUID,
-    source_id: UUID,
+    project_id: ProjectId,
+    source_id: SourceId,
+    request: Request,
     user: CurrentUser,
-    db: DatabaseDep,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-) -> dict:
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"
+    ),
+) -> Response:
     """
     Get papers that cite this source.
     
     These are newer papers that reference this work.
     Useful for finding follow-up research and recent developments.
     """
-    result = db.table("source")\
-        .select("id")\
-        .eq("id", str(source_id))\
-        .eq("project_id", str(project_id))\
-        .maybe_single()\
-        .execute()
-    
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source not found",
-        )
-    
     try:
         service = DiscoveryService(project_id)
-        discovery = await service.get_citations(source_id, limit, offset)
+        discovery = await service.get_citations(source_id, limit, cursor)
         
         logger.info(
             f"Found {len(discovery.papers)} citations for {source_id}"
         )
-        return discovery.to_dict()
+        return _etag_response(request, discovery.to_dict())
         
+    except SourceNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source not found",
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -143,31 +159,18 @@ async def get_source_citations(
     description="Discover papers similar to this source based on content.",
 )
 async def get_related_papers(
-    project_id: UUID,
-    source_id: UUID,
+    project_id: ProjectId,
+    source_id: SourceId,
+    request: Request,
     user: CurrentUser,
-    db: DatabaseDep,
     limit: int = Query(10, ge=1, le=50),
-) -> dict:
+) -> Response:
     """
     Get semantically related papers.
     
     Uses Semantic Scholar's recommendation engine to find
     papers with similar content and topics.
     """
-    result = db.table("source")\
-        .select("id")\
-        .eq("id", str(source_id))\
-        .eq("project_id", str(project_id))\
-        .maybe_single()\
-        .execute()
-    
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source not found",
-        )
-    
     try:
         service = DiscoveryService(project_id)
         discovery = await service.get_related(source_id, limit)
@@ -175,8 +178,13 @@ async def get_related_papers(
         logger.info(
             f"Found {len(discovery.papers)} related papers for {source_id}"
         )
-        return discovery.to_dict()
+        return _etag_response(request, discovery.to_dict())
         
+    except SourceNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source not found",
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -195,12 +203,12 @@ async def get_related_papers(
     description="Get references, citations, and related papers in one call.",
 )
 async def discover_all(
-    project_id: UUID,
-    source_id: UUID,
+    project_id: ProjectId,
+    source_id: SourceId,
+    request: Request,
     user: CurrentUser,
-    db: DatabaseDep,
     limit_per_type: int = Query(5, ge=1, le=20),
-) -> dict:
+) -> Response:
     """
     Discover all types of related papers for a source.
     
@@ -209,25 +217,17 @@ async def discover_all(
     - Citations: Papers that cite this source
     - Related: Semantically similar papers
     """
-    result = db.table("source")\
-        .select("id")\
-        .eq("id", str(source_id))\
-        .eq("project_id", str(project_id))\
-        .maybe_single()\
-        .execute()
-    
-    if not result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source not found",
-        )
-    
     try:
         service = DiscoveryService(project_id)
         discovery = await service.discover_all(source_id, limit_per_type)
         
-        return discovery
+        return _etag_response(request, discovery)
         
+    except SourceNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source not found",
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -241,11 +241,12 @@ async def discover_all(
     description="Discover related papers for all sources in the project.",
 )
 async def explore_knowledge_tree(
-    project_id: UUID,
+    project_id: ProjectId,
+    request: Request,
     user: CurrentUser,
     db: DatabaseDep,
     limit_per_source: int = Query(3, ge=1, le=10),
-) -> dict:
+) -> Response:
     """
     Explore the citation graph for the entire project.
     
@@ -256,36 +257,111 @@ async def explore_knowledge_tree(
     
     Results are deduplicated across sources.
     """
-    # Verify project exists
-    project_result = db.table("project")\
-        .select("id")\
-        .eq("id", str(project_id))\
-        .maybe_single()\
-        .execute()
-    
-    if not project_result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
     try:
         service = DiscoveryService(project_id)
         tree = await service.explore_project_graph(
             depth=1,
             limit_per_source=limit_per_source,
         )
-        
-        logger.info(
-            f"Explored knowledge tree for {project_id}: "
-            f"{tree.get('sources_explored', 0)} sources"
+    except Exception as e:
+        logger.exception(f"Knowledge tree exploration failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Exploration error: {str(e)}",
         )
-        return tree
+    
+    # The service's source query answers existence for any project with
+    # sources; only an empty result needs a separate project lookup
+    if not tree.get("discoveries"):
+        project_result = db.table("project")\
+            .select("id", count="exact", head=True)\
+            .eq("id", str(project_id))\
+            .execute()
         
+        if not project_result.count:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found",
+            )
+    
+    logger.info(
+        f"Explored knowledge tree for {project_id}: "
+        f"{tree.get('sources_explored', 0)} sources"
+    )
+    return _etag_response(request, tree)
+
+
+@router.get(
+    "/tree/stream",
+    summary="Stream project knowledge tree",
+    description=(
+        "Same discoveries as /tree, streamed as NDJSON: one "
+        '{"source_id", "discovery"} object per line, in source order. '
+        'A final {"truncated": true, "reason"} line marks a partial tree.'
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_knowledge_tree(
+    project_id: ProjectId,
+    user: CurrentUser,
+    db: DatabaseDep,
+    limit_per_source: int = Query(3, ge=1, le=10),
+) -> StreamingResponse:
+    """
+    Stream the citation graph for the entire project.
+    
+    Each source's discoveries are written as soon as they (and every
+    source before them) are ready, so clients can render the first
+    sources while the rest are still being fetched.
+    """
+    service = DiscoveryService(project_id)
+    budget = ExploreBudget()
+    entries = service.iter_project_graph(
+        limit_per_source=limit_per_source,
+        budget=budget,
+    )
+    
+    # Pull the first entry before committing to a 200 so a missing
+    # project can still be reported as 404
+    try:
+        first = await anext(entries, None)
     except Exception as e:
         logger.exception(f"Knowledge tree exploration failed: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Exploration error: {str(e)}",
         )
+    
+    if first is None:
+        project_result = db.table("project")\
+            .select("id", count="exact", head=True)\
+            .eq("id", str(project_id))\
+            .execute()
+        
+        if not project_result.count:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found",
+            )
+    
+    async def lines():
+        if first is None:
+            return
+        try:
+            yield _ndjson_line(*first)
+            async for entry in entries:
+                yield _ndjson_line(*entry)
+        finally:
+            await entries.aclose()
+        
+        if budget.truncated:
+            yield orjson.dumps(
+                {"truncated": True, "reason": budget.truncated}
+            ) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 
+def _ndjson_line(source_id: str, discovery: dict) -> bytes:
+    """Encode one knowledge tree entry as an NDJSON line."""
+    return orjson.dumps({"source_id": source_id, "discovery": discovery}) + b"\n"
@@ -4,39 +4,130 @@ Health check endpoints.
 Provides system health and readiness checks.
 """
 
+import asyncio
+import itertools
 import logging
-from collections import deque
+import time
+from array import array
 from datetime import datetime
 from typing import Optional
 
 import httpx
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Response
 from pydantic import BaseModel, Field
 
 from src.config import get_settings
 from src.models.common import HealthResponse
-from src.services.database import check_database_connection, get_supabase_client
+from src.services.cache import TTLCache
+from src.services.database import (
+    check_database_connection,
+    get_async_supabase_client,
+)
 
 logger = logging.getLogger(__name__)
 
+_BUFFER_SIZE = 100
+
+
+class _RingBuffer:
+    """
+    Fixed-size ring of (timestamp, payload) for diagnostics.
+    
+    Timestamps are stored as epoch nanoseconds in a flat array and only
+    rendered to ISO strings when a snapshot is taken, so recording an entry
+    on the request path is just two slot writes.
+    """
+    
+    def __init__(self, size: int = _BUFFER_SIZE):
+        self._size = size
+        self._timestamps = array("Q", [0] * size)
+        self._payloads: list[Optional[dict]] = [None] * size
+        self._counter = itertools.count()
+        self._written = 0
+    
+    def append(self, payload: dict) -> None:
+        i = next(self._counter)
+        slot = i % self._size
+        self._timestamps[slot] = time.time_ns()
+        self._payloads[slot] = payload
+        self._written = i + 1
+    
+    def snapshot(self, limit: Optional[int] = None) -> list[dict]:
+        """Return up to ``limit`` most recent entries, oldest first."""
+        end = self._written
+        count = min(end, self._size, limit or self._size)
+        entries = []
+        for i in range(end - count, end):
+            slot = i % self._size
+            ts = datetime.utcfromtimestamp(self._timestamps[slot] / 1e9)
+            entries.append({**self._payloads[slot], "timestamp": ts.isoformat()})
+        return entries
+
+
 # In-memory buffers for diagnostics
-_recent_errors: deque = deque(maxlen=100)
-_recent_requests: deque = deque(maxlen=100)
+_recent_errors = _RingBuffer()
+_recent_requests = _RingBuffer()
 
 
 def log_error(error: dict) -> None:
     """Add an error to the recent errors buffer."""
-    error["timestamp"] = datetime.utcnow().isoformat()
     _recent_errors.append(error)
 
 
 def log_request(request: dict) -> None:
     """Add a request to the recent requests buffer."""
-    request["timestamp"] = datetime.utcnow().isoformat()
     _recent_requests.append(request)
 
 router = APIRouter()
 
+# Settings don't change for the life of the process, so read them once
+# rather than on every health probe
+_SETTINGS = get_settings()
+_VERSION = _SETTINGS.app_version
+_ENVIRONMENT = _SETTINGS.environment
+
+# Probe bodies are constant, so serialize them once
+_READY_BODY = orjson.dumps({"ready": True})
+_ALIVE_BODY = orjson.dumps({"alive": True})
+
+# Database health is refreshed in the background so /health does no I/O.
+# A result older than the max age is reported as unknown (app degraded).
+DB_HEALTH_INTERVAL_SECONDS = 5.0
+DB_HEALTH_MAX_AGE_SECONDS = 30.0
+
+_db_health: Optional[tuple[bool, float]] = None  # (healthy, monotonic time)
+_db_health_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_db_health() -> None:
+    """Re-check the database forever, recording the latest result."""
+    global _db_health
+    while True:
+        db_status = await _probe_database()
+        _db_health = (db_status.status == "healthy", time.monotonic())
+        await asyncio.sleep(DB_HEALTH_INTERVAL_SECONDS)
+
+
+def start_db_health_monitor() -> None:
+    """Start the background database health refresher (called on startup)."""
+    global _db_health_task
+    if _db_health_task is None or _db_health_task.done():
+        _db_health_task = asyncio.create_task(_refresh_db_health())
+
+
+async def stop_db_health_monitor() -> None:
+    """Stop the background database health refresher (called on shutdown)."""
+    global _db_health_task, _db_health
+    if _db_health_task is not None:
+        _db_health_task.cancel()
+        try:
+            await _db_health_task
+        except asyncio.CancelledError:
+            pass
+        _db_health_task = None
+    _db_health = None
+
 
 @router.get(
     "",
@@ -49,13 +140,20 @@ async def health_check() -> HealthResponse:
     Check API health status.
     
     Returns basic health information including version and environment.
-    Also checks database connectivity.
+    Database status comes from the background monitor; if it isn't
+    running (e.g. the app was started without its lifespan) the database
+    is checked inline.
     """
-    settings = get_settings()
-    
-    # Check database
-    db_healthy = await check_database_connection()
-    db_status = "healthy" if db_healthy else "unhealthy"
+    if _db_health is None:
+        db_healthy = await check_database_connection()
+        db_status = "healthy" if db_healthy else "unhealthy"
+    else:
+        db_healthy, checked_at = _db_health
+        if time.monotonic() - checked_at > DB_HEALTH_MAX_AGE_SECONDS:
+            db_healthy = False
+            db_status = "unknown"
+        else:
+            db_status = "healthy" if db_healthy else "unhealthy"
     
     # TODO: Add Hyperion health check when client is implemented
     hyperion_status = "not_checked"
@@ -65,8 +163,8 @@ async def health_check() -> HealthResponse:
     
     return HealthResponse(
         status=overall_status,
-        version=settings.app_version,
-        environment=settings.environment,
+        version=_VERSION,
+        environment=_ENVIRONMENT,
         timestamp=datetime.utcnow(),
         database=db_status,
         hyperion=hyperion_status,
@@ -78,13 +176,13 @@ async def health_check() -> HealthResponse:
     summary="Readiness check",
     description="Check if the API is ready to accept traffic.",
 )
-async def readiness_check() -> dict:
+async def readiness_check() -> Response:
     """
     Check if the API is ready to accept traffic.
     
     This is a lightweight check for load balancers and orchestrators.
     """
-    return {"ready": True}
+    return Response(_READY_BODY, media_type="application/json")
 
 
 @router.get(
@@ -92,13 +190,13 @@ async def readiness_check() -> dict:
     summary="Liveness check",
     description="Check if the API process is alive.",
 )
-async def liveness_check() -> dict:
+async def liveness_check() -> Response:
     """
     Check if the API process is alive.
     
     This is the most basic check - if this fails, restart the container.
     """
-    return {"alive": True}
+    return Response(_ALIVE_BODY, media_type="application/json")
 
 
 # =============================================================================
@@ -135,6 +233,126 @@ class DiagnosticsResponse(BaseModel):
     config: dict = Field(default_factory=dict)
 
 
+_SEMANTIC_SCHOLAR_PROBE_URL = (
+    "https://api.semanticscholar.org/graph/v1/paper/search?query=test&limit=1"
+)
+
+# Shared client for external probes so repeated diagnostics calls reuse
+# pooled (HTTP/2) connections instead of handshaking every time
+_probe_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_probe_client() -> httpx.AsyncClient:
+    """Get the shared probe client, creating it on first use."""
+    global _probe_client
+    if _probe_client is None or _probe_client.is_closed:
+        _probe_client = httpx.AsyncClient(
+            timeout=5.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _probe_client
+
+
+async def close_probe_client() -> None:
+    """Close the shared probe client (called on app shutdown)."""
+    global _probe_client
+    if _probe_client is not None:
+        await _probe_client.aclose()
+        _probe_client = None
+
+
+# Recent probe results, so frequent diagnostics scrapes don't spend the
+# Semantic Scholar rate limit or wait on an external round trip each time.
+# LightRAG is in-cluster and cheap to re-check, so it expires sooner.
+_lightrag_probe_cache = TTLCache(ttl=10, maxsize=1)
+_semantic_scholar_probe_cache = TTLCache(ttl=30, maxsize=1)
+_projects_count_cache = TTLCache(ttl=60, maxsize=1)
+
+
+async def _probe(
+    name: str,
+    url: str,
+    failure_status: str,
+    cache: TTLCache,
+) -> ServiceStatus:
+    """
+    GET url and report the service status with latency.
+    
+    Args:
+        name: Service name for the report.
+        url: Health/probe URL.
+        failure_status: Status to report when the request itself fails.
+        cache: Cache holding the last result for this probe.
+    """
+    cached = cache.get(url)
+    if cached is not None:
+        return cached
+    
+    start = time.perf_counter_ns()
+    try:
+        response = await _get_probe_client().get(url)
+        latency = (time.perf_counter_ns() - start) / 1_000_000
+        result = ServiceStatus(
+            name=name,
+            status="healthy" if response.status_code == 200 else "degraded",
+            latency_ms=latency,
+        )
+    except Exception as e:
+        result = ServiceStatus(
+            name=name,
+            status=failure_status,
+            message=str(e)[:100],
+        )
+    
+    cache.set(url, result)
+    return result
+
+
+async def _probe_database() -> ServiceStatus:
+    """Run a trivial query and report database status with latency."""
+    start = time.perf_counter_ns()
+    try:
+        db = await get_async_supabase_client()
+        await db.table("project").select("id", head=True).limit(1).execute()
+        return ServiceStatus(
+            name="database",
+            status="healthy",
+            latency_ms=(time.perf_counter_ns() - start) / 1_000_000,
+        )
+    except Exception as e:
+        logger.error(f"Database connection check failed: {e}")
+        return ServiceStatus(
+            name="database",
+            status="unhealthy",
+            message=str(e),
+        )
+
+
+async def _count_projects() -> int:
+    """
+    Approximate project count, or 0 if the database can't be reached.
+    
+    Uses PostgREST's planner estimate rather than an exact COUNT(*) scan
+    and reuses it for a minute; diagnostics only needs the magnitude.
+    """
+    cached = _projects_count_cache.get("projects")
+    if cached is not None:
+        return cached
+    
+    try:
+        db = await get_async_supabase_client()
+        result = await db.table("project")\
+            .select("id", count="estimated", head=True)\
+            .execute()
+        count = result.count or 0
+    except Exception:
+        return 0
+    
+    _projects_count_cache.set("projects", count)
+    return count
+
+
 @router.get(
     "/diagnostics",
     response_model=DiagnosticsResponse,
@@ -152,70 +370,27 @@ async def get_diagnostics() -> DiagnosticsResponse:
     - Active connection counts
     - Environment info
     """
-    settings = get_settings()
-    services = []
+    settings = _SETTINGS
     
-    # Check database
-    db_start = datetime.utcnow()
-    try:
-        db_healthy = await check_database_connection()
-        db_latency = (datetime.utcnow() - db_start).total_seconds() * 1000
-        services.append(ServiceStatus(
-            name="database",
-            status="healthy" if db_healthy else "unhealthy",
-            latency_ms=db_latency,
-        ))
-    except Exception as e:
-        services.append(ServiceStatus(
-            name="database",
-            status="unhealthy",
-            message=str(e),
-        ))
-    
-    # Check LightRAG
-    rag_start = datetime.utcnow()
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{settings.lightrag_url}/health")
-            rag_latency = (datetime.utcnow() - rag_start).total_seconds() * 1000
-            services.append(ServiceStatus(
-                name="lightrag",
-                status="healthy" if response.status_code == 200 else "degraded",
-                latency_ms=rag_latency,
-            ))
-    except Exception as e:
-        services.append(ServiceStatus(
-            name="lightrag",
-            status="unhealthy",
-            message=str(e)[:100],
-        ))
-    
-    # Check Semantic Scholar (simple connectivity)
-    ss_start = datetime.utcnow()
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get("https://api.semanticscholar.org/graph/v1/paper/search?query=test&limit=1")
-            ss_latency = (datetime.utcnow() - ss_start).total_seconds() * 1000
-            services.append(ServiceStatus(
-                name="semantic_scholar",
-                status="healthy" if response.status_code == 200 else "degraded",
-                latency_ms=ss_latency,
-            ))
-    except Exception as e:
-        services.append(ServiceStatus(
-            name="semantic_scholar",
-            status="unknown",
-            message=str(e)[:100],
-        ))
-    
-    # Get project count
-    projects_count = 0
-    try:
-        db = get_supabase_client()
-        result = db.table("project").select("id", count="exact").execute()
-        projects_count = result.count or 0
-    except Exception:
-        pass
+    # Probes are independent, so run them together: latency is the slowest
+    # probe rather than the sum of all of them
+    db_status, rag_status, s2_status, projects_count = await asyncio.gather(
+        _probe_database(),
+        _probe(
+            "lightrag",
+            f"{settings.lightrag_url}/health",
+            "unhealthy",
+            _lightrag_probe_cache,
+        ),
+        _probe(
+            "semantic_scholar",
+            _SEMANTIC_SCHOLAR_PROBE_URL,
+            "unknown",
+            _semantic_scholar_probe_cache,
+        ),
+        _count_projects(),
+    )
+    services = [db_status, rag_status, s2_status]
     
     # Overall status
     unhealthy_count = sum(1 for s in services if s.status == "unhealthy")
@@ -226,14 +401,27 @@ async def get_diagnostics() -> DiagnosticsResponse:
     else:
         overall_status = "unhealthy"
     
+    # Cache stats (informational; not part of the overall status)
+    from src.services.discovery import discovery_cache
+    
+    services.append(ServiceStatus(
+        name="discovery_cache",
+        status="healthy",
+        message=(
+            f"hit_rate={discovery_cache.hit_rate:.2f} "
+            f"hits={discovery_cache.hits} misses={discovery_cache.misses} "
+            f"entries={len(discovery_cache)}"
+        ),
+    ))
+    
     return DiagnosticsResponse(
         timestamp=datetime.utcnow(),
         status=overall_status,
-        version=settings.app_version,
-        environment=settings.environment,
+        version=_VERSION,
+        environment=_ENVIRONMENT,
         services=services,
-        recent_errors=list(_recent_errors),
-        request_logs=list(_recent_requests)[-50:],  # Last 50 requests
+        recent_errors=_recent_errors.snapshot(),
+        request_logs=_recent_requests.snapshot(50),  # Last 50 requests
         active_connections=0,  # TODO: Track active connections
         projects_count=projects_count,
         config={
@@ -9,8 +9,10 @@ import logging
 from datetime import datetime
 from typing import Optional, Literal
 
-from fastapi import APIRouter
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError
+from pydantic.json_schema import models_json_schema
 
 logger = logging.getLogger("frontend")
 
@@ -24,6 +26,13 @@ logger.setLevel(logging.DEBUG)
 
 router = APIRouter(prefix="/logs", tags=["Logs"])
 
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+}
+
 
 class FrontendLogEntry(BaseModel):
     """A log entry from the frontend."""
@@ -44,37 +53,69 @@ class LogBatch(BaseModel):
     logs: list[FrontendLogEntry]
 
 
-@router.post("", status_code=204)
-async def receive_logs(batch: LogBatch):
+# The log body is validated from raw bytes, so FastAPI never sees its model.
+# These schemas are registered under components.schemas by create_app so the
+# request body's $refs resolve in the OpenAPI document.
+_, _json_schema = models_json_schema(
+    [(LogBatch, "validation")],
+    ref_template="#/components/schemas/{model}",
+)
+OPENAPI_SCHEMAS: dict[str, dict] = _json_schema["$defs"]
+
+
+@router.post(
+    "",
+    status_code=204,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/LogBatch"},
+                },
+            },
+        },
+    },
+)
+async def receive_logs(request: Request):
     """
     Receive logs from the frontend.
     
     This endpoint allows the frontend to send logs to the backend
     where they can be viewed in server logs for debugging.
+    
+    The body is validated straight from the raw JSON bytes rather than
+    through FastAPI's body parsing, which first builds a dict and then
+    validates it; batches can be large and arrive constantly.
     """
+    try:
+        batch = LogBatch.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+    
     for entry in batch.logs:
-        # Format the log message
-        parts = [f"[{entry.source}]", entry.message]
+        level = _LEVELS[entry.level]
+        # Skip filtered entries before touching any of their fields
+        if not logger.isEnabledFor(level):
+            continue
         
+        # Only the parts the entry has, with lazy %-style arguments
+        fmt = "[%s] %s"
+        args = [entry.source, entry.message]
         if entry.url:
-            parts.append(f"@ {entry.url}")
-        
+            fmt += " @ %s"
+            args.append(entry.url)
         if entry.data:
-            parts.append(f"| data: {entry.data}")
-        
-        message = " ".join(parts)
+            fmt += " | data: %s"
+            args.append(entry.data)
+        if entry.error and level == logging.ERROR:
+            fmt += "\n  Stack: %s"
+            args.append(entry.error)
         
-        # Log at appropriate level
-        if entry.level == "debug":
-            logger.debug(message)
-        elif entry.level == "info":
-            logger.info(message)
-        elif entry.level == "warn":
-            logger.warning(message)
-        elif entry.level == "error":
-            logger.error(message)
-            if entry.error:
-                logger.error(f"  Stack: {entry.error}")
+        logger.log(level, fmt, *args)
 
 
 @router.post("/error", status_code=204)
@@ -85,8 +126,13 @@ async def receive_error(
     url: Optional[str] = None,
 ):
     """Quick endpoint for single error reporting."""
-    logger.error(f"[{source}] {message} @ {url or 'unknown'}")
     if stack:
-        for line in stack.split("\n")[:10]:  # First 10 lines
-            logger.error(f"  {line}")
+        # One record carrying the first 10 stack lines
+        logger.error(
+            "[%s] %s @ %s\n  %s",
+            source, message, url or "unknown",
+            "\n  ".join(stack.split("\n")[:10]),
+        )
+    else:
+        logger.error("[%s] %s @ %s", source, message, url or "unknown")
 
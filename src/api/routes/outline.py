@@ -5,12 +5,18 @@ CRUD operations for hierarchical research outlines.
 """
 
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Annotated, AsyncIterator, Iterator, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import CurrentUser, DatabaseDep, PgDep, ProjectId, SectionId
+from src.config import get_settings
+from src.services.cache import TTLCache
+from src.models.common import build_model
 from src.models.outline import (
     OutlineSectionCreate,
     OutlineSectionReorder,
@@ -18,51 +24,168 @@ from src.models.outline import (
     OutlineSectionUpdate,
     OutlineSectionWithChildren,
     OutlineTree,
+    SectionType,
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Encoded outline bodies: project_id -> (outline version, JSON bytes).
+# Entries are only served while the version still matches the database, and
+# this worker's outline writes drop them straight away.
+_outline_cache = TTLCache(ttl=300, maxsize=256)
 
-def _build_tree(sections: list[dict], parent_id: Optional[str] = None) -> list[OutlineSectionWithChildren]:
+# Columns of OutlineSectionResponse, selected explicitly rather than "*"
+SECTION_COLUMNS = (
+    "id, project_id, parent_id, title, section_type, questions, notes, "
+    "order_index, created_at, updated_at"
+)
+
+
+def _to_node(
+    section: dict,
+    children: list[OutlineSectionWithChildren],
+    strict: bool,
+) -> OutlineSectionWithChildren:
+    """Build a tree node from an outline_section row (see build_model)."""
+    parent_id = section["parent_id"]
+    return build_model(
+        OutlineSectionWithChildren,
+        strict,
+        id=UUID(section["id"]),
+        project_id=UUID(section["project_id"]),
+        parent_id=UUID(parent_id) if parent_id else None,
+        title=section["title"],
+        section_type=SectionType(section["section_type"]),
+        questions=section.get("questions") or [],
+        notes=section.get("notes"),
+        order_index=section["order_index"],
+        created_at=datetime.fromisoformat(section["created_at"]),
+        updated_at=datetime.fromisoformat(section["updated_at"]),
+        children=children,
+    )
+
+
+def _stitch_subtree(
+    rows: list[dict], strict: bool = False
+) -> list[OutlineSectionWithChildren]:
+    """
+    Build a tree from outline_subtree rows.
+    
+    Rows arrive in tree_path order, so every parent precedes its children
+    and siblings are already sorted; each row is attached to its parent's
+    node without any searching or re-sorting.
+    """
+    nodes: dict[str, OutlineSectionWithChildren] = {}
+    roots = []
+    
+    for row in rows:
+        node = _to_node(row, [], strict)
+        nodes[row["id"]] = node
+        parent = nodes.get(row["parent_id"]) if row["depth"] else None
+        if parent is None:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+    
+    return roots
+
+
+def _bucket_by_parent(sections: list[dict]) -> dict[Optional[str], list[dict]]:
+    """Group sections by parent_id, each group sorted by order_index."""
+    children_by_parent: dict[Optional[str], list[dict]] = {}
+    for section in sections:
+        children_by_parent.setdefault(section.get("parent_id"), []).append(section)
+    
+    for siblings in children_by_parent.values():
+        siblings.sort(key=lambda s: s["order_index"])
+    
+    return children_by_parent
+
+
+def _node_dict(section: dict, children: list[dict]) -> dict:
+    """Build a tree node as a plain dict shaped like OutlineSectionWithChildren."""
+    return {
+        "id": section["id"],
+        "project_id": section["project_id"],
+        "parent_id": section["parent_id"],
+        "title": section["title"],
+        "section_type": section["section_type"],
+        "questions": section.get("questions") or [],
+        "notes": section.get("notes"),
+        "order_index": section["order_index"],
+        "created_at": section["created_at"],
+        "updated_at": section["updated_at"],
+        "children": children,
+    }
+
+
+def _iter_outline_json(project_id: str, sections: list[dict]) -> Iterator[bytes]:
+    """
+    Encode an OutlineTree body incrementally.
+    
+    Each top-level section is built as plain dicts and written as soon as
+    its subtree is encoded, so no model objects are created and only one
+    top-level subtree is held in memory at a time.
+    """
+    children_by_parent = _bucket_by_parent(sections)
+    
+    def build(pid: str) -> list[dict]:
+        return [
+            _node_dict(section, build(section["id"]))
+            for section in children_by_parent.get(pid, [])
+        ]
+    
+    yield b'{"project_id":' + orjson.dumps(project_id) + b',"sections":['
+    for i, root in enumerate(children_by_parent.get(None, [])):
+        if i:
+            yield b","
+        yield orjson.dumps(_node_dict(root, build(root["id"])))
+    yield b'],"total_count":' + str(len(sections)).encode() + b"}"
+
+
+async def _cache_outline_body(
+    project_id: str,
+    version: str,
+    chunks: Iterator[bytes],
+) -> AsyncIterator[bytes]:
+    """Pass streamed outline chunks through and cache the full body once sent."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    _outline_cache.set(project_id, (version, b"".join(parts)))
+
+
+def _build_tree(
+    sections: list[dict],
+    parent_id: Optional[str] = None,
+    strict: bool = False,
+) -> list[OutlineSectionWithChildren]:
     """
     Build a nested tree structure from flat section list.
     
+    Sections are bucketed by parent once and each bucket is sorted once,
+    so the whole tree is assembled in a single linear pass.
+    
     Args:
         sections: Flat list of section dicts from database
-        parent_id: Parent ID to filter by (None for root level)
+        parent_id: Parent ID of the subtree to return (None for root level)
+        strict: Validate each node (the strict_validation setting)
     
     Returns:
         List of sections with nested children
     """
-    result = []
+    children_by_parent = _bucket_by_parent(sections)
     
-    for section in sections:
-        section_parent = section.get("parent_id")
-        
-        if section_parent == parent_id:
-            # This section belongs at this level
-            children = _build_tree(sections, section["id"])
-            
-            result.append(OutlineSectionWithChildren(
-                id=section["id"],
-                project_id=section["project_id"],
-                parent_id=section["parent_id"],
-                title=section["title"],
-                section_type=section["section_type"],
-                questions=section.get("questions") or [],
-                notes=section.get("notes"),
-                order_index=section["order_index"],
-                created_at=section["created_at"],
-                updated_at=section["updated_at"],
-                children=children,
-            ))
-    
-    # Sort by order_index
-    result.sort(key=lambda x: x.order_index)
+    def build(pid: Optional[str]) -> list[OutlineSectionWithChildren]:
+        return [
+            _to_node(section, build(section["id"]), strict)
+            for section in children_by_parent.get(pid, [])
+        ]
     
-    return result
+    return build(parent_id)
 
 
 @router.get(
@@ -72,34 +195,71 @@ def _build_tree(sections: list[dict], parent_id: Optional[str] = None) -> list[O
     description="Get the complete outline tree for a project.",
 )
 async def get_outline(
-    project_id: UUID,
+    project_id: ProjectId,
     user: CurrentUser,
     db: DatabaseDep,
-) -> OutlineTree:
-    """Get the complete outline tree for a project."""
+    pg: PgDep,
+    root_id: Optional[UUID] = Query(
+        None, description="Only return this section and its descendants"
+    ),
+    max_depth: Optional[int] = Query(
+        None, ge=0, description="Levels below the root(s) to include"
+    ),
+) -> OutlineTree | StreamingResponse:
+    """
+    Get the outline tree for a project.
+    
+    With root_id and/or max_depth, the traversal runs in the database and
+    only the requested part of the tree is fetched.
+    
+    The full tree is streamed as JSON one top-level section at a time
+    (OutlineTree documents its shape) and the encoded body is cached until
+    the outline changes; with strict_validation it is built and validated
+    as models instead.
+    """
+    if root_id is not None or max_depth is not None:
+        return _get_outline_subtree(project_id, db, root_id, max_depth)
+    
+    strict = get_settings().strict_validation
+    
     try:
-        # Verify project exists
-        project_result = db.table("project")\
-            .select("id")\
-            .eq("id", str(project_id))\
-            .maybe_single()\
-            .execute()
+        cached = None if strict else _outline_cache.get(project_id)
+        known_version = cached[0] if cached is not None else None
         
-        if not project_result.data:
+        # Project check, outline version and (unless the cached body is
+        # still current) sections in one round trip
+        if pg is not None:
+            outline = await pg.fetchval(
+                "SELECT get_project_outline($1::uuid, $2::text)",
+                project_id,
+                known_version,
+            )
+        else:
+            outline = db.rpc(
+                "get_project_outline",
+                {"p_id": project_id, "p_known_version": known_version},
+            ).execute().data
+        
+        if not outline or not outline["project_exists"]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found",
             )
         
-        # Get all sections for the project
-        result = db.table("outline_section")\
-            .select("*")\
-            .eq("project_id", str(project_id))\
-            .order("order_index")\
-            .execute()
+        sections = outline["sections"]
+        if sections is None:
+            # Sections are only left out when our cached version matched
+            return Response(content=cached[1], media_type="application/json")
         
-        sections = result.data or []
-        tree = _build_tree(sections)
+        if not strict:
+            chunks = _cache_outline_body(
+                project_id,
+                outline["version"],
+                _iter_outline_json(project_id, sections),
+            )
+            return StreamingResponse(chunks, media_type="application/json")
+        
+        tree = _build_tree(sections, strict=strict)
         
         return OutlineTree(
             project_id=project_id,
@@ -117,6 +277,59 @@ async def get_outline(
         )
 
 
+def _get_outline_subtree(
+    project_id: str,
+    db: DatabaseDep,
+    root_id: Optional[UUID],
+    max_depth: Optional[int],
+) -> OutlineTree:
+    """Fetch part of the outline via the outline_subtree function."""
+    try:
+        result = db.rpc(
+            "outline_subtree",
+            {
+                "p_id": project_id,
+                "root": str(root_id) if root_id else None,
+                "max_depth": max_depth,
+            },
+        ).execute()
+        rows = result.data or []
+        
+        # An empty subtree is only an error if its root doesn't exist
+        if not rows:
+            if root_id is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Section not found",
+                )
+            project_result = db.table("project")\
+                .select("id", count="exact", head=True)\
+                .eq("id", project_id)\
+                .execute()
+            if not project_result.count:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Project not found",
+                )
+        
+        return OutlineTree(
+            project_id=project_id,
+            sections=_stitch_subtree(
+                rows, strict=get_settings().strict_validation
+            ),
+            total_count=len(rows),
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error getting outline subtree for project {project_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+
+
 @router.post(
     "",
     response_model=OutlineSectionResponse,
@@ -125,69 +338,36 @@ async def get_outline(
     description="Add a new section to the project outline.",
 )
 async def create_section(
-    project_id: UUID,
+    project_id: ProjectId,
     section: OutlineSectionCreate,
     user: CurrentUser,
     db: DatabaseDep,
 ) -> OutlineSectionResponse:
     """Create a new outline section."""
     try:
-        # Verify project exists
-        project_result = db.table("project")\
-            .select("id")\
-            .eq("id", str(project_id))\
-            .maybe_single()\
-            .execute()
+        # Validates the project, picks the next order_index if none was
+        # given, and inserts, all in one round trip
+        result = db.rpc(
+            "create_outline_section",
+            {
+                "p_id": project_id,
+                "p_title": section.title,
+                "p_section_type": section.section_type.value,
+                "p_parent_id": str(section.parent_id) if section.parent_id else None,
+                "p_questions": section.questions,
+                "p_notes": section.notes,
+                "p_order_index": section.order_index,
+            },
+        ).execute()
         
-        if not project_result.data:
+        if not result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found",
             )
         
-        # If order_index not provided, append to end
-        order_index = section.order_index
-        if order_index is None:
-            # Get max order_index for siblings
-            siblings_query = db.table("outline_section")\
-                .select("order_index")\
-                .eq("project_id", str(project_id))
-            
-            if section.parent_id:
-                siblings_query = siblings_query.eq("parent_id", str(section.parent_id))
-            else:
-                siblings_query = siblings_query.is_("parent_id", "null")
-            
-            siblings_result = siblings_query.execute()
-            
-            if siblings_result.data:
-                max_index = max(s["order_index"] for s in siblings_result.data)
-                order_index = max_index + 1
-            else:
-                order_index = 0
-        
-        # Create the section
-        insert_data = {
-            "project_id": str(project_id),
-            "title": section.title,
-            "section_type": section.section_type.value,
-            "questions": section.questions,
-            "notes": section.notes,
-            "order_index": order_index,
-        }
-        
-        if section.parent_id:
-            insert_data["parent_id"] = str(section.parent_id)
-        
-        result = db.table("outline_section").insert(insert_data).execute()
-        
-        if not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create section",
-            )
-        
-        created = result.data[0]
+        created = result.data
+        _outline_cache.pop(project_id)
         logger.info(f"Created outline section {created['id']} for project {project_id}")
         
         return OutlineSectionResponse(**created)
@@ -209,27 +389,36 @@ async def create_section(
     description="Get details of a specific outline section.",
 )
 async def get_section(
-    project_id: UUID,
-    section_id: UUID,
+    project_id: ProjectId,
+    section_id: SectionId,
     user: CurrentUser,
     db: DatabaseDep,
+    pg: PgDep,
 ) -> OutlineSectionResponse:
     """Get a specific outline section."""
     try:
-        result = db.table("outline_section")\
-            .select("*")\
-            .eq("id", str(section_id))\
-            .eq("project_id", str(project_id))\
-            .maybe_single()\
-            .execute()
+        if pg is not None:
+            section = await pg.fetchval(
+                "SELECT to_jsonb(s) FROM outline_section s "
+                "WHERE s.id = $1::uuid AND s.project_id = $2::uuid",
+                section_id,
+                project_id,
+            )
+        else:
+            result = db.table("outline_section")\
+                .select(SECTION_COLUMNS)\
+                .eq("id", section_id)\
+                .eq("project_id", project_id)\
+                .execute()
+            section = result.data[0] if result.data else None
         
-        if not result.data:
+        if not section:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Section not found",
             )
         
-        return OutlineSectionResponse(**result.data)
+        return OutlineSectionResponse(**section)
         
     except HTTPException:
         raise
@@ -248,8 +437,8 @@ async def get_section(
     description="Update an outline section's details.",
 )
 async def update_section(
-    project_id: UUID,
-    section_id: UUID,
+    project_id: ProjectId,
+    section_id: SectionId,
     section_update: OutlineSectionUpdate,
     user: CurrentUser,
     db: DatabaseDep,
@@ -271,11 +460,11 @@ async def update_section(
         update_data["parent_id"] = str(update_data["parent_id"])
     
     try:
-        result = db.table("outline_section")\
-            .update(update_data)\
-            .eq("id", str(section_id))\
-            .eq("project_id", str(project_id))\
-            .execute()
+        # Writes (and bumps updated_at) only if a field actually changes
+        result = db.rpc(
+            "update_outline_section_if_changed",
+            {"p_id": project_id, "p_section_id": section_id, "p_changes": update_data},
+        ).execute()
         
         if not result.data:
             raise HTTPException(
@@ -283,8 +472,10 @@ async def update_section(
                 detail="Section not found",
             )
         
-        logger.info(f"Updated outline section {section_id}")
-        return OutlineSectionResponse(**result.data[0])
+        if result.data["changed"]:
+            _outline_cache.pop(project_id)
+            logger.info(f"Updated outline section {section_id}")
+        return OutlineSectionResponse(**result.data["row"])
         
     except HTTPException:
         raise
@@ -303,8 +494,8 @@ async def update_section(
     description="Delete an outline section and its children.",
 )
 async def delete_section(
-    project_id: UUID,
-    section_id: UUID,
+    project_id: ProjectId,
+    section_id: SectionId,
     user: CurrentUser,
     db: DatabaseDep,
 ) -> None:
@@ -312,8 +503,8 @@ async def delete_section(
     try:
         result = db.table("outline_section")\
             .delete()\
-            .eq("id", str(section_id))\
-            .eq("project_id", str(project_id))\
+            .eq("id", section_id)\
+            .eq("project_id", project_id)\
             .execute()
         
         if not result.data:
@@ -322,6 +513,7 @@ async def delete_section(
                 detail="Section not found",
             )
         
+        _outline_cache.pop(project_id)
         logger.info(f"Deleted outline section {section_id}")
         
     except HTTPException:
@@ -341,37 +533,44 @@ async def delete_section(
     description="Move sections within the outline tree.",
 )
 async def reorder_sections(
-    project_id: UUID,
+    project_id: ProjectId,
     reorder: OutlineSectionReorder,
     user: CurrentUser,
     db: DatabaseDep,
 ) -> OutlineTree:
     """Reorder/reparent an outline section."""
     try:
-        update_data = {"order_index": reorder.new_order_index}
+        # Move the section and read back the whole outline in one call;
+        # a null parent moves it to root level
+        result = db.rpc(
+            "reorder_and_return_tree",
+            {
+                "p_id": project_id,
+                "p_section_id": str(reorder.section_id),
+                "p_new_parent_id": (
+                    str(reorder.new_parent_id) if reorder.new_parent_id else None
+                ),
+                "p_new_order_index": reorder.new_order_index,
+            },
+        ).execute()
         
-        if reorder.new_parent_id:
-            update_data["parent_id"] = str(reorder.new_parent_id)
-        else:
-            # Moving to root level - need to set parent_id to null
-            update_data["parent_id"] = None
-        
-        result = db.table("outline_section")\
-            .update(update_data)\
-            .eq("id", str(reorder.section_id))\
-            .eq("project_id", str(project_id))\
-            .execute()
-        
-        if not result.data:
+        if result.data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Section not found",
             )
         
+        _outline_cache.pop(project_id)
         logger.info(f"Reordered section {reorder.section_id} to index {reorder.new_order_index}")
         
-        # Return updated tree
-        return await get_outline(project_id, user, db)
+        sections = result.data
+        return OutlineTree(
+            project_id=project_id,
+            sections=_build_tree(
+                sections, strict=get_settings().strict_validation
+            ),
+            total_count=len(sections),
+        )
         
     except HTTPException:
         raise
@@ -382,3 +581,53 @@ async def reorder_sections(
             detail=f"Database error: {str(e)}",
         )
 
+
+@router.post(
+    "/reorder/bulk",
+    response_model=OutlineTree,
+    summary="Reorder many outline sections",
+    description="Apply several section moves at once, e.g. renumbering siblings after a drag.",
+)
+async def reorder_sections_bulk(
+    project_id: ProjectId,
+    moves: Annotated[list[OutlineSectionReorder], Body(min_length=1, max_length=500)],
+    user: CurrentUser,
+    db: DatabaseDep,
+) -> OutlineTree:
+    """Reorder/reparent several outline sections in one transaction."""
+    try:
+        result = db.rpc(
+            "reorder_sections_bulk",
+            {
+                "p_id": project_id,
+                "p_moves": [move.model_dump(mode="json") for move in moves],
+            },
+        ).execute()
+        
+        if result.data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Section not found",
+            )
+        
+        _outline_cache.pop(project_id)
+        logger.info(f"Reordered {len(moves)} sections in project {project_id}")
+        
+        sections = result.data
+        return OutlineTree(
+            project_id=project_id,
+            sections=_build_tree(
+                sections, strict=get_settings().strict_validation
+            ),
+            total_count=len(sections),
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error reordering sections in project {project_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}",
+        )
+
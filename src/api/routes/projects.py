@@ -6,11 +6,17 @@ CRUD operations for research projects.
 
 import logging
 from typing import Optional
-from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import (
+    CurrentUser,
+    DatabaseDep,
+    PgDep,
+    ProjectId,
+    SettingsDep,
+    forget_project,
+)
 from src.models.project import (
     ProjectCreate,
     ProjectListItem,
@@ -23,6 +29,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Columns of ProjectResponse, selected explicitly rather than "*"
+PROJECT_COLUMNS = "id, title, description, status, created_at, updated_at"
+
+# Project list page for the direct Postgres path; same rows as project_list_v
+# through PostgREST, aggregated into one JSON array.
+_LIST_PROJECTS_SQL = """
+SELECT COALESCE(jsonb_agg(p ORDER BY p.updated_at DESC), '[]'::jsonb)
+FROM (
+    SELECT id, title, status, created_at, updated_at,
+           source_count, outline_section_count
+    FROM project_list_v
+    WHERE $1::text IS NULL OR status::text = $1::text
+    ORDER BY updated_at DESC
+    LIMIT $2 OFFSET $3
+) p
+"""
+
 
 @router.post(
     "",
@@ -74,6 +97,8 @@ async def create_project(
 async def list_projects(
     user: CurrentUser,
     db: DatabaseDep,
+    pg: PgDep,
+    settings: SettingsDep,
     status_filter: Optional[ProjectStatus] = Query(
         None, 
         alias="status",
@@ -83,35 +108,44 @@ async def list_projects(
     offset: int = Query(0, ge=0),
 ) -> list[ProjectListItem]:
     """List user's projects with optional filtering."""
-    from src.config import get_settings
-    settings = get_settings()
-    
     try:
-        query = db.table("project").select("*")
-        
-        # Apply status filter if provided
-        if status_filter:
-            query = query.eq("status", status_filter.value)
-        
-        # Order by updated_at descending (most recent first)
-        query = query.order("updated_at", desc=True)
-        
-        # Pagination
-        query = query.range(offset, offset + limit - 1)
-        
-        result = query.execute()
+        if pg is not None:
+            rows = await pg.fetchval(
+                _LIST_PROJECTS_SQL,
+                status_filter.value if status_filter else None,
+                limit,
+                offset,
+            )
+        else:
+            # The view adds source/outline counts to each row in the same query
+            query = db.table("project_list_v").select(
+                "id, title, status, created_at, updated_at, "
+                "source_count, outline_section_count"
+            )
+            
+            # Apply status filter if provided
+            if status_filter:
+                query = query.eq("status", status_filter.value)
+            
+            # Order by updated_at descending (most recent first)
+            query = query.order("updated_at", desc=True)
+            
+            # Pagination
+            query = query.range(offset, offset + limit - 1)
+            
+            rows = query.execute().data
         
         # Convert to response models
         projects = []
-        for row in result.data:
+        for row in rows:
             projects.append(ProjectListItem(
                 id=row["id"],
                 title=row["title"],
                 status=row["status"],
                 created_at=row["created_at"],
                 updated_at=row["updated_at"],
-                source_count=0,  # TODO: Add aggregate query
-                outline_section_count=0,  # TODO: Add aggregate query
+                source_count=row["source_count"],
+                outline_section_count=row["outline_section_count"],
             ))
         
         return projects
@@ -138,24 +172,32 @@ async def list_projects(
     description="Get details of a specific project.",
 )
 async def get_project(
-    project_id: UUID,
+    project_id: ProjectId,
     user: CurrentUser,
     db: DatabaseDep,
+    pg: PgDep,
 ) -> ProjectResponse:
     """Get project details."""
     try:
-        result = db.table("project")\
-            .select("*")\
-            .eq("id", str(project_id))\
-            .execute()
+        if pg is not None:
+            project = await pg.fetchval(
+                "SELECT to_jsonb(p) FROM project p WHERE p.id = $1::uuid",
+                project_id,
+            )
+        else:
+            result = db.table("project")\
+                .select(PROJECT_COLUMNS)\
+                .eq("id", project_id)\
+                .execute()
+            project = result.data[0] if result.data else None
         
-        if not result.data or len(result.data) == 0:
+        if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found",
             )
         
-        return ProjectResponse(**result.data[0])
+        return ProjectResponse(**project)
         
     except HTTPException:
         raise
@@ -174,7 +216,7 @@ async def get_project(
     description="Update project details.",
 )
 async def update_project(
-    project_id: UUID,
+    project_id: ProjectId,
     project_update: ProjectUpdate,
     user: CurrentUser,
     db: DatabaseDep,
@@ -194,10 +236,11 @@ async def update_project(
         update_data["status"] = update_data["status"].value
     
     try:
-        result = db.table("project")\
-            .update(update_data)\
-            .eq("id", str(project_id))\
-            .execute()
+        # Writes (and bumps updated_at) only if a field actually changes
+        result = db.rpc(
+            "update_project_if_changed",
+            {"p_id": project_id, "p_changes": update_data},
+        ).execute()
         
         if not result.data:
             raise HTTPException(
@@ -205,8 +248,9 @@ async def update_project(
                 detail="Project not found",
             )
         
-        logger.info(f"Updated project {project_id}")
-        return ProjectResponse(**result.data[0])
+        if result.data["changed"]:
+            logger.info(f"Updated project {project_id}")
+        return ProjectResponse(**result.data["row"])
         
     except HTTPException:
         raise
@@ -225,7 +269,7 @@ async def update_project(
     description="Soft-delete a project by setting status to archived.",
 )
 async def delete_project(
-    project_id: UUID,
+    project_id: ProjectId,
     user: CurrentUser,
     db: DatabaseDep,
     hard_delete: bool = Query(False, description="Permanently delete instead of archiving"),
@@ -236,15 +280,16 @@ async def delete_project(
             # Permanent deletion (cascades to related records)
             result = db.table("project")\
                 .delete()\
-                .eq("id", str(project_id))\
+                .eq("id", project_id)\
                 .execute()
+            forget_project(project_id)
             
             logger.info(f"Hard deleted project {project_id}")
         else:
             # Soft delete by archiving
             result = db.table("project")\
                 .update({"status": ProjectStatus.ARCHIVED.value})\
-                .eq("id", str(project_id))\
+                .eq("id", project_id)\
                 .execute()
             
             logger.info(f"Archived project {project_id}")
@@ -4,20 +4,30 @@ Report/Paper Generation API routes.
 Endpoints for generating academic papers from outline and sources.
 """
 
+import asyncio
+import functools
 import logging
+import re
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Callable, Iterator, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, status
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.api.deps import DatabaseDep, CurrentUser
+from src.api.deps import CurrentUser, DatabaseDep, PgDep, ProjectId, SectionId, SettingsDep
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_WORD = re.compile(r"\S+")
+
+# Characters per chunk when streaming a saved report
+REPORT_STREAM_CHUNK_CHARS = 64 * 1024
+
 
 # =============================================================================
 # Request/Response Models
@@ -89,60 +99,111 @@ class GenerateSectionResponse(BaseModel):
 # Helper Functions
 # =============================================================================
 
-async def get_project_sources(db: DatabaseDep, project_id: UUID) -> list[dict]:
+def _prepare_sources(sources: list[dict]) -> list[dict]:
+    """
+    Precompute per-source citation data shared by every section.
+    
+    Each source gets ``_author_names`` (plain author names),
+    ``_in_text_citation`` (its APA in-text citation) and ``_bib_sort_key``
+    (first author surname or title, year, title), so section drafts and the
+    bibliography don't re-derive them.
+    """
+    for source in sources:
+        names = [
+            a.get("name", "Unknown") if isinstance(a, dict) else str(a)
+            for a in source.get("authors") or []
+        ]
+        source["_author_names"] = names
+        source["_in_text_citation"] = format_citation_apa(
+            names, source.get("publication_year"), source["title"]
+        )
+        title_key = (source.get("title") or "").casefold()
+        source["_bib_sort_key"] = (
+            # Works without authors are alphabetized by title
+            _surname(names[0]).casefold() if names else title_key,
+            source.get("publication_year") or 0,
+            title_key,
+        )
+    return sources
+
+
+def _surname(name: str) -> str:
+    """Best-effort family name from "Last, First" or "First Last"."""
+    if "," in name:
+        return name.split(",", 1)[0].strip()
+    parts = name.split()
+    return parts[-1] if parts else ""
+
+
+async def get_project_sources(db: DatabaseDep, project_id: str) -> list[dict]:
     """Get all ingested sources for a project."""
     result = db.table("source")\
         .select("id, title, authors, publication_year, doi, arxiv_id, abstract")\
-        .eq("project_id", str(project_id))\
+        .eq("project_id", project_id)\
         .eq("ingestion_status", "ready")\
         .execute()
-    return result.data or []
+    return _prepare_sources(result.data or [])
 
 
-async def get_project_outline(db: DatabaseDep, project_id: UUID) -> list[dict]:
-    """Get outline sections for a project."""
-    result = db.table("outline_section")\
-        .select("*")\
-        .eq("project_id", str(project_id))\
-        .order("order_index")\
-        .execute()
-    return result.data or []
+async def get_report_bundle(
+    db: DatabaseDep, project_id: str, pg: PgDep = None
+) -> tuple[list[dict], list[dict]]:
+    """
+    Get outline sections and ingested sources for a project in one call.
 
+    Uses the direct Postgres connection when one is available.
 
-def format_citation_apa(authors: list, year: Optional[int], title: str) -> str:
-    """Format a citation in APA style."""
-    if not authors:
-        author_str = "Unknown"
-    elif len(authors) == 1:
-        author_str = authors[0].get("name", "Unknown") if isinstance(authors[0], dict) else authors[0]
-    elif len(authors) == 2:
-        names = [a.get("name", "Unknown") if isinstance(a, dict) else a for a in authors]
-        author_str = f"{names[0]} & {names[1]}"
+    Returns:
+        Tuple of (sections ordered by order_index, sources).
+    """
+    if pg is not None:
+        bundle = await pg.fetchval("SELECT get_report_bundle($1::uuid)", project_id)
     else:
-        first_author = authors[0].get("name", "Unknown") if isinstance(authors[0], dict) else authors[0]
-        author_str = f"{first_author} et al."
-    
-    year_str = str(year) if year else "n.d."
-    return f"{author_str} ({year_str})"
+        bundle = db.rpc("get_report_bundle", {"p_id": project_id}).execute().data
+    bundle = bundle or {}
+    return bundle.get("sections") or [], _prepare_sources(bundle.get("sources") or [])
+
+
+# In-text APA citation formatters keyed by author count (3 means "3 or more")
+APA_CITATION_FORMATTERS: dict[int, Callable[[list[str], int | str], str]] = {
+    0: lambda a, y: f"Unknown ({y})",
+    1: lambda a, y: f"{a[0]} ({y})",
+    2: lambda a, y: f"{a[0]} & {a[1]} ({y})",
+    3: lambda a, y: f"{a[0]} et al. ({y})",
+}
+
+
+def format_citation_apa(authors: list[str], year: Optional[int], title: str) -> str:
+    """Format a citation in APA style from normalized author names."""
+    formatter = APA_CITATION_FORMATTERS[min(len(authors), 3)]
+    return formatter(authors, year or "n.d.")
 
 
 def format_bibliography_entry_apa(source: dict) -> str:
     """Format a bibliography entry in APA style."""
-    authors = source.get("authors", [])
-    year = source.get("publication_year")
-    title = source.get("title", "Untitled")
+    return _apa_bibliography_entry(
+        tuple(source["_author_names"]),
+        source.get("publication_year"),
+        source.get("title", "Untitled"),
+        source.get("doi"),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _apa_bibliography_entry(
+    authors: tuple[str, ...], year: Optional[int], title: str, doi: Optional[str]
+) -> str:
+    """
+    Build an APA bibliography entry from the fields it depends on.
     
+    Cached on those fields, so regenerating a report reuses the entries of
+    unchanged sources and an edited source simply misses the cache.
+    """
     # Format author names
     if not authors:
         author_str = "Unknown."
     else:
-        author_names = []
-        for a in authors[:7]:  # APA limits to 7 authors
-            if isinstance(a, dict):
-                name = a.get("name", "Unknown")
-            else:
-                name = str(a)
-            author_names.append(name)
+        author_names = authors[:7]  # APA limits to 7 authors
         
         if len(authors) > 7:
             author_str = ", ".join(author_names[:6]) + ", ... " + author_names[-1] + "."
@@ -152,7 +213,6 @@ def format_bibliography_entry_apa(source: dict) -> str:
     year_str = f"({year})." if year else "(n.d.)."
     
     # Build entry
-    doi = source.get("doi")
     doi_str = f" https://doi.org/{doi}" if doi else ""
     
     return f"{author_str} {year_str} {title}.{doi_str}"
@@ -160,7 +220,7 @@ def format_bibliography_entry_apa(source: dict) -> str:
 
 async def generate_section_content(
     db: DatabaseDep,
-    project_id: UUID,
+    project_id: str,
     section: dict,
     sources: list[dict],
     max_words: int = 500,
@@ -175,97 +235,107 @@ async def generate_section_content(
     
     citations = []
     content_parts = []
+    # Length of " ".join(content_parts), kept up to date as parts are added
+    cursor = 0
+
+    def add(part: str) -> None:
+        nonlocal cursor
+        cursor += len(part) + (1 if content_parts else 0)
+        content_parts.append(part)
     
     if section_type == "introduction":
-        content_parts.append(
+        add(
             f"This paper presents a comprehensive analysis of the topic. "
             f"The following sections outline our research methodology and key findings."
         )
         
     elif section_type == "literature_review":
-        content_parts.append(
+        add(
             f"Previous research has explored various aspects of this domain. "
         )
         
         # Reference sources
         for i, source in enumerate(sources[:5]):
             citation = Citation(
-                source_id=UUID(source["id"]),
+                source_id=source["id"],
                 source_title=source["title"],
-                authors=[a.get("name", "") if isinstance(a, dict) else a for a in source.get("authors", [])[:3]],
+                authors=source["_author_names"][:3],
                 year=source.get("publication_year"),
-                position=len(" ".join(content_parts)),
+                position=cursor,
             )
             citations.append(citation)
             
-            cite_str = format_citation_apa(source.get("authors", []), source.get("publication_year"), source["title"])
+            cite_str = source["_in_text_citation"]
             
             if source.get("abstract"):
                 summary = source["abstract"][:200] + "..." if len(source.get("abstract", "")) > 200 else source.get("abstract", "")
-                content_parts.append(
+                add(
                     f"{cite_str} investigated this topic, finding that {summary.lower()} "
                 )
             else:
-                content_parts.append(
+                add(
                     f"{cite_str} contributed to our understanding of this field. "
                 )
         
     elif section_type == "methods":
-        content_parts.append(
+        add(
             f"Our methodology involved a systematic review of the literature. "
             f"We collected and analyzed papers from major academic databases."
         )
         
     elif section_type == "results":
-        content_parts.append(
+        add(
             f"The analysis revealed several key findings. "
         )
         
         for source in sources[:3]:
             citation = Citation(
-                source_id=UUID(source["id"]),
+                source_id=source["id"],
                 source_title=source["title"],
-                authors=[a.get("name", "") if isinstance(a, dict) else a for a in source.get("authors", [])[:3]],
+                authors=source["_author_names"][:3],
                 year=source.get("publication_year"),
-                position=len(" ".join(content_parts)),
+                position=cursor,
             )
             citations.append(citation)
             
-            cite_str = format_citation_apa(source.get("authors", []), source.get("publication_year"), source["title"])
-            content_parts.append(f"According to {cite_str}, significant progress has been made. ")
+            cite_str = source["_in_text_citation"]
+            add(f"According to {cite_str}, significant progress has been made. ")
         
     elif section_type == "discussion":
-        content_parts.append(
+        add(
             f"These findings have important implications for the field. "
             f"Future research should explore these topics in greater depth."
         )
         
     elif section_type == "conclusion":
-        content_parts.append(
+        add(
             f"In conclusion, this paper has examined the key aspects of the topic. "
             f"The evidence suggests that continued research is warranted."
         )
         
     else:
         # Custom section
-        content_parts.append(f"This section covers {section_title.lower()}. ")
+        add(f"This section covers {section_title.lower()}. ")
         
         for source in sources[:2]:
             citation = Citation(
-                source_id=UUID(source["id"]),
+                source_id=source["id"],
                 source_title=source["title"],
-                authors=[a.get("name", "") if isinstance(a, dict) else a for a in source.get("authors", [])[:3]],
+                authors=source["_author_names"][:3],
                 year=source.get("publication_year"),
-                position=len(" ".join(content_parts)),
+                position=cursor,
             )
             citations.append(citation)
     
     content = " ".join(content_parts)
     
-    # Truncate to max_words
-    words = content.split()
-    if len(words) > max_words:
-        content = " ".join(words[:max_words]) + "..."
+    # Truncate to max_words, scanning at most max_words + 1 words
+    words = _WORD.finditer(content)
+    last = None
+    for last in islice(words, max_words):
+        pass
+    if last is not None and next(words, None) is not None:
+        content = content[:last.end()] + "..."
     
     return content, citations
 
@@ -283,68 +353,76 @@ async def generate_section_content(
 async def generate_report(
     user: CurrentUser,
     db: DatabaseDep,
-    project_id: UUID = Path(..., description="Project ID"),
+    pg: PgDep,
+    settings: SettingsDep,
+    project_id: ProjectId,
     request: GenerateReportRequest = GenerateReportRequest(),
 ) -> GenerateReportResponse:
     """Generate a paper from the outline and sources."""
     logger.info(f"Generating report for project {project_id}")
     
-    # Get outline sections
-    outline = await get_project_outline(db, project_id)
+    # Get outline sections and ingested sources
+    outline, sources = await get_report_bundle(db, project_id, pg)
     if not outline:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No outline found. Please create an outline first.",
         )
     
-    # Get ingested sources
-    sources = await get_project_sources(db, project_id)
     if not sources:
         logger.warning(f"No ingested sources for project {project_id}")
     
-    # Generate each section
+    # Generate sections concurrently; gather keeps outline order
+    semaphore = asyncio.Semaphore(settings.report_section_concurrency)
+
+    async def draft(section: dict) -> tuple[str, list[Citation]]:
+        async with semaphore:
+            return await generate_section_content(db, project_id, section, sources)
+
+    drafts = await asyncio.gather(*(draft(section) for section in outline))
+
     all_sections = []
     all_content_parts = []
     all_citations = []
+    # Report word count, summed per part rather than re-split at the end
+    word_count = 0
     
-    for section in outline:
-        content, citations = await generate_section_content(
-            db, project_id, section, sources
-        )
-        
+    for section, (content, citations) in zip(outline, drafts):
+        section_words = len(content.split())
         section_draft = SectionDraft(
-            section_id=UUID(section["id"]),
+            section_id=section["id"],
             title=section["title"],
             content=content,
             citations=citations,
-            word_count=len(content.split()),
+            word_count=section_words,
         )
         all_sections.append(section_draft)
+        # "##", the heading and the section body
+        word_count += 1 + len(section["title"].split()) + section_words
         
         # Add to full content
         all_content_parts.append(f"## {section['title']}\n\n{content}\n")
         all_citations.extend(citations)
     
-    # Build full content
-    full_content = "\n".join(all_content_parts)
-    
     # Generate bibliography
     bibliography = None
     if request.include_bibliography and sources:
-        bib_entries = []
-        for source in sources:
-            entry = format_bibliography_entry_apa(source)
-            bib_entries.append(entry)
+        # APA order: first author surname, then year, then title
+        ordered = sorted(sources, key=lambda s: s["_bib_sort_key"])
+        bib_entries = [format_bibliography_entry_apa(source) for source in ordered]
         
-        bibliography = "## References\n\n" + "\n\n".join(sorted(bib_entries))
-        full_content += "\n\n" + bibliography
+        bibliography = "## References\n\n" + "\n\n".join(bib_entries)
+        # Joined below with one more "\n", i.e. a blank line after the sections
+        all_content_parts.append("\n" + bibliography)
+        word_count += len(bibliography.split())
     
-    word_count = len(full_content.split())
+    # Build full content in a single join
+    full_content = "\n".join(all_content_parts)
     
     # Save report to database
     try:
         db.table("report").upsert({
-            "project_id": str(project_id),
+            "project_id": project_id,
             "content": full_content,
             "bibliography": bibliography,
             "citation_style": request.citation_style,
@@ -373,12 +451,16 @@ async def generate_report(
 async def get_report(
     user: CurrentUser,
     db: DatabaseDep,
-    project_id: UUID = Path(..., description="Project ID"),
+    project_id: ProjectId,
 ) -> ReportResponse:
     """Get the generated report for a project."""
+    # Latest row via idx_report_project_created (project_id, created_at DESC)
     result = db.table("report")\
-        .select("*")\
-        .eq("project_id", str(project_id))\
+        .select(
+            "id, project_id, content, bibliography, citation_style, "
+            "word_count, created_at, updated_at"
+        )\
+        .eq("project_id", project_id)\
         .order("created_at", desc=True)\
         .limit(1)\
         .execute()
@@ -392,8 +474,8 @@ async def get_report(
     report = result.data[0]
     
     return ReportResponse(
-        id=UUID(report["id"]),
-        project_id=UUID(report["project_id"]),
+        id=report["id"],
+        project_id=report["project_id"],
         content=report["content"],
         bibliography=report.get("bibliography"),
         citation_style=report.get("citation_style", "apa"),
@@ -403,6 +485,47 @@ async def get_report(
     )
 
 
+@router.get(
+    "/stream",
+    summary="Stream generated report",
+    description="Stream the most recent report's Markdown content in chunks.",
+    response_class=StreamingResponse,
+)
+async def stream_report(
+    user: CurrentUser,
+    db: DatabaseDep,
+    project_id: ProjectId,
+) -> StreamingResponse:
+    """
+    Stream the generated report as Markdown.
+    
+    Only the content column is fetched, and it is sent in slices as-is
+    instead of being JSON-encoded into one response buffer, which suits
+    long reports.
+    """
+    # Latest row via idx_report_project_created (project_id, created_at DESC)
+    result = db.table("report")\
+        .select("content")\
+        .eq("project_id", project_id)\
+        .order("created_at", desc=True)\
+        .limit(1)\
+        .execute()
+    
+    if not result.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No report found. Generate a report first.",
+        )
+    
+    content = result.data[0]["content"]
+    
+    def chunks() -> Iterator[bytes]:
+        for start in range(0, len(content), REPORT_STREAM_CHUNK_CHARS):
+            yield content[start:start + REPORT_STREAM_CHUNK_CHARS].encode()
+    
+    return StreamingResponse(chunks(), media_type="text/markdown; charset=utf-8")
+
+
 @router.post(
     "/sections/{section_id}/write",
     response_model=GenerateSectionResponse,
@@ -412,16 +535,16 @@ async def get_report(
 async def generate_section_draft(
     user: CurrentUser,
     db: DatabaseDep,
-    project_id: UUID = Path(..., description="Project ID"),
-    section_id: UUID = Path(..., description="Section ID"),
+    project_id: ProjectId,
+    section_id: SectionId,
     request: GenerateSectionRequest = GenerateSectionRequest(),
 ) -> GenerateSectionResponse:
     """Generate a draft for a specific section."""
     # Get section
     result = db.table("outline_section")\
-        .select("*")\
-        .eq("id", str(section_id))\
-        .eq("project_id", str(project_id))\
+        .select("id, title, section_type")\
+        .eq("id", section_id)\
+        .eq("project_id", project_id)\
         .execute()
     
     if not result.data:
@@ -4,13 +4,25 @@ Research API routes.
 RAG queries, synthesis, and comparison endpoints.
 """
 
+import asyncio
 import logging
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import (
+    AsyncDatabaseDep,
+    CurrentUser,
+    DatabaseDep,
+    PgDep,
+    ProjectId,
+    SynthesisId,
+    project_exists,
+)
+from src.config import get_settings
+from src.models.common import build_model
 from src.models.research import (
     QueryRequest,
     QueryResponse,
@@ -25,6 +37,101 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Synthesis list page for the direct Postgres path; same rows as the
+# PostgREST query on synthesis_list_v, aggregated into one JSON array.
+_LIST_SYNTHESES_SQL = """
+SELECT COALESCE(jsonb_agg(s ORDER BY s.created_at DESC), '[]'::jsonb)
+FROM (
+    SELECT id, query, answer_preview, source_count, is_pinned, created_at
+    FROM synthesis_list_v
+    WHERE project_id = $1::uuid
+      AND (NOT $2::boolean OR is_pinned)
+      AND ($3::uuid IS NULL OR outline_section_id = $3::uuid)
+    ORDER BY created_at DESC
+    LIMIT $4 OFFSET $5
+) s
+"""
+
+
+def _to_source_reference(source: dict, strict: bool) -> SourceReference:
+    """
+    Build a SourceReference from an entry of a synthesis row's sources.
+    
+    Entries were dumped from validated SourceReference models on save
+    (see build_model).
+    """
+    chunk_id = source.get("chunk_id")
+    return build_model(
+        SourceReference,
+        strict,
+        source_id=UUID(source["source_id"]),
+        chunk_id=UUID(chunk_id) if chunk_id else None,
+        title=source["title"],
+        authors=source.get("authors") or [],
+        publication_year=source.get("publication_year"),
+        doi=source.get("doi"),
+        section_title=source.get("section_title"),
+        page_number=source.get("page_number"),
+        retrieved_text=source.get("retrieved_text") or "",
+        relevance_score=source.get("relevance_score"),
+        in_text_citation=source.get("in_text_citation"),
+        full_citation=source.get("full_citation"),
+    )
+
+
+def _to_synthesis_list_item(row: dict, strict: bool) -> SynthesisListItem:
+    """
+    Build a SynthesisListItem from a synthesis_list_v row.
+    
+    The view already trims the preview and counts sources (see build_model).
+    """
+    return build_model(
+        SynthesisListItem,
+        strict,
+        id=UUID(row["id"]),
+        query=row["query"],
+        answer_preview=row["answer_preview"],
+        source_count=row["source_count"],
+        is_pinned=row["is_pinned"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+    )
+
+
+def _to_synthesis_response(
+    row: dict,
+    sources: Optional[list[SourceReference]] = None,
+    strict: bool = False,
+) -> SynthesisResponse:
+    """
+    Build a SynthesisResponse from a synthesis row.
+    
+    Pass ``sources`` when the models are already in hand (e.g. the ones just
+    saved) to skip rebuilding them from the row; ``strict`` applies to the
+    ones rebuilt here.
+    """
+    if sources is None:
+        sources = [
+            _to_source_reference(s, strict) for s in row.get("sources") or []
+        ]
+    return SynthesisResponse(
+        id=row["id"],
+        project_id=row["project_id"],
+        query=row["query"],
+        answer=row["answer"],
+        sources=sources,
+        outline_section_id=row.get("outline_section_id"),
+        user_notes=row.get("user_notes"),
+        is_pinned=row.get("is_pinned", False),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+def _abandon(task: asyncio.Task) -> None:
+    """Cancel a task whose result is no longer wanted, retrieving any error."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
 
 @router.post(
     "/query",
@@ -33,10 +140,10 @@ router = APIRouter()
     description="RAG query against ingested academic papers with citations.",
 )
 async def query_sources(
-    project_id: UUID,
+    project_id: ProjectId,
     request: QueryRequest,
     user: CurrentUser,
-    db: DatabaseDep,
+    adb: AsyncDatabaseDep,
 ) -> QueryResponse:
     """
     Query ingested sources using RAG.
@@ -48,23 +155,29 @@ async def query_sources(
     - Synthesized answer with inline citations
     - List of source references with page numbers
     - Formatted reference list
+    
+    The RAG query starts right away and runs while the project is
+    verified; it is cancelled if the project does not exist.
     """
+    service = QueryService(project_id)
+    query_task = asyncio.create_task(service.query(request))
+    
     # Verify project exists and user has access
-    project_result = db.table("project")\
-        .select("id")\
-        .eq("id", str(project_id))\
-        .maybe_single()\
-        .execute()
+    try:
+        exists = await project_exists(adb, project_id)
+    except BaseException:
+        _abandon(query_task)
+        raise
     
-    if not project_result.data:
+    if not exists:
+        _abandon(query_task)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
     
     try:
-        service = QueryService(project_id)
-        result = await service.query(request)
+        result = await query_task
         
         logger.info(
             f"Query for project {project_id}: "
@@ -94,7 +207,7 @@ async def query_sources(
     description="Save a query result for later use in reports.",
 )
 async def save_synthesis(
-    project_id: UUID,
+    project_id: ProjectId,
     synthesis: SynthesisCreate,
     user: CurrentUser,
     db: DatabaseDep,
@@ -106,7 +219,7 @@ async def save_synthesis(
     for easy access.
     """
     # Verify project
-    if str(synthesis.project_id) != str(project_id):
+    if synthesis.project_id != UUID(project_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Project ID mismatch",
@@ -117,7 +230,7 @@ async def save_synthesis(
         sources_json = [s.model_dump(mode="json") for s in synthesis.sources]
         
         result = db.table("synthesis").insert({
-            "project_id": str(project_id),
+            "project_id": project_id,
             "query": synthesis.query,
             "answer": synthesis.answer,
             "sources": sources_json,
@@ -133,20 +246,8 @@ async def save_synthesis(
             )
         
         row = result.data[0]
-        sources = [SourceReference(**s) for s in (row.get("sources") or [])]
-        
-        return SynthesisResponse(
-            id=row["id"],
-            project_id=row["project_id"],
-            query=row["query"],
-            answer=row["answer"],
-            sources=sources,
-            outline_section_id=row.get("outline_section_id"),
-            user_notes=row.get("user_notes"),
-            is_pinned=row.get("is_pinned", False),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+        # The stored sources are exactly the validated ones from the request
+        return _to_synthesis_response(row, synthesis.sources)
         
     except HTTPException:
         raise
@@ -165,45 +266,48 @@ async def save_synthesis(
     description="List saved syntheses for a project.",
 )
 async def list_syntheses(
-    project_id: UUID,
+    project_id: ProjectId,
     user: CurrentUser,
     db: DatabaseDep,
+    pg: PgDep,
     pinned_only: bool = Query(False),
     section_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
 ) -> list[SynthesisListItem]:
     """List syntheses with optional filtering."""
+    strict = get_settings().strict_validation
+    
     try:
-        query = db.table("synthesis")\
-            .select("id, query, answer, sources, is_pinned, created_at")\
-            .eq("project_id", str(project_id))
-        
-        if pinned_only:
-            query = query.eq("is_pinned", True)
-        
-        if section_id:
-            query = query.eq("outline_section_id", str(section_id))
-        
-        query = query.order("created_at", desc=True)\
-            .range(offset, offset + limit - 1)
-        
-        result = query.execute()
-        
-        items = []
-        for row in result.data:
-            sources = row.get("sources") or []
-            answer = row.get("answer", "")
-            items.append(SynthesisListItem(
-                id=row["id"],
-                query=row["query"],
-                answer_preview=answer[:200] if len(answer) > 200 else answer,
-                source_count=len(sources),
-                is_pinned=row.get("is_pinned", False),
-                created_at=row["created_at"],
-            ))
+        if pg is not None:
+            rows = await pg.fetchval(
+                _LIST_SYNTHESES_SQL,
+                project_id,
+                pinned_only,
+                section_id,
+                limit,
+                offset,
+            )
+        else:
+            # The view trims each answer to its preview and counts sources in Postgres.
+            # Pages are read off idx_synthesis_project_created, or
+            # idx_synthesis_project_section when filtering by section.
+            query = db.table("synthesis_list_v")\
+                .select("id, query, answer_preview, source_count, is_pinned, created_at")\
+                .eq("project_id", project_id)
+            
+            if pinned_only:
+                query = query.eq("is_pinned", True)
+            
+            if section_id:
+                query = query.eq("outline_section_id", str(section_id))
+            
+            query = query.order("created_at", desc=True)\
+                .range(offset, offset + limit - 1)
+            
+            rows = query.execute().data
         
-        return items
+        return [_to_synthesis_list_item(row, strict) for row in rows]
         
     except Exception as e:
         logger.exception(f"Error listing syntheses: {e}")
@@ -220,8 +324,8 @@ async def list_syntheses(
     description="Get a specific synthesis with full details.",
 )
 async def get_synthesis(
-    project_id: UUID,
-    synthesis_id: UUID,
+    project_id: ProjectId,
+    synthesis_id: SynthesisId,
     user: CurrentUser,
     db: DatabaseDep,
 ) -> SynthesisResponse:
@@ -229,8 +333,8 @@ async def get_synthesis(
     try:
         result = db.table("synthesis")\
             .select("*")\
-            .eq("id", str(synthesis_id))\
-            .eq("project_id", str(project_id))\
+            .eq("id", synthesis_id)\
+            .eq("project_id", project_id)\
             .maybe_single()\
             .execute()
         
@@ -241,19 +345,8 @@ async def get_synthesis(
             )
         
         row = result.data
-        sources = [SourceReference(**s) for s in (row.get("sources") or [])]
-        
-        return SynthesisResponse(
-            id=row["id"],
-            project_id=row["project_id"],
-            query=row["query"],
-            answer=row["answer"],
-            sources=sources,
-            outline_section_id=row.get("outline_section_id"),
-            user_notes=row.get("user_notes"),
-            is_pinned=row.get("is_pinned", False),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
+        return _to_synthesis_response(
+            row, strict=get_settings().strict_validation
         )
         
     except HTTPException:
@@ -273,8 +366,8 @@ async def get_synthesis(
     description="Delete a saved synthesis.",
 )
 async def delete_synthesis(
-    project_id: UUID,
-    synthesis_id: UUID,
+    project_id: ProjectId,
+    synthesis_id: SynthesisId,
     user: CurrentUser,
     db: DatabaseDep,
 ) -> None:
@@ -282,8 +375,8 @@ async def delete_synthesis(
     try:
         result = db.table("synthesis")\
             .delete()\
-            .eq("id", str(synthesis_id))\
-            .eq("project_id", str(project_id))\
+            .eq("id", synthesis_id)\
+            .eq("project_id", project_id)\
             .execute()
         
         if not result.data:
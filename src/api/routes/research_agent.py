@@ -10,15 +10,28 @@ Provides endpoints for:
 """
 
 import logging
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import (
+    AgentDep,
+    CurrentUser,
+    DatabaseDep,
+    PgDep,
+    ProjectId,
+    invalidate_research_agents,
+)
+from src.config import get_settings
+from src.models.common import build_model
 from src.models.knowledge import (
+    ClaimEditRequest,
+    ClaimStatus,
     CritiqueRequest,
     DeepenRequest,
+    EvidenceStrength,
     ExploreRequest,
     ExploreResult,
     GenerateOutlineRequest,
@@ -27,9 +40,11 @@ from src.models.knowledge import (
     KnowledgeNodeUpdate,
     KnowledgeTree,
     OutlineClaim,
+    RateNodeRequest,
     ResearchSession,
     ResearchSessionCreate,
     ResearchSessionUpdate,
+    SuggestRequest,
 )
 from src.services.research_agent import ResearchAgent, ResearchAgentError
 
@@ -37,6 +52,36 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Claims for the direct Postgres path, limited to the project's sections and
+# optionally to one section, aggregated into one JSON array.
+_GET_CLAIMS_SQL = """
+SELECT COALESCE(jsonb_agg(c ORDER BY c.order_index), '[]'::jsonb)
+FROM outline_claim c
+JOIN outline_section os ON os.id = c.section_id
+WHERE os.project_id = $1::uuid
+  AND ($2::uuid IS NULL OR c.section_id = $2::uuid)
+"""
+
+
+def _to_claim(row: dict, strict: bool) -> OutlineClaim:
+    """Build an OutlineClaim from an outline_claim row (see build_model)."""
+    return build_model(
+        OutlineClaim,
+        strict,
+        id=UUID(row["id"]),
+        section_id=UUID(row["section_id"]),
+        claim_text=row["claim_text"],
+        order_index=row["order_index"],
+        supporting_nodes=[UUID(n) for n in row.get("supporting_nodes") or []],
+        evidence_strength=EvidenceStrength(row.get("evidence_strength") or "moderate"),
+        source_count=row.get("source_count") or 0,
+        user_critique=row.get("user_critique"),
+        status=ClaimStatus(row.get("status") or "draft"),
+        suggested_action=row.get("suggested_action"),
+        created_at=datetime.fromisoformat(row["created_at"]),
+        updated_at=datetime.fromisoformat(row["updated_at"]),
+    )
+
 
 # ============================================================================
 # Research Session
@@ -49,7 +94,7 @@ router = APIRouter()
     summary="Start research session",
 )
 async def start_session(
-    project_id: UUID,
+    project_id: ProjectId,
     data: ResearchSessionCreate,
     user: CurrentUser,
     db: DatabaseDep,
@@ -62,6 +107,8 @@ async def start_session(
     try:
         agent = ResearchAgent(project_id)
         session = await agent.start_session(data.topic, data.guidance_notes)
+        # Cached chat agents may still point at the previous session
+        invalidate_research_agents(project_id)
         return session
     except ResearchAgentError as e:
         raise HTTPException(status_code=400, detail=e.message)
@@ -69,17 +116,28 @@ async def start_session(
 
 @router.get(
     "/session",
-    response_model=Optional[ResearchSession],
+    response_model=None,
+    responses={
+        200: {"model": ResearchSession},
+        204: {"description": "No research session exists yet"},
+    },
     summary="Get current session",
 )
 async def get_session(
-    project_id: UUID,
+    project_id: ProjectId,
     user: CurrentUser,
     db: DatabaseDep,
-) -> Optional[ResearchSession]:
-    """Get the current research session for a project."""
-    agent = ResearchAgent(project_id)
-    return await agent.get_session()
+    agent: AgentDep,
+) -> Response | ResearchSession:
+    """
+    Get the current research session for a project.
+    
+    Returns the ResearchSession, or 204 No Content if none has been started.
+    """
+    session = await agent.get_session()
+    if session is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return session
 
 
 @router.patch(
@@ -88,27 +146,27 @@ async def get_session(
     summary="Update session",
 )
 async def update_session(
-    project_id: UUID,
+    project_id: ProjectId,
     data: ResearchSessionUpdate,
     user: CurrentUser,
     db: DatabaseDep,
 ) -> ResearchSession:
     """Update the research session (topic, guidance, status)."""
-    agent = ResearchAgent(project_id)
-    session = await agent.get_session()
-    if not session:
-        raise HTTPException(status_code=404, detail="No active session")
+    # Finds the latest session and updates it in one call
+    result = db.rpc(
+        "update_latest_research_session",
+        {
+            "p_id": project_id,
+            "p_changes": data.model_dump(mode="json", exclude_unset=True),
+        },
+    ).execute()
     
-    update_data = data.model_dump(exclude_unset=True)
-    if update_data:
-        result = db.table("research_session")\
-            .update(update_data)\
-            .eq("id", str(session.id))\
-            .execute()
-        if result.data:
-            return ResearchSession(**result.data[0])
+    if not result.data:
+        raise HTTPException(status_code=404, detail="No active session")
     
-    return session
+    # Cached agents hold the session as it was before this update
+    invalidate_research_agents(project_id)
+    return ResearchSession(**result.data)
 
 
 # ============================================================================
@@ -121,10 +179,11 @@ async def update_session(
     summary="Explore topic",
 )
 async def explore_topic(
-    project_id: UUID,
+    project_id: ProjectId,
     data: ExploreRequest,
     user: CurrentUser,
     db: DatabaseDep,
+    agent: AgentDep,
 ) -> ExploreResult:
     """
     Explore a topic - search for papers and auto-ingest.
@@ -136,7 +195,6 @@ async def explore_topic(
     4. Generate summaries
     5. Suggest subtopics
     """
-    agent = ResearchAgent(project_id)
     session = await agent.get_session()
     if not session:
         raise HTTPException(status_code=404, detail="No active session. Start one first.")
@@ -153,17 +211,17 @@ async def explore_topic(
     summary="Go deeper on subtopic",
 )
 async def deepen_topic(
-    project_id: UUID,
+    project_id: ProjectId,
     data: DeepenRequest,
     user: CurrentUser,
     db: DatabaseDep,
+    agent: AgentDep,
 ) -> ExploreResult:
     """
     Go deeper on a specific subtopic.
     
     Creates a sub-branch in the knowledge tree.
     """
-    agent = ResearchAgent(project_id)
     session = await agent.get_session()
     if not session:
         raise HTTPException(status_code=404, detail="No active session")
@@ -180,23 +238,23 @@ async def deepen_topic(
     summary="Suggest direction",
 )
 async def suggest_direction(
-    project_id: UUID,
-    suggestion: str = Query(..., min_length=3),
-    user: CurrentUser = None,
-    db: DatabaseDep = None,
+    project_id: ProjectId,
+    data: SuggestRequest,
+    user: CurrentUser,
+    db: DatabaseDep,
+    agent: AgentDep,
 ) -> ExploreResult:
     """
     Suggest a new direction for research.
     
     User provides a suggestion and AI explores that direction.
     """
-    agent = ResearchAgent(project_id)
     session = await agent.get_session()
     if not session:
         raise HTTPException(status_code=404, detail="No active session")
     
     try:
-        return await agent.suggest_direction(suggestion)
+        return await agent.suggest_direction(data.suggestion)
     except ResearchAgentError as e:
         raise HTTPException(status_code=400, detail=e.message)
 
@@ -211,16 +269,16 @@ async def suggest_direction(
     summary="Get knowledge tree",
 )
 async def get_knowledge_tree(
-    project_id: UUID,
+    project_id: ProjectId,
     user: CurrentUser,
     db: DatabaseDep,
+    agent: AgentDep,
 ) -> KnowledgeTree:
     """
     Get the full knowledge tree for the current session.
     
     Returns all nodes organized hierarchically.
     """
-    agent = ResearchAgent(project_id)
     session = await agent.get_session()
     if not session:
         raise HTTPException(status_code=404, detail="No active session")
@@ -237,7 +295,7 @@ async def get_knowledge_tree(
     summary="Update knowledge node",
 )
 async def update_knowledge_node(
-    project_id: UUID,
+    project_id: ProjectId,
     node_id: UUID,
     data: KnowledgeNodeUpdate,
     user: CurrentUser,
@@ -246,19 +304,19 @@ async def update_knowledge_node(
     """
     Update a knowledge node (rating, notes, visibility).
     """
-    update_data = data.model_dump(exclude_unset=True)
+    update_data = data.model_dump(mode="json", exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data provided")
     
-    result = db.table("knowledge_node")\
-        .update(update_data)\
-        .eq("id", str(node_id))\
-        .execute()
+    result = db.rpc(
+        "update_knowledge_node_in_project",
+        {"p_id": project_id, "p_node_id": str(node_id), "p_changes": update_data},
+    ).execute()
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Node not found")
     
-    return KnowledgeNode(**result.data[0])
+    return KnowledgeNode(**result.data)
 
 
 @router.post(
@@ -267,21 +325,20 @@ async def update_knowledge_node(
     summary="Rate knowledge node",
 )
 async def rate_node(
-    project_id: UUID,
+    project_id: ProjectId,
     node_id: UUID,
-    rating: str = Query(..., pattern="^(useful|neutral|irrelevant)$"),
-    note: Optional[str] = Query(None),
-    user: CurrentUser = None,
-    db: DatabaseDep = None,
+    data: RateNodeRequest,
+    user: CurrentUser,
+    db: DatabaseDep,
+    agent: AgentDep,
 ) -> KnowledgeNode:
     """
     Rate a knowledge node as useful, neutral, or irrelevant.
     
     Irrelevant nodes are hidden from the tree.
     """
-    agent = ResearchAgent(project_id)
     try:
-        return await agent.rate_node(node_id, rating, note)
+        return await agent.rate_node(node_id, data.rating.value, data.note)
     except ResearchAgentError as e:
         raise HTTPException(status_code=400, detail=e.message)
 
@@ -292,16 +349,16 @@ async def rate_node(
     summary="Delete knowledge node",
 )
 async def delete_knowledge_node(
-    project_id: UUID,
+    project_id: ProjectId,
     node_id: UUID,
     user: CurrentUser,
     db: DatabaseDep,
 ):
     """Delete a knowledge node (and its children)."""
-    result = db.table("knowledge_node")\
-        .delete()\
-        .eq("id", str(node_id))\
-        .execute()
+    result = db.rpc(
+        "delete_knowledge_node_in_project",
+        {"p_id": project_id, "p_node_id": str(node_id)},
+    ).execute()
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Node not found")
@@ -317,10 +374,11 @@ async def delete_knowledge_node(
     summary="Generate outline from knowledge",
 )
 async def generate_outline(
-    project_id: UUID,
+    project_id: ProjectId,
     data: Optional[GenerateOutlineRequest] = None,
     user: CurrentUser = None,
     db: DatabaseDep = None,
+    agent: AgentDep = None,
 ) -> GenerateOutlineResult:
     """
     Generate an outline from the accumulated knowledge.
@@ -330,7 +388,6 @@ async def generate_outline(
     2. Create outline sections
     3. Generate claims with source links
     """
-    agent = ResearchAgent(project_id)
     session = await agent.get_session()
     if not session:
         raise HTTPException(status_code=404, detail="No active session")
@@ -351,29 +408,36 @@ async def generate_outline(
     summary="Get all claims with sources",
 )
 async def get_claims(
-    project_id: UUID,
+    project_id: ProjectId,
     section_id: Optional[UUID] = Query(None),
     user: CurrentUser = None,
     db: DatabaseDep = None,
+    pg: PgDep = None,
 ) -> list[OutlineClaim]:
     """
     Get outline claims with their source links.
     
     Optionally filter by section.
     """
-    query = db.table("outline_claim").select("*")
+    strict = get_settings().strict_validation
+    
+    if pg is not None:
+        rows = await pg.fetchval(_GET_CLAIMS_SQL, project_id, section_id)
+        return [_to_claim(row, strict) for row in rows]
+    
+    # The inner join limits claims to this project's sections
+    query = db.table("outline_claim")\
+        .select("*, outline_section!inner(project_id)")\
+        .eq("outline_section.project_id", project_id)
     
     if section_id:
         query = query.eq("section_id", str(section_id))
-    else:
-        # Join to get claims for this project's sections
-        # Simplified - just get all claims for now
-        pass
     
+    # Per-section reads are ordered by idx_outline_claim_section_order
     query = query.order("order_index")
     result = query.execute()
     
-    return [OutlineClaim(**row) for row in result.data]
+    return [_to_claim(row, strict) for row in result.data]
 
 
 @router.post(
@@ -381,11 +445,12 @@ async def get_claims(
     summary="Critique a claim",
 )
 async def critique_claim(
-    project_id: UUID,
+    project_id: ProjectId,
     claim_id: UUID,
     data: CritiqueRequest,
     user: CurrentUser = None,
     db: DatabaseDep = None,
+    agent: AgentDep = None,
 ) -> dict:
     """
     Submit a critique of a claim.
@@ -397,7 +462,6 @@ async def critique_claim(
     - merge: Merge with another claim
     - split: Split into multiple claims
     """
-    agent = ResearchAgent(project_id)
     try:
         return await agent.handle_critique(claim_id, data)
     except ResearchAgentError as e:
@@ -410,33 +474,31 @@ async def critique_claim(
     summary="Update claim",
 )
 async def update_claim(
-    project_id: UUID,
+    project_id: ProjectId,
     claim_id: UUID,
-    claim_text: Optional[str] = None,
-    user_critique: Optional[str] = None,
-    status: Optional[str] = None,
-    user: CurrentUser = None,
-    db: DatabaseDep = None,
+    data: ClaimEditRequest,
+    user: CurrentUser,
+    db: DatabaseDep,
 ) -> OutlineClaim:
     """Update a claim's text, critique, or status."""
     update_data = {}
-    if claim_text:
-        update_data["claim_text"] = claim_text
-    if user_critique:
-        update_data["user_critique"] = user_critique
-    if status:
-        update_data["status"] = status
+    if data.claim_text:
+        update_data["claim_text"] = data.claim_text
+    if data.user_critique:
+        update_data["user_critique"] = data.user_critique
+    if data.status:
+        update_data["status"] = data.status.value
     
     if not update_data:
         raise HTTPException(status_code=400, detail="No update data")
     
-    result = db.table("outline_claim")\
-        .update(update_data)\
-        .eq("id", str(claim_id))\
-        .execute()
+    result = db.rpc(
+        "update_claim_in_project",
+        {"p_id": project_id, "p_claim_id": str(claim_id), "p_changes": update_data},
+    ).execute()
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    return OutlineClaim(**result.data[0])
+    return _to_claim(result.data, get_settings().strict_validation)
 
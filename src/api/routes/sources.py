@@ -5,12 +5,20 @@ Search, add, and manage academic paper sources for a project.
 """
 
 import logging
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from src.api.deps import CurrentUser, DatabaseDep
+from src.api.deps import (
+    AsyncDatabaseDep,
+    CurrentUser,
+    PgDep,
+    SemanticScholarDep,
+)
+from src.config import get_settings
+from src.models.common import build_model
 from src.models.source import (
     Author,
     IngestionStatus,
@@ -20,21 +28,144 @@ from src.models.source import (
     SourceListItem,
     SourceResponse,
 )
-from src.services.semantic_scholar import (
-    SemanticScholarClient,
-    SemanticScholarError,
-)
+from src.services.semantic_scholar import SemanticScholarError
 from src.services.multi_source_search import (
     MultiSourceSearchService,
     MultiSourceSearchResult,
     SearchSource,
 )
 from src.services.ingestion import IngestionService, IngestionError
+from src.services.query_service import invalidate_query_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Columns a SourceResponse is built from
+SOURCE_COLUMNS = (
+    "id, project_id, doi, arxiv_id, semantic_scholar_id, title, authors, "
+    "abstract, publication_year, journal, pdf_url, ingestion_status, "
+    "hyperion_doc_name, chunk_count, error_message, created_at, updated_at"
+)
+
+_GET_SOURCE_SQL = f"""
+SELECT to_jsonb(s)
+FROM (
+    SELECT {SOURCE_COLUMNS}
+    FROM source
+    WHERE id = $1::uuid AND project_id = $2::uuid
+) s
+"""
+
+# Source list page for the direct Postgres path; same rows as the PostgREST
+# query in list_sources, aggregated into one JSON array.
+_LIST_SOURCES_SQL = """
+SELECT COALESCE(jsonb_agg(s ORDER BY s.created_at DESC), '[]'::jsonb)
+FROM (
+    SELECT id, title, authors, publication_year, ingestion_status,
+           chunk_count, created_at
+    FROM source
+    WHERE project_id = $1::uuid
+      AND ($2::text IS NULL OR ingestion_status::text = $2::text)
+    ORDER BY created_at DESC
+    LIMIT $3 OFFSET $4
+) s
+"""
+
+# The same page already shaped like list[SourceListItem] and returned as
+# JSON text, so it can be sent as the response body without being decoded
+_LIST_SOURCES_JSON_SQL = """
+SELECT COALESCE(jsonb_agg(jsonb_build_object(
+    'id', s.id,
+    'title', s.title,
+    'authors', (
+        SELECT COALESCE(jsonb_agg(jsonb_build_object(
+            'name', a->>'name',
+            'author_id', a->>'author_id',
+            'affiliation', a->>'affiliation',
+            'orcid', a->>'orcid'
+        )), '[]'::jsonb)
+        FROM jsonb_array_elements(s.authors) a
+    ),
+    'publication_year', s.publication_year,
+    'ingestion_status', s.ingestion_status,
+    'chunk_count', COALESCE(s.chunk_count, 0),
+    'created_at', s.created_at
+) ORDER BY s.created_at DESC), '[]'::jsonb)::text
+FROM (
+    SELECT id, title, authors, publication_year, ingestion_status,
+           chunk_count, created_at
+    FROM source
+    WHERE project_id = $1::uuid
+      AND ($2::text IS NULL OR ingestion_status::text = $2::text)
+    ORDER BY created_at DESC
+    LIMIT $3 OFFSET $4
+) s
+"""
+
+
+def _to_authors(authors: list[dict], strict: bool) -> list[Author]:
+    """Build Author models from a source row's normalized authors."""
+    return [
+        build_model(
+            Author,
+            strict,
+            name=a["name"],
+            author_id=a.get("author_id"),
+            affiliation=a.get("affiliation"),
+            orcid=a.get("orcid"),
+        )
+        for a in authors
+    ]
+
+
+def _to_source_response(
+    row: dict, strict: bool, authors: Optional[list[Author]] = None
+) -> SourceResponse:
+    """
+    Build a SourceResponse from a source row (see build_model).
+    
+    Pass ``authors`` when the models are already in hand.
+    """
+    if authors is None:
+        authors = _to_authors(row.get("authors") or [], strict)
+    return build_model(
+        SourceResponse,
+        strict,
+        id=UUID(row["id"]),
+        project_id=UUID(row["project_id"]),
+        doi=row.get("doi"),
+        arxiv_id=row.get("arxiv_id"),
+        semantic_scholar_id=row.get("semantic_scholar_id"),
+        title=row["title"],
+        authors=authors,
+        abstract=row.get("abstract"),
+        publication_year=row.get("publication_year"),
+        journal=row.get("journal"),
+        pdf_url=row.get("pdf_url"),
+        ingestion_status=IngestionStatus(row["ingestion_status"]),
+        hyperion_doc_name=row.get("hyperion_doc_name"),
+        chunk_count=row.get("chunk_count") or 0,
+        error_message=row.get("error_message"),
+        created_at=datetime.fromisoformat(row["created_at"]),
+        updated_at=datetime.fromisoformat(row["updated_at"]),
+    )
+
+
+def _to_source_list_item(row: dict, strict: bool) -> SourceListItem:
+    """Build a SourceListItem from a source row (see build_model)."""
+    return build_model(
+        SourceListItem,
+        strict,
+        id=UUID(row["id"]),
+        title=row["title"],
+        authors=_to_authors(row.get("authors") or [], strict),
+        publication_year=row.get("publication_year"),
+        ingestion_status=IngestionStatus(row["ingestion_status"]),
+        chunk_count=row.get("chunk_count") or 0,
+        created_at=datetime.fromisoformat(row["created_at"]),
+    )
+
 
 @router.post(
     "/search",
@@ -46,6 +177,7 @@ async def search_papers(
     project_id: UUID,
     request: PaperSearchRequest,
     user: CurrentUser,
+    ss_client: SemanticScholarDep,
 ) -> PaperSearchResponse:
     """
     Search for academic papers.
@@ -53,15 +185,14 @@ async def search_papers(
     Uses Semantic Scholar API. Results can be added to the project.
     """
     try:
-        async with SemanticScholarClient() as client:
-            results = await client.search(
-                query=request.query,
-                limit=request.limit,
-                year_from=request.year_from,
-                year_to=request.year_to,
-                open_access_only=request.open_access_only,
-                fields_of_study=request.fields_of_study or None,
-            )
+        results = await ss_client.search(
+            query=request.query,
+            limit=request.limit,
+            year_from=request.year_from,
+            year_to=request.year_to,
+            open_access_only=request.open_access_only,
+            fields_of_study=request.fields_of_study or None,
+        )
         
         logger.info(f"Search '{request.query}' returned {len(results.results)} results")
         return results
@@ -150,48 +281,19 @@ async def add_source(
     project_id: UUID,
     source: SourceCreate,
     user: CurrentUser,
-    db: DatabaseDep,
+    db: AsyncDatabaseDep,
+    pg: PgDep,
 ) -> SourceResponse:
     """
     Add a paper to the project.
     
     The paper will be queued for ingestion into the RAG system.
     """
-    # Verify project exists
-    project_result = db.table("project")\
-        .select("id")\
-        .eq("id", str(project_id))\
-        .maybe_single()\
-        .execute()
-    
-    if not project_result.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
-    
-    # Check if source already exists (by DOI or paper_id)
-    if source.doi:
-        existing = db.table("source")\
-            .select("id")\
-            .eq("project_id", str(project_id))\
-            .eq("doi", source.doi)\
-            .maybe_single()\
-            .execute()
-        
-        if existing.data:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Paper with DOI {source.doi} already exists in project",
-            )
-    
     try:
         # Convert authors to JSON-serializable format
         authors_json = [a.model_dump() for a in source.authors]
         
-        # Insert source
-        insert_data = {
-            "project_id": str(project_id),
+        source_data = {
             "doi": source.doi,
             "arxiv_id": source.arxiv_id,
             "semantic_scholar_id": source.paper_id,
@@ -205,38 +307,34 @@ async def add_source(
             "ingestion_status": IngestionStatus.PENDING.value,
         }
         
-        result = db.table("source").insert(insert_data).execute()
+        # Checks the project, rejects a duplicate DOI and inserts in one call
+        if pg is not None:
+            outcome = await pg.fetchval(
+                "SELECT add_source($1::uuid, $2::jsonb)", project_id, source_data
+            )
+        else:
+            outcome = (await db.rpc(
+                "add_source",
+                {"p_id": str(project_id), "p_source": source_data},
+            ).execute()).data
         
-        if not result.data:
+        if outcome["status"] == "project_not_found":
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to add source",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found",
+            )
+        if outcome["status"] == "duplicate":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Paper with DOI {source.doi} already exists in project",
             )
         
-        created = result.data[0]
+        created = outcome["row"]
         logger.info(f"Added source {created['id']} to project {project_id}")
         
-        # Parse authors back to model
-        authors = [Author(**a) for a in (created.get("authors") or [])]
-        
-        return SourceResponse(
-            id=created["id"],
-            project_id=created["project_id"],
-            doi=created.get("doi"),
-            arxiv_id=created.get("arxiv_id"),
-            semantic_scholar_id=created.get("semantic_scholar_id"),
-            title=created["title"],
-            authors=authors,
-            abstract=created.get("abstract"),
-            publication_year=created.get("publication_year"),
-            journal=created.get("journal"),
-            pdf_url=created.get("pdf_url"),
-            ingestion_status=created["ingestion_status"],
-            hyperion_doc_name=created.get("hyperion_doc_name"),
-            chunk_count=created.get("chunk_count", 0),
-            error_message=created.get("error_message"),
-            created_at=created["created_at"],
-            updated_at=created["updated_at"],
+        # The stored authors are exactly the validated ones from the request
+        return _to_source_response(
+            created, get_settings().strict_validation, source.authors
         )
         
     except HTTPException:
@@ -258,39 +356,53 @@ async def add_source(
 async def list_sources(
     project_id: UUID,
     user: CurrentUser,
-    db: DatabaseDep,
+    db: AsyncDatabaseDep,
+    pg: PgDep,
     status_filter: Optional[IngestionStatus] = Query(None, alias="status"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-) -> list[SourceListItem]:
-    """List sources in a project."""
+) -> list[SourceListItem] | Response:
+    """
+    List sources in a project.
+    
+    On the direct Postgres path the page is built as JSON in the database
+    and sent as-is, so no rows are decoded or turned into models; with
+    strict_validation the rows are fetched and validated as models instead.
+    """
     try:
-        query = db.table("source")\
-            .select("id, title, authors, publication_year, ingestion_status, chunk_count, created_at")\
-            .eq("project_id", str(project_id))
-        
-        if status_filter:
-            query = query.eq("ingestion_status", status_filter.value)
-        
-        query = query.order("created_at", desc=True)\
-            .range(offset, offset + limit - 1)
-        
-        result = query.execute()
+        strict = get_settings().strict_validation
+        if pg is not None and not strict:
+            body = await pg.fetchval(
+                _LIST_SOURCES_JSON_SQL,
+                project_id,
+                status_filter.value if status_filter else None,
+                limit,
+                offset,
+            )
+            return Response(content=body, media_type="application/json")
         
-        sources = []
-        for row in result.data:
-            authors = [Author(**a) for a in (row.get("authors") or [])]
-            sources.append(SourceListItem(
-                id=row["id"],
-                title=row["title"],
-                authors=authors,
-                publication_year=row.get("publication_year"),
-                ingestion_status=row["ingestion_status"],
-                chunk_count=row.get("chunk_count", 0),
-                created_at=row["created_at"],
-            ))
+        if pg is not None:
+            rows = await pg.fetchval(
+                _LIST_SOURCES_SQL,
+                project_id,
+                status_filter.value if status_filter else None,
+                limit,
+                offset,
+            )
+        else:
+            query = db.table("source")\
+                .select("id, title, authors, publication_year, ingestion_status, chunk_count, created_at")\
+                .eq("project_id", str(project_id))
+            
+            if status_filter:
+                query = query.eq("ingestion_status", status_filter.value)
+            
+            query = query.order("created_at", desc=True)\
+                .range(offset, offset + limit - 1)
+            
+            rows = (await query.execute()).data
         
-        return sources
+        return [_to_source_list_item(row, strict) for row in rows]
         
     except Exception as e:
         logger.exception(f"Error listing sources: {e}")
@@ -310,45 +422,29 @@ async def get_source(
     project_id: UUID,
     source_id: UUID,
     user: CurrentUser,
-    db: DatabaseDep,
+    db: AsyncDatabaseDep,
+    pg: PgDep,
 ) -> SourceResponse:
     """Get source details."""
     try:
-        result = db.table("source")\
-            .select("*")\
-            .eq("id", str(source_id))\
-            .eq("project_id", str(project_id))\
-            .maybe_single()\
-            .execute()
+        if pg is not None:
+            row = await pg.fetchval(_GET_SOURCE_SQL, source_id, project_id)
+        else:
+            result = await db.table("source")\
+                .select(SOURCE_COLUMNS)\
+                .eq("id", str(source_id))\
+                .eq("project_id", str(project_id))\
+                .maybe_single()\
+                .execute()
+            row = result.data if result else None
         
-        if not result.data:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Source not found",
             )
         
-        row = result.data
-        authors = [Author(**a) for a in (row.get("authors") or [])]
-        
-        return SourceResponse(
-            id=row["id"],
-            project_id=row["project_id"],
-            doi=row.get("doi"),
-            arxiv_id=row.get("arxiv_id"),
-            semantic_scholar_id=row.get("semantic_scholar_id"),
-            title=row["title"],
-            authors=authors,
-            abstract=row.get("abstract"),
-            publication_year=row.get("publication_year"),
-            journal=row.get("journal"),
-            pdf_url=row.get("pdf_url"),
-            ingestion_status=row["ingestion_status"],
-            hyperion_doc_name=row.get("hyperion_doc_name"),
-            chunk_count=row.get("chunk_count", 0),
-            error_message=row.get("error_message"),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+        return _to_source_response(row, get_settings().strict_validation)
         
     except HTTPException:
         raise
@@ -370,7 +466,7 @@ async def delete_source(
     project_id: UUID,
     source_id: UUID,
     user: CurrentUser,
-    db: DatabaseDep,
+    db: AsyncDatabaseDep,
 ) -> None:
     """Remove a source from the project."""
     try:
@@ -379,7 +475,7 @@ async def delete_source(
         await service.delete_source_from_hyperion(source_id)
         
         # Then delete from database
-        result = db.table("source")\
+        result = await db.table("source")\
             .delete()\
             .eq("id", str(source_id))\
             .eq("project_id", str(project_id))\
@@ -391,6 +487,8 @@ async def delete_source(
                 detail="Source not found",
             )
         
+        # Cached answers may cite the removed paper
+        invalidate_query_cache()
         logger.info(f"Deleted source {source_id}")
         
     except HTTPException:
@@ -412,7 +510,7 @@ async def ingest_source(
     project_id: UUID,
     source_id: UUID,
     user: CurrentUser,
-    db: DatabaseDep,
+    db: AsyncDatabaseDep,
     force: bool = Query(False, description="Force re-ingestion even if already processed"),
 ) -> dict:
     """
@@ -425,14 +523,14 @@ async def ingest_source(
     The source will be ready for RAG queries after LightRAG processing.
     """
     # Verify source exists and belongs to project
-    result = db.table("source")\
+    result = await db.table("source")\
         .select("id, pdf_url, arxiv_id, doi")\
         .eq("id", str(source_id))\
         .eq("project_id", str(project_id))\
         .maybe_single()\
         .execute()
     
-    if not result.data:
+    if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Source not found",
@@ -16,7 +16,7 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
-from src.api.deps import DatabaseDep, CurrentUser
+from src.api.deps import DatabaseDep, CurrentUser, forget_project
 from src.config import get_settings
 from src.models.project import ProjectCreate, ProjectStatus
 from src.services.database import check_database_connection
@@ -573,6 +573,7 @@ async def cleanup_test_project(
         db.table("outline_section").delete().eq("project_id", project_id).execute()
         db.table("source").delete().eq("project_id", project_id).execute()
         db.table("project").delete().eq("id", project_id).execute()
+        forget_project(project_id)
         
         logger.info(f"Test harness cleaned up project: {project_id}")
         
@@ -53,6 +53,14 @@ class Settings(BaseSettings):
         description="Supabase JWT secret for token verification"
     )
     
+    # Direct Postgres (optional fast path for hot reads; needs asyncpg)
+    database_url: Optional[str] = Field(
+        default=None,
+        description="Postgres connection string (direct or session pooler)"
+    )
+    pg_pool_min_size: int = 10
+    pg_pool_max_size: int = 50
+    
     # Hyperion RAG
     hyperion_mcp_url: str = Field(
         default="https://n8n-dev-u36296.vm.elestio.app/mcp/hyperion",
@@ -93,6 +101,26 @@ class Settings(BaseSettings):
     rate_limit_requests: int = 100
     rate_limit_window_seconds: int = 60
     
+    # Report generation
+    report_section_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Section drafts generated at once per report (bounded by upstream rate limits)"
+    )
+    
+    # Research agent
+    explore_paper_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Papers added and ingested at once per exploration (bounded by PDF hosts and Hyperion)"
+    )
+    
+    # Validation
+    strict_validation: bool = Field(
+        default=False,
+        description="Validate database rows when building response models (slower, for debugging)"
+    )
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
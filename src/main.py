@@ -18,7 +18,20 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from src.api import api_router
 from src.config import get_settings
 from src.models.common import ErrorResponse
-from src.api.routes.health import log_request, log_error
+from src.services.database import check_database_connection
+from src.services.postgres import close_pg_pool, init_pg_pool
+from src.services.semantic_scholar import (
+    close_semantic_scholar_client,
+    init_semantic_scholar_client,
+)
+from src.api.routes.logs import OPENAPI_SCHEMAS as LOG_SCHEMAS
+from src.api.routes.health import (
+    close_probe_client,
+    log_error,
+    log_request,
+    start_db_health_monitor,
+    stop_db_health_monitor,
+)
 
 # Configure structured JSON logging
 logging.basicConfig(
@@ -56,10 +69,30 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Debug mode: {settings.debug}")
     
+    # Warm the pooled database client so the first request skips the handshake
+    if not await check_database_connection():
+        logger.warning("Database not reachable at startup")
+    
+    # Direct Postgres pool for hot reads, if DATABASE_URL is configured
+    try:
+        await init_pg_pool()
+    except Exception as e:
+        logger.warning(f"Postgres pool unavailable, using PostgREST: {e}")
+    
+    # One Semantic Scholar connection pool for all paper searches
+    await init_semantic_scholar_client()
+    
+    # Keep /health answered from memory
+    start_db_health_monitor()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    await stop_db_health_monitor()
+    await close_probe_client()
+    await close_semantic_scholar_client()
+    await close_pg_pool()
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
@@ -187,6 +220,19 @@ def create_app() -> FastAPI:
     # Include API routes
     app.include_router(api_router, prefix="/api")
     
+    # Add models of bodies validated from raw bytes, which FastAPI can't see
+    default_openapi = app.openapi
+    
+    def openapi() -> dict:
+        """Build the OpenAPI schema once, with the extra component schemas."""
+        if app.openapi_schema is None:
+            schema = default_openapi()
+            components = schema.setdefault("components", {})
+            components.setdefault("schemas", {}).update(LOG_SCHEMAS)
+        return app.openapi_schema
+    
+    app.openapi = openapi
+    
     # Root endpoint
     @app.get("/", tags=["root"])
     async def root():
@@ -10,6 +10,7 @@ from src.models.common import (
     HealthResponse,
     PaginatedResponse,
     UserContext,
+    build_model,
 )
 from src.models.project import (
     ProjectCreate,
@@ -69,6 +70,7 @@ __all__ = [
     "HealthResponse",
     "PaginatedResponse",
     "UserContext",
+    "build_model",
     # Project
     "ProjectCreate",
     "ProjectUpdate",
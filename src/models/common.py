@@ -8,6 +8,7 @@ from typing import Any, Generic, Optional, TypeVar
 from pydantic import BaseModel, Field
 
 T = TypeVar("T")
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
 
 class APIResponse(BaseModel, Generic[T]):
@@ -72,3 +73,18 @@ class UserContext(BaseModel):
     token_exp: Optional[datetime] = None
     token_iat: Optional[datetime] = None
 
+
+
+def build_model(model: type[ModelT], strict: bool, /, **fields: Any) -> ModelT:
+    """
+    Build a response model from values read from our own typed tables.
+    
+    Rows are already well-formed, so the model is built with
+    model_construct() and skips validation unless ``strict`` is set (the
+    strict_validation setting, read once per request). Callers convert the
+    non-JSON-native types (UUIDs, datetimes, enums) first, so an
+    unvalidated model serializes exactly like a validated one.
+    """
+    if strict:
+        return model(**fields)
+    return model.model_construct(**fields)
@@ -208,6 +208,17 @@ class DeepenRequest(BaseModel):
     max_papers: int = Field(5, ge=1, le=20)
 
 
+class SuggestRequest(BaseModel):
+    """User suggestion for a new research direction."""
+    suggestion: str = Field(..., min_length=3)
+
+
+class RateNodeRequest(BaseModel):
+    """User rating of a knowledge node."""
+    rating: UserRating
+    note: Optional[str] = None
+
+
 class CritiqueRequest(BaseModel):
     """User critique of a claim."""
     critique_type: str = Field(..., pattern="^(needs_more_sources|irrelevant|expand|merge|split)$")
@@ -215,6 +226,13 @@ class CritiqueRequest(BaseModel):
     target_node_ids: list[UUID] = []
 
 
+class ClaimEditRequest(BaseModel):
+    """User edit of a claim's text, critique, or status."""
+    claim_text: Optional[str] = None
+    user_critique: Optional[str] = None
+    status: Optional[ClaimStatus] = None
+
+
 class ExploreResult(BaseModel):
     """Result of exploration."""
     papers_found: int
@@ -4,7 +4,12 @@ Service layer for Academic Research Tool.
 Contains business logic and external service integrations.
 """
 
-from src.services.database import get_supabase_client, SupabaseClient
+from src.services.database import (
+    get_supabase_client,
+    get_async_supabase_client,
+    SupabaseClient,
+    AsyncSupabaseClient,
+)
 from src.services.auth import (
     verify_token,
     get_current_user,
@@ -79,6 +84,7 @@ from src.services.query_service import (
 from src.services.discovery import (
     DiscoveryService,
     RelationType,
+    SourceNotFoundError,
     discover_references,
     discover_citations,
     explore_knowledge_tree,
@@ -87,7 +93,9 @@ from src.services.discovery import (
 __all__ = [
     # Database
     "get_supabase_client",
+    "get_async_supabase_client",
     "SupabaseClient",
+    "AsyncSupabaseClient",
     # Auth
     "verify_token",
     "get_current_user",
@@ -149,6 +157,7 @@ __all__ = [
     # Discovery
     "DiscoveryService",
     "RelationType",
+    "SourceNotFoundError",
     "discover_references",
     "discover_citations",
     "explore_knowledge_tree",
@@ -0,0 +1,102 @@
+"""
+In-process TTL cache.
+
+Small, dependency-free cache for memoizing read-heavy results (agent
+getters, external API lookups) for a few seconds within one worker.
+Entries expire after a fixed TTL and the oldest entries are evicted once
+the cache is full. Not shared between workers or processes.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire ``ttl`` seconds after being set.
+
+    Intended for use from the event loop (single thread); it does no
+    locking of its own.
+
+    Usage:
+        cache = TTLCache(ttl=15)
+        value = cache.get(key)
+        if value is None:
+            value = await load()
+            cache.set(key, value)
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Seconds an entry stays valid after it is set.
+            maxsize: Maximum number of entries before the oldest is evicted.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the oldest entry if full."""
+        self._data.pop(key, None)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired or not), or default."""
+        entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return entry[1]
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove every entry whose key matches predicate.
+
+        Returns:
+            Number of entries removed.
+        """
+        keys = [k for k in self._data if predicate(k)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (0.0 when unused)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
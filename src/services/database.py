@@ -8,21 +8,47 @@ import logging
 from functools import lru_cache
 from typing import Optional
 
-from supabase import create_client, Client
+import httpx
+from supabase import AsyncClient, Client, acreate_client, create_client
+from supabase.lib.client_options import AsyncClientOptions, SyncClientOptions
 
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-# Type alias for clarity
+# Type aliases for clarity
 SupabaseClient = Client
+AsyncSupabaseClient = AsyncClient
 
+# Async clients keyed by use_service_role; created lazily on first use
+_async_clients: dict[bool, AsyncSupabaseClient] = {}
 
-@lru_cache
+# Connection pool shared by all PostgREST/storage/auth calls of one client.
+# Sized for the concurrent fan-outs (discovery, report sections) on top of
+# ordinary request traffic.
+_POOL_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+_HTTP_TIMEOUT = 30.0
+
+
+def _get_supabase_key(use_service_role: bool) -> str:
+    """Resolve the API key for the requested role."""
+    settings = get_settings()
+    
+    if use_service_role:
+        if not settings.supabase_service_role_key:
+            raise ValueError("SUPABASE_SERVICE_ROLE_KEY not configured")
+        return settings.supabase_service_role_key
+    return settings.supabase_anon_key
+
+
+@lru_cache(maxsize=2)
 def get_supabase_client(use_service_role: bool = False) -> SupabaseClient:
     """
     Get a cached Supabase client instance.
     
+    One client per role is created for the life of the process, backed by a
+    pooled keep-alive HTTP client so requests reuse connections.
+    
     Args:
         use_service_role: If True, use service role key for elevated permissions.
                          Should only be used for server-side operations.
@@ -34,15 +60,19 @@ def get_supabase_client(use_service_role: bool = False) -> SupabaseClient:
         ValueError: If required configuration is missing.
     """
     settings = get_settings()
+    key = _get_supabase_key(use_service_role)
     
-    if use_service_role:
-        if not settings.supabase_service_role_key:
-            raise ValueError("SUPABASE_SERVICE_ROLE_KEY not configured")
-        key = settings.supabase_service_role_key
-    else:
-        key = settings.supabase_anon_key
-    
-    client = create_client(settings.supabase_url, key)
+    http_client = httpx.Client(
+        limits=_POOL_LIMITS,
+        timeout=_HTTP_TIMEOUT,
+        follow_redirects=True,
+        http2=True,
+    )
+    client = create_client(
+        settings.supabase_url,
+        key,
+        options=SyncClientOptions(httpx_client=http_client),
+    )
     logger.info(
         f"Supabase client created (service_role={use_service_role})"
     )
@@ -50,17 +80,61 @@ def get_supabase_client(use_service_role: bool = False) -> SupabaseClient:
     return client
 
 
+async def get_async_supabase_client(
+    use_service_role: bool = False,
+) -> AsyncSupabaseClient:
+    """
+    Get a shared async Supabase client instance.
+    
+    Queries made through this client are awaited, so they do not block
+    the event loop the way the sync client does inside async handlers.
+    
+    Args:
+        use_service_role: If True, use service role key for elevated permissions.
+    
+    Returns:
+        Configured async Supabase client.
+    
+    Raises:
+        ValueError: If required configuration is missing.
+    """
+    client = _async_clients.get(use_service_role)
+    if client is None:
+        settings = get_settings()
+        key = _get_supabase_key(use_service_role)
+        http_client = httpx.AsyncClient(
+            limits=_POOL_LIMITS,
+            timeout=_HTTP_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+        )
+        client = await acreate_client(
+            settings.supabase_url,
+            key,
+            options=AsyncClientOptions(httpx_client=http_client),
+        )
+        # Another request may have raced us here; keep the first client
+        client = _async_clients.setdefault(use_service_role, client)
+        logger.info(
+            f"Async Supabase client created (service_role={use_service_role})"
+        )
+    
+    return client
+
+
 async def check_database_connection() -> bool:
     """
     Check if database connection is healthy.
     
+    Sends a body-less HEAD query through the shared async client, which
+    also warms its keep-alive pool.
+    
     Returns:
         True if connection is healthy, False otherwise.
     """
     try:
-        client = get_supabase_client()
-        # Simple query to check connection
-        result = client.table("project").select("id").limit(1).execute()
+        client = await get_async_supabase_client()
+        await client.table("project").select("id", head=True).limit(1).execute()
         return True
     except Exception as e:
         logger.error(f"Database connection check failed: {e}")
@@ -9,17 +9,95 @@ Discovers related papers through citation graph exploration:
 Uses Semantic Scholar's citation APIs.
 """
 
+import asyncio
+import base64
+import binascii
+import contextvars
+import hashlib
+import json
 import logging
+from contextvars import ContextVar
 from enum import Enum
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 from uuid import UUID
 
 from src.models.source import Author, PaperSearchResult
+from src.services.cache import TTLCache
 from src.services.database import get_supabase_client
-from src.services.semantic_scholar import SemanticScholarClient, SemanticScholarError
+from src.services.semantic_scholar import (
+    SemanticScholarClient,
+    SemanticScholarError,
+    init_semantic_scholar_client,
+)
 
 logger = logging.getLogger(__name__)
 
+# Semantic Scholar graph lookups, keyed by
+# (kind, S2 paper id, limit, position, fields).
+# The graph changes slowly and S2 rate limits are tight, so results are
+# kept for a day and shared across projects.
+DISCOVERY_CACHE_TTL_SECONDS = 24 * 60 * 60
+discovery_cache = TTLCache(ttl=DISCOVERY_CACHE_TTL_SECONDS, maxsize=10_000)
+
+# Columns needed to identify a source on Semantic Scholar
+_SOURCE_COLUMNS = "id, title, semantic_scholar_id, doi, arxiv_id"
+
+# Max sources explored at once when walking a whole project's graph
+EXPLORE_CONCURRENCY = 8
+
+# Semantic Scholar fields requested per discovered paper. The full set
+# backs the per-source routes; the tree overview leaves out abstracts,
+# venue and open-access details, which are most of each payload.
+DISCOVERY_FIELDS = (
+    "paperId,externalIds,title,abstract,venue,year,authors,"
+    "citationCount,isOpenAccess,openAccessPdf"
+)
+TREE_FIELDS = "paperId,externalIds,title,year,authors,citationCount"
+
+# Bounds on one project graph walk: uncached Semantic Scholar calls and
+# wall-clock time. Past either, the walk stops and reports a partial tree.
+EXPLORE_CALL_BUDGET = 200
+EXPLORE_TIMEOUT_SECONDS = 20.0
+
+
+class ExploreBudget:
+    """
+    Call and time budget for one project graph walk.
+    
+    After the walk, ``truncated`` holds why it stopped early
+    ("budget" or "timeout"), or None if every source was explored.
+    """
+    
+    def __init__(
+        self,
+        max_calls: int = EXPLORE_CALL_BUDGET,
+        timeout: float = EXPLORE_TIMEOUT_SECONDS,
+    ):
+        self.calls_remaining = max_calls
+        self.timeout = timeout
+        self.truncated: Optional[str] = None
+    
+    def spend(self) -> None:
+        """Account for one Semantic Scholar call, failing once exhausted."""
+        if self.calls_remaining <= 0:
+            self.truncated = "budget"
+            raise ExploreBudgetExceeded("Exploration call budget exhausted")
+        self.calls_remaining -= 1
+
+
+class ExploreBudgetExceeded(Exception):
+    """A graph walk ran out of Semantic Scholar calls."""
+
+
+# Budget of the graph walk the current task belongs to, if any
+_explore_budget: ContextVar[Optional[ExploreBudget]] = ContextVar(
+    "explore_budget", default=None
+)
+
+
+class SourceNotFoundError(ValueError):
+    """Source does not exist in the project."""
+
 
 class RelationType(str, Enum):
     """Type of relationship between papers."""
@@ -29,31 +107,101 @@ class RelationType(str, Enum):
     RELATED = "related"  # Semantically similar
 
 
+def encode_cursor(position: int) -> str:
+    """Encode a continuation position as an opaque page cursor."""
+    raw = json.dumps({"next": position}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Decode a page cursor back to its continuation position.
+    
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))["next"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(position, int) or position < 0:
+        raise ValueError("Invalid cursor")
+    return position
+
+
+def paper_dedupe_key(paper: dict) -> Optional[str]:
+    """
+    Key identifying a discovered paper across sources.
+    
+    Uses the Semantic Scholar paper id, falling back to a hash of the
+    normalized title for papers without one. Returns None when there is
+    nothing to key on, in which case the paper is never treated as a
+    duplicate.
+    """
+    paper_id = paper.get("paper_id")
+    if paper_id:
+        return paper_id
+    
+    title = " ".join((paper.get("title") or "").lower().split())
+    if not title:
+        return None
+    return "title:" + hashlib.blake2b(title.encode(), digest_size=8).hexdigest()
+
+
+def dedupe_papers(papers: list[dict], seen: set[str]) -> list[dict]:
+    """
+    Drop papers whose key is already in seen, recording the rest.
+    
+    Args:
+        papers: Serialized papers, in order.
+        seen: Keys of papers kept so far; updated in place.
+    
+    Returns:
+        Papers not seen before, in their original order.
+    """
+    kept = []
+    for paper in papers:
+        key = paper_dedupe_key(paper)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(paper)
+    return kept
+
+
 class DiscoveryResult:
     """Result from citation discovery."""
     
     def __init__(
         self,
-        source_id: UUID,
+        source_id: UUID | str,
         source_title: str,
         relation_type: RelationType,
         papers: list[PaperSearchResult],
         total_available: int,
+        next_cursor: Optional[str] = None,
     ):
         self.source_id = source_id
         self.source_title = source_title
         self.relation_type = relation_type
         self.papers = papers
         self.total_available = total_available
+        self.next_cursor = next_cursor
     
     def to_dict(self) -> dict:
+        """Plain dict for the API; ids are left as-is for orjson to encode."""
         return {
-            "source_id": str(self.source_id),
+            "source_id": self.source_id,
             "source_title": self.source_title,
             "relation_type": self.relation_type.value,
             "papers": [p.model_dump() for p in self.papers],
             "total_available": self.total_available,
             "returned_count": len(self.papers),
+            "next_cursor": self.next_cursor,
         }
 
 
@@ -74,21 +222,24 @@ class DiscoveryService:
         citations = await service.get_citations(source_id)
     """
     
-    def __init__(self, project_id: UUID):
+    def __init__(self, project_id: UUID | str):
         """
         Initialize discovery service.
         
         Args:
-            project_id: Project ID for context.
+            project_id: Project ID for context (UUID or its string form;
+                route handlers pass the validated path string through).
         """
         self.project_id = project_id
         self.db = get_supabase_client()
     
     async def get_references(
         self,
-        source_id: UUID,
+        source_id: UUID | str,
         limit: int = 20,
-        offset: int = 0,
+        cursor: Optional[str] = None,
+        source: Optional[dict] = None,
+        fields: str = DISCOVERY_FIELDS,
     ) -> DiscoveryResult:
         """
         Get papers that this source references (cites).
@@ -98,41 +249,54 @@ class DiscoveryService:
         Args:
             source_id: Source to explore.
             limit: Max papers to return.
-            offset: Pagination offset.
+            cursor: next_cursor from the previous page (None for the first).
+            source: Already-loaded source row (skips the lookup).
+            fields: Semantic Scholar fields to request per paper.
         
         Returns:
             DiscoveryResult with referenced papers.
+        
+        Raises:
+            SourceNotFoundError: If the source is not in this project.
         """
-        source = self._get_source(source_id)
-        if not source:
-            raise ValueError(f"Source not found: {source_id}")
+        if source is None:
+            source = self._require_source(source_id)
         
         paper_id = self._get_semantic_scholar_id(source)
         if not paper_id:
             raise ValueError("Source has no Semantic Scholar ID, DOI, or arXiv ID")
         
-        async with SemanticScholarClient() as client:
-            try:
-                papers, total = await self._fetch_references(
-                    client, paper_id, limit, offset
-                )
-                
-                return DiscoveryResult(
-                    source_id=source_id,
-                    source_title=source.get("title", "Unknown"),
-                    relation_type=RelationType.REFERENCES,
-                    papers=papers,
-                    total_available=total,
-                )
-            except SemanticScholarError as e:
-                logger.error(f"Failed to get references: {e.message}")
-                raise
+        position = decode_cursor(cursor)
+        try:
+            papers, total, next_position = await self._fetch_cached(
+                ("references", paper_id, limit, position, fields),
+                lambda client: self._fetch_references(
+                    client, paper_id, limit, position, fields
+                ),
+            )
+        except SemanticScholarError as e:
+            logger.error(f"Failed to get references: {e.message}")
+            raise
+        
+        return DiscoveryResult(
+            source_id=source_id,
+            source_title=source.get("title", "Unknown"),
+            relation_type=RelationType.REFERENCES,
+            papers=papers,
+            total_available=total,
+            next_cursor=(
+                encode_cursor(next_position)
+                if next_position is not None else None
+            ),
+        )
     
     async def get_citations(
         self,
-        source_id: UUID,
+        source_id: UUID | str,
         limit: int = 20,
-        offset: int = 0,
+        cursor: Optional[str] = None,
+        source: Optional[dict] = None,
+        fields: str = DISCOVERY_FIELDS,
     ) -> DiscoveryResult:
         """
         Get papers that cite this source.
@@ -142,40 +306,53 @@ class DiscoveryService:
         Args:
             source_id: Source to explore.
             limit: Max papers to return.
-            offset: Pagination offset.
+            cursor: next_cursor from the previous page (None for the first).
+            source: Already-loaded source row (skips the lookup).
+            fields: Semantic Scholar fields to request per paper.
         
         Returns:
             DiscoveryResult with citing papers.
+        
+        Raises:
+            SourceNotFoundError: If the source is not in this project.
         """
-        source = self._get_source(source_id)
-        if not source:
-            raise ValueError(f"Source not found: {source_id}")
+        if source is None:
+            source = self._require_source(source_id)
         
         paper_id = self._get_semantic_scholar_id(source)
         if not paper_id:
             raise ValueError("Source has no Semantic Scholar ID, DOI, or arXiv ID")
         
-        async with SemanticScholarClient() as client:
-            try:
-                papers, total = await self._fetch_citations(
-                    client, paper_id, limit, offset
-                )
-                
-                return DiscoveryResult(
-                    source_id=source_id,
-                    source_title=source.get("title", "Unknown"),
-                    relation_type=RelationType.CITED_BY,
-                    papers=papers,
-                    total_available=total,
-                )
-            except SemanticScholarError as e:
-                logger.error(f"Failed to get citations: {e.message}")
-                raise
+        position = decode_cursor(cursor)
+        try:
+            papers, total, next_position = await self._fetch_cached(
+                ("citations", paper_id, limit, position, fields),
+                lambda client: self._fetch_citations(
+                    client, paper_id, limit, position, fields
+                ),
+            )
+        except SemanticScholarError as e:
+            logger.error(f"Failed to get citations: {e.message}")
+            raise
+        
+        return DiscoveryResult(
+            source_id=source_id,
+            source_title=source.get("title", "Unknown"),
+            relation_type=RelationType.CITED_BY,
+            papers=papers,
+            total_available=total,
+            next_cursor=(
+                encode_cursor(next_position)
+                if next_position is not None else None
+            ),
+        )
     
     async def get_related(
         self,
-        source_id: UUID,
+        source_id: UUID | str,
         limit: int = 10,
+        source: Optional[dict] = None,
+        fields: str = DISCOVERY_FIELDS,
     ) -> DiscoveryResult:
         """
         Get semantically related papers.
@@ -185,37 +362,47 @@ class DiscoveryService:
         Args:
             source_id: Source to find similar papers for.
             limit: Max papers to return.
+            source: Already-loaded source row (skips the lookup).
+            fields: Semantic Scholar fields to request per paper.
         
         Returns:
             DiscoveryResult with related papers.
+        
+        Raises:
+            SourceNotFoundError: If the source is not in this project.
         """
-        source = self._get_source(source_id)
-        if not source:
-            raise ValueError(f"Source not found: {source_id}")
+        if source is None:
+            source = self._require_source(source_id)
         
         paper_id = self._get_semantic_scholar_id(source)
         if not paper_id:
             raise ValueError("Source has no Semantic Scholar ID, DOI, or arXiv ID")
         
-        async with SemanticScholarClient() as client:
-            try:
-                papers = await self._fetch_recommendations(client, paper_id, limit)
-                
-                return DiscoveryResult(
-                    source_id=source_id,
-                    source_title=source.get("title", "Unknown"),
-                    relation_type=RelationType.RELATED,
-                    papers=papers,
-                    total_available=len(papers),
-                )
-            except SemanticScholarError as e:
-                logger.error(f"Failed to get recommendations: {e.message}")
-                raise
+        try:
+            papers = await self._fetch_cached(
+                ("related", paper_id, limit, 0, fields),
+                lambda client: self._fetch_recommendations(
+                    client, paper_id, limit, fields
+                ),
+            )
+        except SemanticScholarError as e:
+            logger.error(f"Failed to get recommendations: {e.message}")
+            raise
+        
+        return DiscoveryResult(
+            source_id=source_id,
+            source_title=source.get("title", "Unknown"),
+            relation_type=RelationType.RELATED,
+            papers=papers,
+            total_available=len(papers),
+        )
     
     async def discover_all(
         self,
-        source_id: UUID,
+        source_id: UUID | str,
         limit_per_type: int = 5,
+        source: Optional[dict] = None,
+        fields: str = DISCOVERY_FIELDS,
     ) -> dict:
         """
         Get all discovery types for a source.
@@ -225,32 +412,44 @@ class DiscoveryService:
         Args:
             source_id: Source to explore.
             limit_per_type: Max papers per relation type.
+            source: Already-loaded source row (skips the lookup).
+            fields: Semantic Scholar fields to request per paper.
         
         Returns:
             Dict with all discovery results.
-        """
-        results = {}
         
-        try:
-            refs = await self.get_references(source_id, limit=limit_per_type)
-            results["references"] = refs.to_dict()
-        except Exception as e:
-            logger.warning(f"Failed to get references: {e}")
-            results["references"] = {"error": str(e)}
-        
-        try:
-            cites = await self.get_citations(source_id, limit=limit_per_type)
-            results["citations"] = cites.to_dict()
-        except Exception as e:
-            logger.warning(f"Failed to get citations: {e}")
-            results["citations"] = {"error": str(e)}
+        Raises:
+            SourceNotFoundError: If the source is not in this project.
+        """
+        if source is None:
+            source = self._require_source(source_id)
+        
+        # The three lookups are independent; run them concurrently and
+        # report each failure in place rather than failing the whole call
+        refs, cites, related = await asyncio.gather(
+            self.get_references(
+                source_id, limit=limit_per_type, source=source, fields=fields
+            ),
+            self.get_citations(
+                source_id, limit=limit_per_type, source=source, fields=fields
+            ),
+            self.get_related(
+                source_id, limit=limit_per_type, source=source, fields=fields
+            ),
+            return_exceptions=True,
+        )
         
-        try:
-            related = await self.get_related(source_id, limit=limit_per_type)
-            results["related"] = related.to_dict()
-        except Exception as e:
-            logger.warning(f"Failed to get related: {e}")
-            results["related"] = {"error": str(e)}
+        results = {}
+        for name, outcome in (
+            ("references", refs),
+            ("citations", cites),
+            ("related", related),
+        ):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Failed to get {name}: {outcome}")
+                results[name] = {"error": str(outcome)}
+            else:
+                results[name] = outcome.to_dict()
         
         return results
     
@@ -270,63 +469,168 @@ class DiscoveryService:
             limit_per_source: Max discoveries per source per type.
         
         Returns:
-            Dict mapping source_id to discovery results.
+            Dict mapping source_id to discovery results. ``truncated`` is
+            set (with a ``reason``) when the walk hit its call or time
+            budget and only covers the first sources.
+        """
+        budget = ExploreBudget()
+        discoveries = {
+            source_id: discovery
+            async for source_id, discovery in self.iter_project_graph(
+                limit_per_source=limit_per_source,
+                budget=budget,
+            )
+        }
+        
+        tree = {
+            "project_id": self.project_id,
+            "sources_explored": len(discoveries),
+            "discoveries": discoveries,
+            "truncated": budget.truncated is not None,
+        }
+        if budget.truncated:
+            tree["reason"] = budget.truncated
+        return tree
+    
+    async def iter_project_graph(
+        self,
+        limit_per_source: int = 5,
+        budget: Optional[ExploreBudget] = None,
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Yield (source_id, discovery) for each source in the project.
+        
+        Sources are explored concurrently but yielded in source order as
+        soon as each is ready, with papers already yielded for an earlier
+        source filtered out. Closing the iterator early cancels any
+        lookups still in flight. Papers carry only the compact TREE_FIELDS.
+        
+        Once the budget is out of Semantic Scholar calls, remaining lookups
+        fail fast and are reported as per-relation errors (cached results
+        are still served); once it is out of time, the walk stops.
+        budget.truncated says which limit was hit.
+        
+        Args:
+            limit_per_source: Max discoveries per source per type.
+            budget: Call/time budget (a default one if not given).
         """
+        if budget is None:
+            budget = ExploreBudget()
+        deadline = asyncio.get_running_loop().time() + budget.timeout
+
         # Get all sources in project
         result = self.db.table("source")\
-            .select("id, title, semantic_scholar_id, doi, arxiv_id")\
+            .select(_SOURCE_COLUMNS)\
             .eq("project_id", str(self.project_id))\
             .execute()
         
-        if not result.data:
-            return {"sources": [], "discoveries": {}}
+        # Skip sources without identifiers
+        sources = [
+            source for source in result.data or []
+            if self._get_semantic_scholar_id(source)
+        ]
+        
+        # Explore sources concurrently, bounded to stay near S2 rate limits
+        semaphore = asyncio.Semaphore(EXPLORE_CONCURRENCY)
+        
+        async def explore_source(source: dict) -> dict:
+            async with semaphore:
+                return await self.discover_all(
+                    source["id"],
+                    limit_per_type=limit_per_source,
+                    source=source,
+                    fields=TREE_FIELDS,
+                )
         
-        discoveries = {}
-        seen_papers = set()  # Track papers we've already seen
+        # Lookups made by these tasks charge the budget through the context
+        context = contextvars.copy_context()
+        context.run(_explore_budget.set, budget)
+        tasks = [
+            asyncio.create_task(explore_source(source), context=context)
+            for source in sources
+        ]
+        seen_papers: set[str] = set()  # Dedupe keys of papers already yielded
         
-        for source in result.data:
-            source_id = UUID(source["id"])
-            
-            # Skip sources without identifiers
-            if not self._get_semantic_scholar_id(source):
-                continue
-            
-            try:
-                discovery = await self.discover_all(source_id, limit_per_type=limit_per_source)
+        try:
+            # Deduplicate in source order so results stay deterministic
+            for source, task in zip(sources, tasks):
+                source_id = source["id"]
+                
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        discovery = await task
+                except TimeoutError:
+                    budget.truncated = "timeout"
+                    break
+                except Exception as e:
+                    logger.warning(f"Failed to discover for {source_id}: {e}")
+                    yield source_id, {"error": str(e)}
+                    continue
                 
-                # Filter out papers already in project
+                # Filter out papers already seen for an earlier source
                 for relation_type in ["references", "citations", "related"]:
                     if relation_type in discovery and "papers" in discovery[relation_type]:
-                        papers = discovery[relation_type]["papers"]
-                        discovery[relation_type]["papers"] = [
-                            p for p in papers
-                            if p.get("paper_id") not in seen_papers
-                        ]
-                        # Track seen papers
-                        for p in discovery[relation_type]["papers"]:
-                            seen_papers.add(p.get("paper_id"))
+                        discovery[relation_type]["papers"] = dedupe_papers(
+                            discovery[relation_type]["papers"], seen_papers
+                        )
                 
-                discoveries[str(source_id)] = discovery
-                
-            except Exception as e:
-                logger.warning(f"Failed to discover for {source_id}: {e}")
-                discoveries[str(source_id)] = {"error": str(e)}
+                yield source_id, discovery
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _require_source(self, source_id: UUID | str) -> dict:
+        """
+        Load a source in this project, doubling as the existence check.
         
-        return {
-            "project_id": str(self.project_id),
-            "sources_explored": len(discoveries),
-            "discoveries": discoveries,
-        }
+        Raises:
+            SourceNotFoundError: If the source is not in this project.
+        """
+        source = self._get_source(source_id)
+        if not source:
+            raise SourceNotFoundError(f"Source not found: {source_id}")
+        return source
     
-    def _get_source(self, source_id: UUID) -> Optional[dict]:
+    def _get_source(self, source_id: UUID | str) -> Optional[dict]:
         """Get source from database."""
         result = self.db.table("source")\
-            .select("*")\
+            .select(_SOURCE_COLUMNS)\
             .eq("id", str(source_id))\
             .eq("project_id", str(self.project_id))\
             .maybe_single()\
             .execute()
-        return result.data
+        # maybe_single() yields no response at all when nothing matches
+        return result.data if result else None
+    
+    async def _fetch_cached(
+        self,
+        key: tuple,
+        fetch: Callable[[SemanticScholarClient], Awaitable[Any]],
+    ) -> Any:
+        """
+        Return a cached Semantic Scholar result, fetching it on a miss.
+        
+        Misses go through the shared client, so a graph walk reuses one
+        connection pool. Results without papers are not cached, since the
+        API returns nothing on transient failures. Misses inside a graph
+        walk are charged to its ExploreBudget.
+        """
+        result = discovery_cache.get(key)
+        if result is not None:
+            return result
+        
+        budget = _explore_budget.get()
+        if budget is not None:
+            budget.spend()
+        
+        client = await init_semantic_scholar_client()
+        result = await fetch(client)
+        
+        # References and citations come back as (papers, total, next_offset)
+        papers = result[0] if isinstance(result, tuple) else result
+        if papers:
+            discovery_cache.set(key, result)
+        return result
     
     def _get_semantic_scholar_id(self, source: dict) -> Optional[str]:
         """Get the best identifier for Semantic Scholar lookup."""
@@ -344,13 +648,19 @@ class DiscoveryService:
         paper_id: str,
         limit: int,
         offset: int,
-    ) -> tuple[list[PaperSearchResult], int]:
-        """Fetch references from Semantic Scholar."""
+        fields: str,
+    ) -> tuple[list[PaperSearchResult], int, Optional[int]]:
+        """
+        Fetch references from Semantic Scholar.
+        
+        Returns:
+            Papers, total count, and S2's continuation position (None at the end).
+        """
         # Use the references endpoint
         response = await client._client.get(
             f"/paper/{paper_id}/references",
             params={
-                "fields": "paperId,externalIds,title,abstract,venue,year,authors,citationCount,isOpenAccess,openAccessPdf",
+                "fields": fields,
                 "limit": limit,
                 "offset": offset,
             },
@@ -368,7 +678,7 @@ class DiscoveryService:
                 papers.append(client._parse_paper(cited_paper))
         
         total = data.get("total", len(papers))
-        return papers, total
+        return papers, total, data.get("next")
     
     async def _fetch_citations(
         self,
@@ -376,12 +686,18 @@ class DiscoveryService:
         paper_id: str,
         limit: int,
         offset: int,
-    ) -> tuple[list[PaperSearchResult], int]:
-        """Fetch citations from Semantic Scholar."""
+        fields: str,
+    ) -> tuple[list[PaperSearchResult], int, Optional[int]]:
+        """
+        Fetch citations from Semantic Scholar.
+        
+        Returns:
+            Papers, total count, and S2's continuation position (None at the end).
+        """
         response = await client._client.get(
             f"/paper/{paper_id}/citations",
             params={
-                "fields": "paperId,externalIds,title,abstract,venue,year,authors,citationCount,isOpenAccess,openAccessPdf",
+                "fields": fields,
                 "limit": limit,
                 "offset": offset,
             },
@@ -399,19 +715,20 @@ class DiscoveryService:
                 papers.append(client._parse_paper(citing_paper))
         
         total = data.get("total", len(papers))
-        return papers, total
+        return papers, total, data.get("next")
     
     async def _fetch_recommendations(
         self,
         client: SemanticScholarClient,
         paper_id: str,
         limit: int,
+        fields: str,
     ) -> list[PaperSearchResult]:
         """Fetch recommendations from Semantic Scholar."""
         response = await client._client.get(
             f"/recommendations/v1/papers/forpaper/{paper_id}",
             params={
-                "fields": "paperId,externalIds,title,abstract,venue,year,authors,citationCount,isOpenAccess,openAccessPdf",
+                "fields": fields,
                 "limit": limit,
             },
         )
@@ -432,19 +749,19 @@ class DiscoveryService:
 
 
 # Convenience functions
-async def discover_references(project_id: UUID, source_id: UUID, limit: int = 20) -> DiscoveryResult:
+async def discover_references(project_id: UUID | str, source_id: UUID | str, limit: int = 20) -> DiscoveryResult:
     """Get papers referenced by a source."""
     service = DiscoveryService(project_id)
     return await service.get_references(source_id, limit)
 
 
-async def discover_citations(project_id: UUID, source_id: UUID, limit: int = 20) -> DiscoveryResult:
+async def discover_citations(project_id: UUID | str, source_id: UUID | str, limit: int = 20) -> DiscoveryResult:
     """Get papers that cite a source."""
     service = DiscoveryService(project_id)
     return await service.get_citations(source_id, limit)
 
 
-async def explore_knowledge_tree(project_id: UUID, depth: int = 1) -> dict:
+async def explore_knowledge_tree(project_id: UUID | str, depth: int = 1) -> dict:
     """Explore the citation graph for all project sources."""
     service = DiscoveryService(project_id)
     return await service.explore_project_graph(depth=depth)
@@ -17,6 +17,7 @@ from src.models.source import IngestionStatus
 from src.services.database import get_supabase_client
 from src.services.hyperion_client import HyperionClient, HyperionError
 from src.services.pdf_processor import PDFDownloader, PDFProcessorError
+from src.services.query_service import invalidate_query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -261,6 +262,7 @@ class IngestionService:
             })\
             .eq("id", str(source_id))\
             .execute()
+        invalidate_query_cache()
     
     async def delete_source_from_hyperion(self, source_id: UUID) -> bool:
         """
@@ -292,6 +294,7 @@ class IngestionService:
                 })\
                 .eq("id", str(source_id))\
                 .execute()
+            invalidate_query_cache()
         
         return result.success
 
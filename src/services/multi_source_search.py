@@ -9,7 +9,8 @@ Aggregates results from multiple academic paper APIs:
 - CORE (open access - requires API key)
 - Semantic Scholar (comprehensive - strict rate limits)
 
-Searches run in parallel with deduplication by DOI.
+Searches run in parallel with deduplication by DOI. Each source has its own
+timeout, so one slow API cannot hold up the results of the others.
 """
 
 import asyncio
@@ -85,6 +86,7 @@ class MultiSourceSearchService:
         core_api_key: Optional[str] = None,
         semantic_scholar_api_key: Optional[str] = None,
         email: Optional[str] = None,
+        source_timeout: float = 10.0,
     ):
         """
         Initialize multi-source search service.
@@ -93,10 +95,13 @@ class MultiSourceSearchService:
             core_api_key: Optional CORE API key for higher limits.
             semantic_scholar_api_key: Optional Semantic Scholar key.
             email: Email for polite pool access.
+            source_timeout: Seconds to wait for each source before giving
+                up on it and returning the other sources' results.
         """
         self.core_api_key = core_api_key
         self.semantic_scholar_api_key = semantic_scholar_api_key
         self.email = email or "academic-research-tool@example.com"
+        self.source_timeout = source_timeout
     
     async def search(
         self,
@@ -140,7 +145,8 @@ class MultiSourceSearchService:
                 year_from=year_from,
                 year_to=year_to,
             )
-            tasks.append(task)
+            # A source that is too slow is cancelled and reported in errors
+            tasks.append(asyncio.wait_for(task, self.source_timeout))
             source_names.append(source.value)
         
         # Run all searches in parallel
@@ -152,7 +158,11 @@ class MultiSourceSearchService:
         errors: dict[str, str] = {}
         
         for source_name, result in zip(source_names, results):
-            if isinstance(result, Exception):
+            if isinstance(result, TimeoutError):
+                logger.warning(f"Search timed out for {source_name}")
+                errors[source_name] = f"Timed out after {self.source_timeout:g}s"
+                source_counts[source_name] = 0
+            elif isinstance(result, Exception):
                 logger.warning(f"Search failed for {source_name}: {result}")
                 errors[source_name] = str(result)
                 source_counts[source_name] = 0
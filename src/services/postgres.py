@@ -0,0 +1,82 @@
+"""
+Direct Postgres connection pool.
+
+Optional fast path for hot read endpoints. Queries go straight to Postgres
+over asyncpg's binary protocol, with prepared statements cached per
+connection, instead of through the PostgREST HTTP layer.
+
+The pool is only created when ``DATABASE_URL`` is set and asyncpg is
+installed. Otherwise ``get_pg_pool()`` returns None and callers fall back to
+the Supabase client. Use a direct or session-mode connection string; the
+transaction-mode pooler does not support prepared statements.
+"""
+
+import logging
+from typing import Any, Optional
+
+import orjson
+
+from src.config import get_settings
+
+try:
+    import asyncpg
+except ImportError:  # optional dependency
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+PgPool = Any
+PgConnection = Any
+
+_pool: Optional[PgPool] = None
+
+
+async def _init_connection(conn: PgConnection) -> None:
+    """Decode json/jsonb columns to Python objects, as PostgREST would."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=lambda value: orjson.dumps(value).decode(),
+            decoder=orjson.loads,
+            schema="pg_catalog",
+        )
+
+
+async def init_pg_pool() -> Optional[PgPool]:
+    """
+    Create the shared connection pool (called on startup).
+
+    Returns:
+        The pool, or None if the fast path is not configured.
+    """
+    global _pool
+    settings = get_settings()
+    if _pool is not None or not settings.database_url:
+        return _pool
+    if asyncpg is None:
+        logger.warning("DATABASE_URL is set but asyncpg is not installed")
+        return None
+
+    _pool = await asyncpg.create_pool(
+        settings.database_url,
+        min_size=settings.pg_pool_min_size,
+        max_size=settings.pg_pool_max_size,
+        max_inactive_connection_lifetime=300,
+        statement_cache_size=256,
+        init=_init_connection,
+    )
+    logger.info("Postgres pool created")
+    return _pool
+
+
+def get_pg_pool() -> Optional[PgPool]:
+    """Get the shared connection pool, or None if it is not configured."""
+    return _pool
+
+
+async def close_pg_pool() -> None:
+    """Close the shared connection pool (called on shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
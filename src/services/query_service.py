@@ -10,6 +10,8 @@ import time
 from typing import Optional
 from uuid import UUID
 
+import orjson
+
 from src.config import get_settings
 from src.models.hyperion import ChunkReference as HyperionChunk
 from src.models.research import (
@@ -19,11 +21,43 @@ from src.models.research import (
     QueryResponse,
     SourceReference,
 )
+from src.services.cache import TTLCache
 from src.services.database import get_supabase_client
 from src.services.hyperion_client import HyperionClient, HyperionError
 
 logger = logging.getLogger(__name__)
 
+# Answers to repeated queries. The RAG round trip (retrieval + synthesis)
+# dominates query latency, so re-running a query within the TTL is served
+# from memory. Entries are dropped whenever a paper finishes ingesting or
+# is removed from the index. The cache is per worker: other workers keep
+# their entries until they make the same change or the TTL runs out.
+QUERY_CACHE_TTL_SECONDS = 300
+query_cache = TTLCache(ttl=QUERY_CACHE_TTL_SECONDS, maxsize=512)
+
+
+def query_cache_key(project_id: UUID | str, request: QueryRequest) -> tuple:
+    """
+    Cache key for a query: project, query text with case and whitespace
+    normalized, and every other request option.
+    """
+    options = request.model_dump(mode="json", exclude={"query"})
+    return (
+        str(project_id),
+        " ".join(request.query.casefold().split()),
+        orjson.dumps(options, option=orjson.OPT_SORT_KEYS),
+    )
+
+
+def invalidate_query_cache() -> None:
+    """
+    Drop this worker's cached answers.
+    
+    Called when the RAG index gains or loses a paper. Only the calling
+    worker's cache is cleared; other workers expire theirs by TTL.
+    """
+    query_cache.clear()
+
 
 class QueryError(Exception):
     """Query service error."""
@@ -49,7 +83,7 @@ class QueryService:
         result = await service.query("What methods are used for X?")
     """
     
-    def __init__(self, project_id: UUID):
+    def __init__(self, project_id: UUID | str):
         """
         Initialize query service.
         
@@ -58,6 +92,9 @@ class QueryService:
         """
         self.project_id = project_id
         self.db = get_supabase_client()
+        # Project sources and prefix lookups, loaded once per service
+        self._sources: Optional[list[dict]] = None
+        self._sources_by_prefix: dict[str, Optional[dict]] = {}
     
     async def query(self, request: QueryRequest) -> QueryResponse:
         """
@@ -71,6 +108,14 @@ class QueryService:
         """
         start_time = time.time()
         
+        cache_key = query_cache_key(self.project_id, request)
+        cached = query_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy(update={
+                "query": request.query,
+                "processing_time_ms": int((time.time() - start_time) * 1000),
+            })
+        
         try:
             # Build query for Hyperion
             hyperion_query = self._build_hyperion_query(request)
@@ -99,7 +144,7 @@ class QueryService:
             
             processing_time = int((time.time() - start_time) * 1000)
             
-            return QueryResponse(
+            response = QueryResponse(
                 query=request.query,
                 answer=answer,
                 sources=formatted_sources,
@@ -107,6 +152,8 @@ class QueryService:
                 processing_time_ms=processing_time,
                 formatted_references=references,
             )
+            query_cache.set(cache_key, response)
+            return response
             
         except HyperionError as e:
             logger.error(f"Hyperion query failed: {e.message}")
@@ -185,23 +232,34 @@ class QueryService:
         return sources
     
     async def _lookup_source(self, source_id_prefix: str) -> Optional[dict]:
-        """Look up source by ID prefix."""
-        try:
-            # Query for sources where ID starts with prefix
-            result = self.db.table("source")\
-                .select("id, title, authors, publication_year, doi")\
-                .eq("project_id", str(self.project_id))\
-                .execute()
-            
-            # Find matching source
-            for source in result.data:
-                if str(source["id"]).startswith(source_id_prefix):
-                    return source
-            
-            return None
-        except Exception as e:
-            logger.warning(f"Source lookup failed: {e}")
-            return None
+        """
+        Look up source by ID prefix.
+        
+        The project's sources are fetched on the first lookup and each
+        prefix is resolved once, so a response citing many chunks costs a
+        single query.
+        """
+        if source_id_prefix in self._sources_by_prefix:
+            return self._sources_by_prefix[source_id_prefix]
+        
+        if self._sources is None:
+            try:
+                result = self.db.table("source")\
+                    .select("id, title, authors, publication_year, doi")\
+                    .eq("project_id", str(self.project_id))\
+                    .execute()
+            except Exception as e:
+                logger.warning(f"Source lookup failed: {e}")
+                return None
+            self._sources = result.data or []
+        
+        # Find the source whose ID starts with the prefix
+        match = next(
+            (s for s in self._sources if str(s["id"]).startswith(source_id_prefix)),
+            None,
+        )
+        self._sources_by_prefix[source_id_prefix] = match
+        return match
     
     def _extract_author_names(self, authors: list) -> list[str]:
         """Extract author names from various formats."""
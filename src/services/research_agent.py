@@ -10,6 +10,7 @@ Orchestrates the research process:
 6. Chat-driven interface for natural language control
 """
 
+import asyncio
 import logging
 from typing import Optional
 from uuid import UUID, uuid4
@@ -53,10 +54,24 @@ from src.services.database import get_supabase_client
 from src.services.hyperion_client import HyperionClient
 from src.services.intent_parser import Intent, parse_intent
 from src.services.openalex import OpenAlexClient, OpenAlexPaper
+from src.services.query_service import invalidate_query_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_authors(authors: Optional[list]) -> list[dict]:
+    """
+    Coerce authors to the stored shape: [{"name": ...}, ...].
+    
+    Search providers return either dicts or bare name strings; readers of
+    source.authors rely on every element being a dict with a name.
+    """
+    return [
+        ({"name": "Unknown", **a} if isinstance(a, dict) else {"name": str(a)})
+        for a in (authors or [])
+    ]
+
+
 class ResearchAgentError(Exception):
     """Research agent error."""
     
@@ -85,7 +100,7 @@ class ResearchAgent:
     
     def __init__(
         self,
-        project_id: UUID,
+        project_id: UUID | str,
         session_id: Optional[UUID] = None,
         auto_ingest: bool = True,
     ):
@@ -93,13 +108,15 @@ class ResearchAgent:
         Initialize research agent.
         
         Args:
-            project_id: Project to research for.
+            project_id: Project to research for (UUID or its string form).
             session_id: Existing session to continue (optional).
             auto_ingest: Whether to automatically ingest papers with PDFs.
         """
         self.project_id = project_id
         self.session_id = session_id
         self.auto_ingest = auto_ingest
+        # Loaded by get_session(); cleared when this agent changes the session
+        self._session: Optional[ResearchSession] = None
         self.db = get_supabase_client()
         self.settings = get_settings()
     
@@ -130,6 +147,7 @@ class ResearchAgent:
         
         session = ResearchSession(**result.data[0])
         self.session_id = session.id
+        self._session = session
         
         # Log the action
         await self._log_action(
@@ -143,9 +161,18 @@ class ResearchAgent:
         return session
     
     async def get_session(self) -> Optional[ResearchSession]:
-        """Get current session."""
+        """
+        Get current session.
+        
+        The session is loaded once and kept on the agent, so the routes'
+        session check and the agent's own calls share a single read.
+        """
+        if self._session is not None:
+            return self._session
+        
         if not self.session_id:
             # Try to get the latest session for the project
+            # (idx_research_session_project_created)
             result = self.db.table("research_session")\
                 .select("*")\
                 .eq("project_id", str(self.project_id))\
@@ -156,6 +183,7 @@ class ResearchAgent:
             if result.data:
                 session = ResearchSession(**result.data[0])
                 self.session_id = session.id
+                self._session = session
                 return session
             return None
         
@@ -165,7 +193,8 @@ class ResearchAgent:
             .execute()
         
         if result.data:
-            return ResearchSession(**result.data[0])
+            self._session = ResearchSession(**result.data[0])
+            return self._session
         return None
     
     # ========================================================================
@@ -257,8 +286,11 @@ class ResearchAgent:
         if existing_nodes.data and existing_nodes.data[0].get("display_index"):
             next_index = existing_nodes.data[0]["display_index"] + 1
         
-        for paper in relevant_papers[:request.max_papers]:
-            try:
+        selected_papers = relevant_papers[:request.max_papers]
+        semaphore = asyncio.Semaphore(self.settings.explore_paper_concurrency)
+        
+        async def add_source(paper: dict) -> UUID:
+            async with semaphore:
                 logger.info(f"Processing paper: {paper.get('title', 'Unknown')[:50]}...")
                 
                 # Create source in database
@@ -268,8 +300,28 @@ class ResearchAgent:
                 # Ingest into RAG if auto_ingest enabled
                 if request.auto_ingest and paper.get("pdf_url"):
                     await self._ingest_paper(source_id, paper)
-                    ingested_count += 1
-                
+                return source_id
+        
+        # Papers are classified, downloaded and ingested concurrently; their
+        # knowledge nodes are then created in order so display indexes stay
+        # sequential
+        source_ids = await asyncio.gather(
+            *(add_source(paper) for paper in selected_papers),
+            return_exceptions=True,
+        )
+        
+        for paper, source_id in zip(selected_papers, source_ids):
+            if isinstance(source_id, BaseException):
+                logger.error(
+                    f"Failed to process paper '{paper.get('title', 'Unknown')[:50]}': {source_id}",
+                    exc_info=source_id,
+                )
+                continue
+            
+            if request.auto_ingest and paper.get("pdf_url"):
+                ingested_count += 1
+            
+            try:
                 # Create knowledge node with display_index
                 node = await self._create_knowledge_node(
                     node_type=NodeType.SOURCE,
@@ -288,10 +340,10 @@ class ResearchAgent:
                 continue
         
         # 4. Generate summaries of findings
-        summaries = await self._generate_summaries(relevant_papers[:request.max_papers])
+        summaries = await self._generate_summaries(selected_papers)
         
         # 5. Identify subtopics for deeper exploration
-        subtopics = await self._identify_subtopics(relevant_papers[:request.max_papers], topic)
+        subtopics = await self._identify_subtopics(selected_papers, topic)
         
         # Log the action
         log_id = await self._log_action(
@@ -521,6 +573,7 @@ class ResearchAgent:
             .update({"status": SessionStatus.DRAFTING.value})\
             .eq("id", str(self.session_id))\
             .execute()
+        self._session = None
         
         # Log the action
         await self._log_action(
@@ -1396,7 +1449,7 @@ class ResearchAgent:
         data = {
             "project_id": str(self.project_id),
             "title": paper.get("title", "Unknown"),
-            "authors": paper.get("authors", []),
+            "authors": _normalize_authors(paper.get("authors")),
             "abstract": paper.get("abstract"),
             "publication_year": paper.get("year"),
             "doi": paper.get("doi"),
@@ -1442,6 +1495,7 @@ class ResearchAgent:
                             .update({"ingestion_status": "ready"})\
                             .eq("id", str(source_id))\
                             .execute()
+                        invalidate_query_cache()
                         
                         # Mark the knowledge node as ingested
                         # This moves the paper from Explore to Library/Tree
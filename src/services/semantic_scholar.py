@@ -86,6 +86,7 @@ class SemanticScholarClient:
             base_url=BASE_URL,
             headers=headers,
             timeout=self.timeout,
+            http2=True,
         )
         return self
     
@@ -388,3 +389,27 @@ async def search_papers(
     async with SemanticScholarClient() as client:
         return await client.search(query, limit=limit, **kwargs)
 
+
+# Shared client, opened on startup so requests reuse one connection pool
+_shared_client: Optional[SemanticScholarClient] = None
+
+
+async def init_semantic_scholar_client() -> SemanticScholarClient:
+    """
+    Open the shared client (called on startup, or on first use).
+    
+    Returns:
+        The process-wide SemanticScholarClient.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = await SemanticScholarClient().__aenter__()
+    return _shared_client
+
+
+async def close_semantic_scholar_client() -> None:
+    """Close the shared client (called on shutdown)."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.__aexit__(None, None, None)
+        _shared_client = None
@@ -0,0 +1,27 @@
+-- Migration: 007_normalize_source_authors
+-- Description: Store source.authors in one canonical shape
+--
+-- Older rows may hold bare author strings ("Jane Smith") or objects without
+-- a name. Readers assume every element is an object with a "name" key, so
+-- rewrite the remaining rows once instead of branching on type per author.
+
+UPDATE source
+SET authors = (
+    SELECT COALESCE(
+        jsonb_agg(
+            CASE
+                WHEN jsonb_typeof(elem) = 'object' AND elem ? 'name' THEN elem
+                WHEN jsonb_typeof(elem) = 'object' THEN elem || '{"name": "Unknown"}'::jsonb
+                ELSE jsonb_build_object('name', elem #>> '{}')
+            END
+            ORDER BY ord
+        ),
+        '[]'::jsonb
+    )
+    FROM jsonb_array_elements(authors) WITH ORDINALITY AS a(elem, ord)
+)
+WHERE EXISTS (
+    SELECT 1
+    FROM jsonb_array_elements(authors) AS a(elem)
+    WHERE jsonb_typeof(elem) <> 'object' OR NOT elem ? 'name'
+);
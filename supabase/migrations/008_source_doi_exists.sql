@@ -0,0 +1,15 @@
+-- Migration: 008_source_doi_exists
+-- Description: Cheap duplicate-DOI check when adding a source
+--
+-- Adding a paper checks whether the project already has that DOI. Answer it
+-- with an EXISTS and return a bare boolean instead of selecting and
+-- serializing a row. The lookup is served by the index behind the
+-- unique_doi_per_project (project_id, doi) constraint.
+
+CREATE OR REPLACE FUNCTION source_doi_exists(pid UUID, source_doi TEXT)
+RETURNS BOOLEAN AS $$
+    SELECT EXISTS (
+        SELECT 1 FROM source
+        WHERE project_id = pid AND doi = source_doi
+    );
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,66 @@
+-- Migration: 009_outline_rpcs
+-- Description: Single round-trip outline reads and section creation
+--
+-- The outline endpoints used to check that the project exists and then run
+-- the real query. These functions do both in one call.
+
+-- Outline sections for a project, plus whether the project exists
+CREATE OR REPLACE FUNCTION get_project_outline(p_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'project_exists', EXISTS (SELECT 1 FROM project WHERE id = p_id),
+        'sections', COALESCE(
+            (
+                SELECT jsonb_agg(s ORDER BY s.order_index)
+                FROM outline_section s
+                WHERE s.project_id = p_id
+            ),
+            '[]'::jsonb
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Insert a section, appending it after its siblings when no order_index is
+-- given. Returns the new row, or NULL if the project does not exist.
+CREATE OR REPLACE FUNCTION create_outline_section(
+    p_id UUID,
+    p_title TEXT,
+    p_section_type TEXT DEFAULT 'custom',
+    p_parent_id UUID DEFAULT NULL,
+    p_questions JSONB DEFAULT '[]'::jsonb,
+    p_notes TEXT DEFAULT NULL,
+    p_order_index INTEGER DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    created outline_section;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM project WHERE id = p_id) THEN
+        RETURN NULL;
+    END IF;
+    
+    IF p_order_index IS NULL THEN
+        SELECT COALESCE(MAX(order_index) + 1, 0)
+        INTO p_order_index
+        FROM outline_section
+        WHERE project_id = p_id
+          AND parent_id IS NOT DISTINCT FROM p_parent_id;
+    END IF;
+    
+    INSERT INTO outline_section (
+        project_id, parent_id, title, section_type, questions, notes, order_index
+    )
+    VALUES (
+        p_id,
+        p_parent_id,
+        p_title,
+        p_section_type::section_type,
+        COALESCE(p_questions, '[]'::jsonb),
+        p_notes,
+        p_order_index
+    )
+    RETURNING * INTO created;
+    
+    RETURN to_jsonb(created);
+END;
+$$ LANGUAGE plpgsql;
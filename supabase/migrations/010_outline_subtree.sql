@@ -0,0 +1,44 @@
+-- Migration: 010_outline_subtree
+-- Description: Server-side traversal for partial outline fetches
+--
+-- Returns one section (or all root sections) and its descendants, up to
+-- max_depth levels below it, in tree order. Each row carries its depth and
+-- the order_index path from the subtree root.
+
+CREATE OR REPLACE FUNCTION outline_subtree(
+    p_id UUID,
+    root UUID DEFAULT NULL,
+    max_depth INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    project_id UUID,
+    parent_id UUID,
+    title TEXT,
+    section_type section_type,
+    questions JSONB,
+    notes TEXT,
+    order_index INTEGER,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    depth INTEGER,
+    tree_path INTEGER[]
+) AS $$
+    WITH RECURSIVE t AS (
+        SELECT s.*, 0 AS depth, ARRAY[s.order_index] AS tree_path
+        FROM outline_section s
+        WHERE s.project_id = p_id
+          AND ((root IS NULL AND s.parent_id IS NULL) OR s.id = root)
+        UNION ALL
+        SELECT c.*, t.depth + 1, t.tree_path || c.order_index
+        FROM outline_section c
+        JOIN t ON c.parent_id = t.id
+        WHERE max_depth IS NULL OR t.depth < max_depth
+    )
+    SELECT
+        t.id, t.project_id, t.parent_id, t.title, t.section_type,
+        t.questions, t.notes, t.order_index, t.created_at, t.updated_at,
+        t.depth, t.tree_path
+    FROM t
+    ORDER BY t.tree_path;
+$$ LANGUAGE sql STABLE;
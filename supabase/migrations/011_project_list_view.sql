@@ -0,0 +1,19 @@
+-- Migration: 011_project_list_view
+-- Description: Project rows with source and outline section counts
+--
+-- The project list needs per-project counts. Selecting from this view gets
+-- them in the same query instead of one COUNT per project. The counts are
+-- correlated subqueries, so only the rows of the requested page are counted,
+-- using idx_source_project and idx_outline_project.
+
+CREATE OR REPLACE VIEW project_list_v
+WITH (security_invoker = true) AS
+SELECT
+    p.*,
+    (SELECT count(*) FROM source s WHERE s.project_id = p.id)::INTEGER
+        AS source_count,
+    (SELECT count(*) FROM outline_section o WHERE o.project_id = p.id)::INTEGER
+        AS outline_section_count
+FROM project p;
+
+COMMENT ON VIEW project_list_v IS 'Projects with source/outline counts for the project list';
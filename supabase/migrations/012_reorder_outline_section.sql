@@ -0,0 +1,36 @@
+-- Migration: 012_reorder_outline_section
+-- Description: Move an outline section and return the updated outline
+--
+-- Reordering used to update the section and then re-read the outline in
+-- separate requests. This does both in one call and one transaction.
+-- (A single statement with the UPDATE in a CTE would not see its own
+-- changes, so this is plpgsql.)
+
+CREATE OR REPLACE FUNCTION reorder_and_return_tree(
+    p_id UUID,
+    p_section_id UUID,
+    p_new_parent_id UUID,
+    p_new_order_index INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    UPDATE outline_section
+    SET parent_id = p_new_parent_id,
+        order_index = p_new_order_index
+    WHERE id = p_section_id AND project_id = p_id;
+    
+    -- NULL tells the caller the section was not found
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    
+    RETURN COALESCE(
+        (
+            SELECT jsonb_agg(s ORDER BY s.order_index)
+            FROM outline_section s
+            WHERE s.project_id = p_id
+        ),
+        '[]'::jsonb
+    );
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,36 @@
+-- Migration: 013_report_bundle
+-- Description: Fetch report inputs in a single round-trip
+--
+-- Report generation needs the project's outline and its ingested sources.
+-- This returns both as one JSON object instead of two separate queries.
+
+CREATE OR REPLACE FUNCTION get_report_bundle(p_id UUID)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'sections', COALESCE(
+            (
+                SELECT jsonb_agg(o ORDER BY o.order_index)
+                FROM outline_section o
+                WHERE o.project_id = p_id
+            ),
+            '[]'::jsonb
+        ),
+        'sources', COALESCE(
+            (
+                SELECT jsonb_agg(jsonb_build_object(
+                    'id', s.id,
+                    'title', s.title,
+                    'authors', s.authors,
+                    'publication_year', s.publication_year,
+                    'doi', s.doi,
+                    'arxiv_id', s.arxiv_id,
+                    'abstract', s.abstract
+                ))
+                FROM source s
+                WHERE s.project_id = p_id
+                  AND s.ingestion_status = 'ready'
+            ),
+            '[]'::jsonb
+        )
+    );
+$$ LANGUAGE sql STABLE;
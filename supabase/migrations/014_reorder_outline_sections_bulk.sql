@@ -0,0 +1,46 @@
+-- Migration: 014_reorder_outline_sections_bulk
+-- Description: Apply many outline moves in one call
+--
+-- Drag-to-reorder renumbers every sibling in a list. This applies all of the
+-- moves in a single UPDATE (one transaction) and returns the updated
+-- outline, like reorder_and_return_tree does for a single move.
+--
+-- p_moves is a JSON array of
+--   {"section_id": uuid, "new_parent_id": uuid | null, "new_order_index": int}
+
+CREATE OR REPLACE FUNCTION reorder_sections_bulk(p_id UUID, p_moves JSONB)
+RETURNS JSONB AS $$
+BEGIN
+    -- NULL tells the caller that a section was not found; nothing is moved
+    IF (
+        SELECT count(*)
+        FROM outline_section
+        WHERE project_id = p_id
+          AND id IN (
+              SELECT (m->>'section_id')::uuid
+              FROM jsonb_array_elements(p_moves) AS m
+          )
+    ) <> (
+        SELECT count(DISTINCT m->>'section_id')
+        FROM jsonb_array_elements(p_moves) AS m
+    ) THEN
+        RETURN NULL;
+    END IF;
+    
+    UPDATE outline_section o
+    SET parent_id = v.new_parent_id,
+        order_index = v.new_order_index
+    FROM jsonb_to_recordset(p_moves)
+        AS v(section_id UUID, new_parent_id UUID, new_order_index INTEGER)
+    WHERE o.id = v.section_id AND o.project_id = p_id;
+    
+    RETURN COALESCE(
+        (
+            SELECT jsonb_agg(s ORDER BY s.order_index)
+            FROM outline_section s
+            WHERE s.project_id = p_id
+        ),
+        '[]'::jsonb
+    );
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,59 @@
+-- Migration: 015_create_outline_section_atomic
+-- Description: Append outline sections without racing on order_index
+--
+-- create_outline_section computed MAX(order_index) + 1 in one statement
+-- and inserted in another. Two concurrent appends to the same parent could
+-- read the same maximum and get the same order_index. The next index is
+-- now computed inside the INSERT, and appends for a project are serialized
+-- with a transaction-scoped advisory lock.
+--
+-- A unique (project_id, parent_id, order_index) index is not added:
+-- reorder_and_return_tree moves a section to an index that a sibling may
+-- already hold, so duplicates are legitimate there.
+
+CREATE OR REPLACE FUNCTION create_outline_section(
+    p_id UUID,
+    p_title TEXT,
+    p_section_type TEXT DEFAULT 'custom',
+    p_parent_id UUID DEFAULT NULL,
+    p_questions JSONB DEFAULT '[]'::jsonb,
+    p_notes TEXT DEFAULT NULL,
+    p_order_index INTEGER DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    created outline_section;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM project WHERE id = p_id) THEN
+        RETURN NULL;
+    END IF;
+    
+    IF p_order_index IS NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext('outline_section:' || p_id::text));
+    END IF;
+    
+    INSERT INTO outline_section (
+        project_id, parent_id, title, section_type, questions, notes, order_index
+    )
+    VALUES (
+        p_id,
+        p_parent_id,
+        p_title,
+        p_section_type::section_type,
+        COALESCE(p_questions, '[]'::jsonb),
+        p_notes,
+        COALESCE(
+            p_order_index,
+            (
+                SELECT COALESCE(MAX(order_index) + 1, 0)
+                FROM outline_section
+                WHERE project_id = p_id
+                  AND parent_id IS NOT DISTINCT FROM p_parent_id
+            )
+        )
+    )
+    RETURNING * INTO created;
+    
+    RETURN to_jsonb(created);
+END;
+$$ LANGUAGE plpgsql;
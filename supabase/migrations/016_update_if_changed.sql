@@ -0,0 +1,74 @@
+-- Migration: 016_update_if_changed
+-- Description: Skip no-op project and outline section updates
+--
+-- Re-saving an unchanged form used to rewrite the row anyway, firing the
+-- updated_at trigger (which also invalidates cached outlines). These apply
+-- a partial update only when it changes something, in one round trip.
+--
+-- p_changes holds the fields to set, keyed by column name. The result is
+-- {"changed": bool, "row": <row after the call>}, or NULL if the row does
+-- not exist.
+
+CREATE OR REPLACE FUNCTION update_project_if_changed(p_id UUID, p_changes JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    current project;
+    updated project;
+BEGIN
+    SELECT * INTO current FROM project WHERE id = p_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    
+    updated := jsonb_populate_record(current, p_changes);
+    IF updated IS NOT DISTINCT FROM current THEN
+        RETURN jsonb_build_object('changed', false, 'row', to_jsonb(current));
+    END IF;
+    
+    UPDATE project
+    SET title = updated.title,
+        description = updated.description,
+        status = updated.status
+    WHERE id = p_id
+    RETURNING * INTO updated;
+    
+    RETURN jsonb_build_object('changed', true, 'row', to_jsonb(updated));
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_outline_section_if_changed(
+    p_id UUID,
+    p_section_id UUID,
+    p_changes JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    current outline_section;
+    updated outline_section;
+BEGIN
+    SELECT * INTO current
+    FROM outline_section
+    WHERE id = p_section_id AND project_id = p_id
+    FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    
+    updated := jsonb_populate_record(current, p_changes);
+    IF updated IS NOT DISTINCT FROM current THEN
+        RETURN jsonb_build_object('changed', false, 'row', to_jsonb(current));
+    END IF;
+    
+    UPDATE outline_section
+    SET title = updated.title,
+        section_type = updated.section_type,
+        parent_id = updated.parent_id,
+        questions = updated.questions,
+        notes = updated.notes,
+        order_index = updated.order_index
+    WHERE id = p_section_id
+    RETURNING * INTO updated;
+    
+    RETURN jsonb_build_object('changed', true, 'row', to_jsonb(updated));
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,117 @@
+-- Migration: 017_project_scoped_writes
+-- Description: Project-scoped research writes in one round trip
+--
+-- Knowledge nodes and outline claims were updated/deleted by id alone, so
+-- the project in the URL was never checked, and updating the research
+-- session needed a read before the write. Each function below checks that
+-- the row belongs to the project and applies the write in the same call.
+--
+-- Update functions take p_changes keyed by column name and return the
+-- updated row, or NULL if no matching row belongs to the project.
+
+CREATE OR REPLACE FUNCTION update_latest_research_session(p_id UUID, p_changes JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    current research_session;
+    updated research_session;
+BEGIN
+    SELECT * INTO current
+    FROM research_session
+    WHERE project_id = p_id
+    ORDER BY created_at DESC
+    LIMIT 1
+    FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    
+    IF p_changes = '{}'::jsonb THEN
+        RETURN to_jsonb(current);
+    END IF;
+    
+    updated := jsonb_populate_record(current, p_changes);
+    UPDATE research_session
+    SET topic = updated.topic,
+        status = updated.status,
+        guidance_notes = updated.guidance_notes
+    WHERE id = current.id
+    RETURNING * INTO updated;
+    
+    RETURN to_jsonb(updated);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_knowledge_node_in_project(
+    p_id UUID,
+    p_node_id UUID,
+    p_changes JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    current knowledge_node;
+    updated knowledge_node;
+BEGIN
+    SELECT n.* INTO current
+    FROM knowledge_node n
+    JOIN research_session s ON s.id = n.session_id
+    WHERE n.id = p_node_id AND s.project_id = p_id
+    FOR UPDATE OF n;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    
+    updated := jsonb_populate_record(current, p_changes);
+    UPDATE knowledge_node
+    SET title = updated.title,
+        content = updated.content,
+        user_rating = updated.user_rating,
+        user_note = updated.user_note,
+        is_hidden = updated.is_hidden
+    WHERE id = p_node_id
+    RETURNING * INTO updated;
+    
+    RETURN to_jsonb(updated);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Returns the deleted node's id, or NULL if it is not in the project
+CREATE OR REPLACE FUNCTION delete_knowledge_node_in_project(p_id UUID, p_node_id UUID)
+RETURNS UUID AS $$
+    DELETE FROM knowledge_node n
+    USING research_session s
+    WHERE n.id = p_node_id
+      AND s.id = n.session_id
+      AND s.project_id = p_id
+    RETURNING n.id;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION update_claim_in_project(
+    p_id UUID,
+    p_claim_id UUID,
+    p_changes JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    current outline_claim;
+    updated outline_claim;
+BEGIN
+    SELECT c.* INTO current
+    FROM outline_claim c
+    JOIN outline_section o ON o.id = c.section_id
+    WHERE c.id = p_claim_id AND o.project_id = p_id
+    FOR UPDATE OF c;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    
+    updated := jsonb_populate_record(current, p_changes);
+    UPDATE outline_claim
+    SET claim_text = updated.claim_text,
+        user_critique = updated.user_critique,
+        status = updated.status
+    WHERE id = p_claim_id
+    RETURNING * INTO updated;
+    
+    RETURN to_jsonb(updated);
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,21 @@
+-- Migration: 018_synthesis_list_view
+-- Description: Synthesis rows trimmed for the synthesis list
+--
+-- The synthesis list shows a 200-character preview of each answer and the
+-- number of sources. Selecting from this view computes both in Postgres, so
+-- full answers and source arrays are not sent for every row of the page.
+
+CREATE OR REPLACE VIEW synthesis_list_v
+WITH (security_invoker = true) AS
+SELECT
+    s.id,
+    s.project_id,
+    s.outline_section_id,
+    s.query,
+    COALESCE(left(s.answer, 200), '') AS answer_preview,
+    COALESCE(jsonb_array_length(s.sources), 0)::INTEGER AS source_count,
+    COALESCE(s.is_pinned, false) AS is_pinned,
+    s.created_at
+FROM synthesis s;
+
+COMMENT ON VIEW synthesis_list_v IS 'Syntheses with answer preview and source count for list views';
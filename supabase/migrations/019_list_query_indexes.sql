@@ -0,0 +1,31 @@
+-- Migration: 019_list_query_indexes
+-- Description: Composite indexes for "latest rows of a project" queries
+--
+-- Synthesis lists, the latest report and the latest research session all
+-- filter by project_id, order by created_at DESC and take a page. With an
+-- index on project_id alone every row of the project is read and sorted;
+-- with (project_id, created_at DESC) the page is read straight off the
+-- index. Claims are read per section in order_index order.
+--
+-- Each composite index starts with the column of the single-column index it
+-- replaces, so those are dropped.
+
+CREATE INDEX IF NOT EXISTS idx_synthesis_project_created
+    ON synthesis(project_id, created_at DESC);
+DROP INDEX IF EXISTS idx_synthesis_project;
+
+CREATE INDEX IF NOT EXISTS idx_synthesis_project_section
+    ON synthesis(project_id, outline_section_id, created_at DESC)
+    WHERE outline_section_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_report_project_created
+    ON report(project_id, created_at DESC);
+DROP INDEX IF EXISTS idx_report_project_id;
+
+CREATE INDEX IF NOT EXISTS idx_research_session_project_created
+    ON research_session(project_id, created_at DESC);
+DROP INDEX IF EXISTS idx_research_session_project;
+
+CREATE INDEX IF NOT EXISTS idx_outline_claim_section_order
+    ON outline_claim(section_id, order_index);
+DROP INDEX IF EXISTS idx_outline_claim_section;
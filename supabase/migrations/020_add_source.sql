@@ -0,0 +1,45 @@
+-- Migration: 020_add_source
+-- Description: Add a source to a project in one round trip
+--
+-- Adding a paper checked that the project exists, checked for a duplicate
+-- DOI, then inserted: three round trips. This function does all three. The
+-- duplicate check relies on the unique_doi_per_project constraint, so two
+-- concurrent adds of the same DOI cannot both succeed.
+--
+-- Returns {"status": "created", "row": {...}}, {"status": "duplicate"} or
+-- {"status": "project_not_found"}.
+--
+-- source_doi_exists (008) has no callers left and is dropped.
+
+CREATE OR REPLACE FUNCTION add_source(p_id UUID, p_source JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    created source;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM project WHERE id = p_id) THEN
+        RETURN jsonb_build_object('status', 'project_not_found');
+    END IF;
+    
+    INSERT INTO source (
+        project_id, doi, arxiv_id, semantic_scholar_id, title, authors,
+        abstract, publication_year, journal, pdf_url, keywords, ingestion_status
+    )
+    SELECT
+        p_id, r.doi, r.arxiv_id, r.semantic_scholar_id, r.title,
+        COALESCE(r.authors, '[]'::jsonb),
+        r.abstract, r.publication_year, r.journal, r.pdf_url,
+        COALESCE(r.keywords, '[]'::jsonb),
+        COALESCE(r.ingestion_status, 'pending')
+    FROM jsonb_populate_record(NULL::source, p_source) r
+    ON CONFLICT ON CONSTRAINT unique_doi_per_project DO NOTHING
+    RETURNING * INTO created;
+    
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'duplicate');
+    END IF;
+    
+    RETURN jsonb_build_object('status', 'created', 'row', to_jsonb(created));
+END;
+$$ LANGUAGE plpgsql;
+
+DROP FUNCTION IF EXISTS source_doi_exists(UUID, TEXT);
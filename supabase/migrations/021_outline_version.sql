@@ -0,0 +1,40 @@
+-- Migration: 021_outline_version
+-- Description: Check the outline cache version inside get_project_outline
+--
+-- The cached outline endpoint looked up the outline version (section count
+-- and latest updated_at) in its own query before calling
+-- get_project_outline, and served cache hits without checking that the
+-- project still exists. get_project_outline now returns the version and
+-- takes the caller's cached version: when they match, the sections are
+-- left out. The existence check runs either way, in the same round trip.
+
+-- Replaced rather than overloaded, so PostgREST calls stay unambiguous
+DROP FUNCTION IF EXISTS get_project_outline(UUID);
+
+CREATE OR REPLACE FUNCTION get_project_outline(
+    p_id UUID,
+    p_known_version TEXT DEFAULT NULL
+)
+RETURNS JSONB AS $$
+    WITH v AS (
+        SELECT count(*) || ':' || COALESCE(max(updated_at)::text, '') AS version
+        FROM outline_section
+        WHERE project_id = p_id
+    )
+    SELECT jsonb_build_object(
+        'project_exists', EXISTS (SELECT 1 FROM project WHERE id = p_id),
+        'version', v.version,
+        'sections', CASE
+            WHEN v.version = p_known_version THEN NULL
+            ELSE COALESCE(
+                (
+                    SELECT jsonb_agg(s ORDER BY s.order_index)
+                    FROM outline_section s
+                    WHERE s.project_id = p_id
+                ),
+                '[]'::jsonb
+            )
+        END
+    )
+    FROM v;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,80 @@
+"""
+Unit tests for the in-process TTL cache.
+"""
+
+import pytest
+
+from src.services import cache as cache_module
+from src.services.cache import TTLCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_returns_stored_value(self, clock):
+        """Values are returned before they expire."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert "a" in cache
+
+    def test_entry_expires_after_ttl(self, clock):
+        """Values are dropped once the TTL has passed."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        clock[0] += 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_get_default_for_missing(self, clock):
+        """Missing keys return the default."""
+        cache = TTLCache(ttl=10)
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_oldest_entry_evicted_when_full(self, clock):
+        """The least recently set entry is evicted past maxsize."""
+        cache = TTLCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert "a" not in cache
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_invalidate_by_predicate(self, clock):
+        """Only matching keys are removed."""
+        cache = TTLCache(ttl=10)
+        cache.set(("p1", "papers"), [])
+        cache.set(("p1", "outline"), {})
+        cache.set(("p2", "papers"), [])
+        removed = cache.invalidate(lambda k: k[0] == "p1")
+        assert removed == 2
+        assert ("p2", "papers") in cache
+        assert ("p1", "papers") not in cache
+
+    def test_pop_returns_value(self, clock):
+        """pop removes and returns the entry."""
+        cache = TTLCache(ttl=10)
+        cache.set("a", 1)
+        assert cache.pop("a") == 1
+        assert cache.pop("a", "gone") == "gone"
+
+    def test_hit_rate_counts_lookups(self, clock):
+        """Hits and misses are tracked for diagnostics."""
+        cache = TTLCache(ttl=10)
+        assert cache.hit_rate == 0.0
+        cache.get("a")
+        cache.set("a", 1)
+        cache.get("a")
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
@@ -0,0 +1,94 @@
+"""
+Unit tests for DiscoveryService helpers.
+
+Tests:
+- Page cursor encoding/decoding
+- Cross-source paper deduplication
+- Graph walk call budget
+"""
+
+import pytest
+
+# Mark all tests in this module as unit tests
+pytestmark = pytest.mark.unit
+
+
+class TestPageCursor:
+    """Test opaque page cursors."""
+    
+    def test_round_trip(self):
+        """Encoded positions decode back unchanged."""
+        from src.services.discovery import decode_cursor, encode_cursor
+        
+        for position in (0, 20, 12345):
+            assert decode_cursor(encode_cursor(position)) == position
+    
+    def test_missing_cursor_starts_at_beginning(self):
+        """No cursor means the first page."""
+        from src.services.discovery import decode_cursor
+        
+        assert decode_cursor(None) == 0
+        assert decode_cursor("") == 0
+    
+    @pytest.mark.parametrize("cursor", ["not-base64!", "e30", "eyJuZXh0IjotMX0"])
+    def test_invalid_cursor_rejected(self, cursor):
+        """Garbage, missing keys and negative positions raise ValueError."""
+        from src.services.discovery import decode_cursor
+        
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestDedupePapers:
+    """Test deduplication of discovered papers."""
+    
+    def test_drops_papers_already_seen(self):
+        """Papers with a seen id are dropped; new ones are recorded."""
+        from src.services.discovery import dedupe_papers
+        
+        seen = {"a"}
+        papers = [{"paper_id": "a"}, {"paper_id": "b"}, {"paper_id": "b"}]
+        
+        assert dedupe_papers(papers, seen) == [{"paper_id": "b"}]
+        assert seen == {"a", "b"}
+    
+    def test_falls_back_to_normalized_title(self):
+        """Papers without an id are matched on title, ignoring case/spacing."""
+        from src.services.discovery import dedupe_papers
+        
+        papers = [
+            {"paper_id": None, "title": "Attention Is All You Need"},
+            {"paper_id": None, "title": "attention  is all you need "},
+            {"paper_id": None, "title": "Another Paper"},
+        ]
+        
+        kept = dedupe_papers(papers, set())
+        assert [p["title"] for p in kept] == [
+            "Attention Is All You Need",
+            "Another Paper",
+        ]
+    
+    def test_keeps_papers_without_id_or_title(self):
+        """Papers with nothing to key on are never treated as duplicates."""
+        from src.services.discovery import dedupe_papers
+        
+        papers = [{"paper_id": None}, {"paper_id": None, "title": ""}]
+        
+        assert dedupe_papers(papers, set()) == papers
+
+
+class TestExploreBudget:
+    """Test the project graph walk budget."""
+    
+    def test_spend_until_exhausted(self):
+        """Calls past the budget raise and mark the walk truncated."""
+        from src.services.discovery import ExploreBudget, ExploreBudgetExceeded
+        
+        budget = ExploreBudget(max_calls=2)
+        budget.spend()
+        budget.spend()
+        assert budget.truncated is None
+        
+        with pytest.raises(ExploreBudgetExceeded):
+            budget.spend()
+        assert budget.truncated == "budget"
@@ -0,0 +1,132 @@
+"""
+Unit tests for outline tree assembly.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+def _section(section_id, parent_id=None, order_index=0):
+    return {
+        "id": section_id,
+        "project_id": "00000000-0000-0000-0000-000000000001",
+        "parent_id": parent_id,
+        "title": f"Section {section_id[-1]}",
+        "section_type": "custom",
+        "questions": None,
+        "notes": None,
+        "order_index": order_index,
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "updated_at": "2024-01-01T00:00:00+00:00",
+    }
+
+
+ROOT_A = "00000000-0000-0000-0000-00000000000a"
+ROOT_B = "00000000-0000-0000-0000-00000000000b"
+CHILD_C = "00000000-0000-0000-0000-00000000000c"
+CHILD_D = "00000000-0000-0000-0000-00000000000d"
+
+
+class TestBuildTree:
+    """Tests for _build_tree."""
+
+    def test_nests_and_orders_sections(self):
+        """Children are nested under their parent and sorted by order_index."""
+        from src.api.routes.outline import _build_tree
+
+        sections = [
+            _section(CHILD_D, parent_id=ROOT_A, order_index=1),
+            _section(ROOT_B, order_index=1),
+            _section(CHILD_C, parent_id=ROOT_A, order_index=0),
+            _section(ROOT_A, order_index=0),
+        ]
+
+        tree = _build_tree(sections)
+
+        assert [str(s.id) for s in tree] == [ROOT_A, ROOT_B]
+        assert [str(c.id) for c in tree[0].children] == [CHILD_C, CHILD_D]
+        assert tree[1].children == []
+        assert tree[0].children[0].questions == []
+
+    def test_subtree_for_parent(self):
+        """Passing a parent_id returns just that subtree."""
+        from src.api.routes.outline import _build_tree
+
+        sections = [
+            _section(ROOT_A),
+            _section(CHILD_C, parent_id=ROOT_A),
+        ]
+
+        assert [str(s.id) for s in _build_tree(sections, ROOT_A)] == [CHILD_C]
+
+    def test_empty_outline(self):
+        """No sections gives an empty tree."""
+        from src.api.routes.outline import _build_tree
+
+        assert _build_tree([]) == []
+
+
+class TestStitchSubtree:
+    """Tests for _stitch_subtree."""
+
+    def test_attaches_rows_in_tree_order(self):
+        """Rows in tree_path order are nested under their parents."""
+        from src.api.routes.outline import _stitch_subtree
+
+        rows = [
+            {**_section(ROOT_A), "depth": 0},
+            {**_section(CHILD_C, parent_id=ROOT_A), "depth": 1},
+            {**_section(CHILD_D, parent_id=ROOT_A, order_index=1), "depth": 1},
+            {**_section(ROOT_B, order_index=1), "depth": 0},
+        ]
+
+        tree = _stitch_subtree(rows)
+
+        assert [str(s.id) for s in tree] == [ROOT_A, ROOT_B]
+        assert [str(c.id) for c in tree[0].children] == [CHILD_C, CHILD_D]
+
+    def test_subtree_root_with_parent_is_a_root(self):
+        """A subtree root is returned at top level even if it has a parent."""
+        from src.api.routes.outline import _stitch_subtree
+
+        rows = [{**_section(CHILD_C, parent_id=ROOT_A), "depth": 0}]
+
+        assert [str(s.id) for s in _stitch_subtree(rows)] == [CHILD_C]
+
+
+class TestIterOutlineJson:
+    """Tests for _iter_outline_json."""
+
+    def test_matches_outline_tree_shape(self):
+        """The streamed body parses to a nested, ordered OutlineTree."""
+        import orjson
+
+        from src.api.routes.outline import _iter_outline_json
+        from src.models.outline import OutlineTree
+
+        sections = [
+            _section(CHILD_D, parent_id=ROOT_A, order_index=1),
+            _section(ROOT_B, order_index=1),
+            _section(CHILD_C, parent_id=ROOT_A, order_index=0),
+            _section(ROOT_A, order_index=0),
+        ]
+
+        body = orjson.loads(b"".join(_iter_outline_json("p1", sections)))
+
+        assert body["project_id"] == "p1"
+        assert body["total_count"] == 4
+        assert [s["id"] for s in body["sections"]] == [ROOT_A, ROOT_B]
+        assert [c["id"] for c in body["sections"][0]["children"]] == [CHILD_C, CHILD_D]
+        assert body["sections"][0]["children"][0]["questions"] == []
+        OutlineTree.model_validate({**body, "project_id": ROOT_A})
+
+    def test_empty_outline(self):
+        """No sections gives an empty, valid body."""
+        import orjson
+
+        from src.api.routes.outline import _iter_outline_json
+
+        body = orjson.loads(b"".join(_iter_outline_json("p1", [])))
+
+        assert body == {"project_id": "p1", "sections": [], "total_count": 0}
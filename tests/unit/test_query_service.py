@@ -0,0 +1,29 @@
+"""
+Unit tests for the research query service.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+
+class TestQueryCacheKey:
+    """Tests for the RAG query cache key."""
+
+    def test_normalizes_case_and_whitespace(self):
+        """Queries differing only in case/spacing share a key."""
+        from src.models.research import QueryRequest
+        from src.services.query_service import query_cache_key
+
+        a = query_cache_key("p1", QueryRequest(query="What  is   RAG?"))
+        b = query_cache_key("p1", QueryRequest(query=" what is rag? "))
+        assert a == b
+
+    def test_options_and_project_are_part_of_key(self):
+        """Different options or projects never share an entry."""
+        from src.models.research import QueryRequest
+        from src.services.query_service import query_cache_key
+
+        base = query_cache_key("p1", QueryRequest(query="q"))
+        assert base != query_cache_key("p2", QueryRequest(query="q"))
+        assert base != query_cache_key("p1", QueryRequest(query="q", max_sources=10))